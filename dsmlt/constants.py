@@ -5,20 +5,39 @@ import numpy as np
 
 __all__ = (
     "INTEGERS",
+    "UNSIGNED_INTEGERS",
     "FLOATS",
     "NUMERICS",
+    "NULLABLE_INTEGERS",
     "INTEGERS_RANGES",
+    "UNSIGNED_INTEGERS_RANGES",
+    "ALL_INTEGERS_RANGES",
     "FLOATS_RANGES",
     "NUMERICS_RANGES",
 )
 
 
 # Data types
-INTEGERS = {int, np.int8, np.int16, np.int32, np.int64}
+UNSIGNED_INTEGERS = {np.uint8, np.uint16, np.uint32, np.uint64}
+INTEGERS = {int, np.int8, np.int16, np.int32, np.int64}.union(
+    UNSIGNED_INTEGERS
+)
 FLOATS = {float, np.float16, np.float32, np.float64, np.float128}
 
 NUMERICS = set().union(INTEGERS, FLOATS)
 
+# Pandas nullable data types for integer numpy types
+NULLABLE_INTEGERS = {
+    np.int8: "Int8",
+    np.int16: "Int16",
+    np.int32: "Int32",
+    np.int64: "Int64",
+    np.uint8: "UInt8",
+    np.uint16: "UInt16",
+    np.uint32: "UInt32",
+    np.uint64: "UInt64",
+}
+
 
 # Data types with values ranges
 INTEGERS_RANGES = OrderedDict(
@@ -30,6 +49,30 @@ INTEGERS_RANGES = OrderedDict(
     ]
 )
 
+UNSIGNED_INTEGERS_RANGES = OrderedDict(
+    [
+        (np.uint64, (np.iinfo(np.uint64).min, np.iinfo(np.uint64).max)),
+        (np.uint32, (np.iinfo(np.uint32).min, np.iinfo(np.uint32).max)),
+        (np.uint16, (np.iinfo(np.uint16).min, np.iinfo(np.uint16).max)),
+        (np.uint8, (np.iinfo(np.uint8).min, np.iinfo(np.uint8).max)),
+    ]
+)
+
+# Signed and unsigned integers, signed type goes after unsigned type of
+# the same size to be preferred when both fit
+ALL_INTEGERS_RANGES = OrderedDict(
+    [
+        (np.uint64, UNSIGNED_INTEGERS_RANGES[np.uint64]),
+        (np.int64, INTEGERS_RANGES[np.int64]),
+        (np.uint32, UNSIGNED_INTEGERS_RANGES[np.uint32]),
+        (np.int32, INTEGERS_RANGES[np.int32]),
+        (np.uint16, UNSIGNED_INTEGERS_RANGES[np.uint16]),
+        (np.int16, INTEGERS_RANGES[np.int16]),
+        (np.uint8, UNSIGNED_INTEGERS_RANGES[np.uint8]),
+        (np.int8, INTEGERS_RANGES[np.int8]),
+    ]
+)
+
 FLOATS_RANGES = OrderedDict(
     [
         (np.float128, (np.finfo(np.float128).min, np.finfo(np.float128).max)),
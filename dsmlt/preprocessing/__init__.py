@@ -1,15 +1,23 @@
 from .data import (
     DataMapper,
+    UNKNOWN_CODE,
+    codes_dtype,
+    explanatory_categories,
     from_boolean_to_integers_map,
     from_explanatory_to_integers,
     from_integers_to_boolean_map,
+    is_explanatory_type,
 )
 from .optimisation import MemoryOptimiser
 
 __all__ = (
     "DataMapper",
+    "UNKNOWN_CODE",
+    "codes_dtype",
+    "explanatory_categories",
     "from_boolean_to_integers_map",
     "from_explanatory_to_integers",
     "from_integers_to_boolean_map",
+    "is_explanatory_type",
     "MemoryOptimiser",
 )
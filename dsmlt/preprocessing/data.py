@@ -1,217 +1,2156 @@
 """
 Helper function to create maps for different types of variables
 """
-import copy
 
-from collections import OrderedDict
+from collections.abc import Iterator
+from functools import partial
+from itertools import repeat
 
 import pandas as pd
 import numpy as np
+from pandas.api.types import is_string_dtype
+from scipy import sparse
+from sklearn.utils import check_random_state
+
+from ..constants import INTEGERS_RANGES
+from ..utils.buildin import dl_to_ld, ld_to_dl
+from ..utils.parallel import SharedArray, n_workers, parallel_map, process_map
+from .optimisation import lookup_dtypes
 
 
 __all__ = (
     "DataMapper",
+    "UNKNOWN_CODE",
+    "codes_dtype",
+    "explanatory_categories",
     "from_boolean_to_integers_map",
     "from_explanatory_to_integers",
     "from_integers_to_boolean_map",
+    "is_explanatory_type",
 )
 
 
-def from_explanatory_to_integers(series):
-    return {v: i for i, v in enumerate(set(series.values))}
+# Code of values unseen during fit and of rare categories
+UNKNOWN_CODE = -1
+
+# Hash of missing values by `pd.util.hash_array`
+MISSING_HASH = np.iinfo(np.uint64).max
+
+# Scalings of numeric columns
+SCALINGS = ("standard", "minmax", "robust")
+
+# Encodings of categorical columns
+ENCODINGS = ("ordinal", "frequency", "target")
+
+# Workers of `n_jobs`
+BACKENDS = ("threads", "processes")
+
+# Number of rows of column encoded at once, so temporary arrays of hash
+# lookup are bounded by size of a chunk
+CHUNK_SIZE = 2**16
+
+# Maximum number of rare categories of column counted between chunks, the
+# least frequent ones are pruned above it
+MAX_COUNTS = 2**20
+
+
+def explanatory_categories(series):
+    """Find categories of explanatory variable.
+
+    Unique values are found by hashing, in order of their first
+    appearance, so categories are the same for the same data in every
+    run. Missing value is a category too.
+
+    Parameters
+    ----------
+        series : pandas Series or narray-like
+            Values of variable.
+
+    Returns
+    -------
+        categories : pandas Index
+            Unique values of variable.
+    """
+    return pd.Index(pd.unique(np.asarray(series)), dtype=object)
+
+
+def is_explanatory_type(dtype):
+    """Check whether column of type is mapped to codes of categories.
+
+    Parameters
+    ----------
+        dtype : numpy dtype or pandas extension type
+            Type of column.
+
+    Returns
+    -------
+        is_explanatory : bool
+            True for object, string (`str` columns of pandas 3) and
+            categorical types.
+    """
+    return is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype)
+
+
+def _append_categories(categories, new):
+    """Append new categories to categories.
+
+    Unlike `Index.append`, type of categories isn't inferred, so missing
+    values and non-string categories are kept as is.
+
+    Parameters
+    ----------
+        categories : pandas Index
+            Categories of object type.
+        new : pandas Index or array-like
+            New categories.
+
+    Returns
+    -------
+        categories : pandas Index
+    """
+    return pd.Index(
+        np.concatenate([categories.to_numpy(), np.asarray(new, dtype=object)]),
+        dtype=object,
+    )
+
+
+def _object_categories(item):
+    """Find categories of values of column in chunk of data.
+
+    Module level function, so it can be run in worker process.
+
+    Parameters
+    ----------
+        item : tuple
+            Values of column and whether categories are counted.
+
+    Returns
+    -------
+        categories : pandas Index
+            Unique values in order of their first appearance.
+        counts : numpy array or None
+            Counts of categories, if they are counted.
+    """
+    values, count = item
+    if not count:
+        return explanatory_categories(values), None
+
+    codes, uniques = pd.factorize(
+        np.asarray(values, dtype=object), use_na_sentinel=False
+    )
+    counts = np.bincount(codes, minlength=len(uniques))
+    return pd.Index(uniques, dtype=object), counts
+
+
+def _unpickled_categories(item):
+    """Restore NaN of categories unpickled from worker process.
+
+    Unpickled NaN is a new float object, it's replaced by `np.nan`, so
+    keys of mapper are the same as ones of serial processing.
+
+    Parameters
+    ----------
+        item : tuple
+            Categories and counts returned by `_object_categories`.
+
+    Returns
+    -------
+        item : tuple
+    """
+    categories, counts = item
+    values = categories.to_numpy(copy=True)
+    for position in np.flatnonzero(categories.isna()):
+        if isinstance(values[position], float):
+            values[position] = np.nan
+    return pd.Index(values, dtype=object), counts
+
+
+def _encode_objects(item):
+    """Encode object values of column in worker process.
+
+    Parameters
+    ----------
+        item : tuple
+            Object values of column, its categories (pandas Index) or
+            number of hash buckets and `SharedArray` where codes are
+            written.
+    """
+    values, vocabulary, out = item
+    if isinstance(vocabulary, pd.Index):
+        DataMapper._index_codes(vocabulary, values, out.array)
+    else:
+        DataMapper._hash(pd.Series(values, copy=False), vocabulary, out.array)
+
+
+def codes_dtype(n_categories):
+    """Find the smallest integer type of codes of categories.
+
+    Parameters
+    ----------
+        n_categories : int
+            Number of categories.
+
+    Returns
+    -------
+        dtype : type
+            The narrowest signed integer type that holds codes from -1
+            (value unseen during fit) to `n_categories` - 1.
+    """
+    return lookup_dtypes(
+        [UNKNOWN_CODE], [max(n_categories - 1, 0)], INTEGERS_RANGES
+    )[0]
+
+
+def from_explanatory_to_integers(series):
+    categories = explanatory_categories(series)
+    return dict(zip(categories, range(len(categories))))
+
+
+from_boolean_to_integers_map = {
+    False: 0,
+    True: 1,
+}
+from_integers_to_boolean_map = {
+    0: False,
+    1: True,
+}
+
+
+class DataMapper:
+    """
+    Data mapper that handle bulk map of data.
+
+    Parameters
+    ----------
+        scaling : dict or str
+            Scaling of numeric columns (for all columns or by names of
+            columns): "standard" (mean and standard deviation), "minmax"
+            (minimum and maximum) or "robust" (median and interquartile
+            range). Statistics are computed during fit, robust ones can't
+            be fitted by chunks. Scaled columns are written in a single
+            pass into a preallocated float32 block, codes of encoded
+            columns keep their integer types.
+        inplace : bool
+            Whether to replace columns of input data.
+        hashing : dict or int
+            Number of hash buckets of categorical columns (for all
+            columns or by names of columns). Hashed columns are encoded
+            by hashes of values modulo number of buckets without
+            vocabulary, so size of mapper doesn't depend on cardinality
+            of column. Hashed columns can't be decoded.
+        min_frequency : dict or int
+            Minimum number of occurrences of category during fit (for all
+            columns or by names of columns). Rarer categories aren't added
+            to vocabulary and are encoded as `UNKNOWN_CODE` (-1). Counts
+            of rare categories are kept between chunks in `counts_`, at
+            most `MAX_COUNTS` per column.
+        n_jobs : int
+            Number of threads used to find categories and to encode or
+            decode columns. Columns are processed in parallel, while
+            vocabularies and output are assembled in order of columns, so
+            results are the same as serial processing. None means 1, -1
+            means all processors, -2 all but one and so on.
+        backend : str
+            Workers of `n_jobs`: "threads" (default) or "processes".
+            Scaling and remapping of codes of categorical columns run
+            numpy code that releases the GIL, so they always use threads.
+            Lookups and hashing of python objects hold it, so with
+            "processes" categories of object and string columns are found
+            and their ordinal or hashed codes are computed in a pool of
+            processes. Values are pickled to workers, codes are written by
+            workers into shared memory (see `SharedArray`). Pool is started
+            by every fit of chunk and transform, so it pays off for large
+            data with several object columns only.
+        encoding : dict or str
+            Encoding of categorical columns (for all columns or by names
+            of columns): "ordinal" (codes of categories, default),
+            "frequency" (share of rows of category during fit) or
+            "target" (smoothed mean of target of category, `y` is
+            required by fit). Frequency and target encoded columns are
+            float32 and can't be decoded. Unknown categories are encoded
+            as 0 frequency and as mean of target.
+        smoothing : float
+            Weight of mean of target in target encoding, category mean
+            is `(sum + smoothing * mean) / (count + smoothing)`.
+        n_folds : int
+            Number of folds of out-of-fold target encoding in
+            `fit_transform`: rows of each fold are encoded by statistics
+            of other folds.
+        random_state : int, RandomState instance or None
+            Seed of random assignment of rows to folds.
+    """
+
+    def __init__(
+        self,
+        scaling: (dict, str) = None,
+        inplace: bool = False,
+        hashing: (dict, int) = None,
+        min_frequency: (dict, int) = None,
+        n_jobs: int = None,
+        backend: str = "threads",
+        encoding: (dict, str) = None,
+        smoothing: float = 1.0,
+        n_folds: int = 5,
+        random_state=None,
+    ):
+        self.scaling = scaling
+        self.inplace = inplace
+        self.hashing = hashing
+        self.min_frequency = min_frequency
+        self.n_jobs = n_jobs
+        self.backend = backend
+        self.encoding = encoding
+        self.smoothing = smoothing
+        self.n_folds = n_folds
+        self.random_state = random_state
+
+    def _get_new_data(self, data):
+        """Prepare output data.
+
+        Output is a shallow copy of data, so its columns share buffers
+        with data until they are replaced with `_set_column`. Only
+        encoded columns are allocated by transforms.
+
+        Parameters
+        ----------
+            data: Pandas data frame.
+
+        Returns
+        -------
+            data_new : narray-like, shape (n_samples, n_components)
+        """
+        if not isinstance(data, (pd.DataFrame, pd.Series)):
+            raise AttributeError(
+                "Invalid `data` type. It should be instance of pandas "
+                "Series or DataFrame."
+            )
+
+        if self.inplace:
+            return data
+        return data.copy(deep=False)
+
+    @staticmethod
+    def _set_column(data_new, position, values):
+        """Replace column of output data.
+
+        Column is replaced by a new array, buffer of the replaced column
+        (shared with input data) isn't modified.
+
+        Parameters
+        ----------
+            data_new : Pandas data frame.
+            position : int
+                Position of column.
+            values : pandas Series
+                New values of column.
+        """
+        data_new.isetitem(position, values)
+
+    def _set_columns(self, data, data_new, positions, function, dtype=None):
+        """Encode or decode columns of data and replace them in output.
+
+        Columns are processed in parallel if `n_jobs` is set, but are
+        replaced in output in order of their positions. Unless `inplace`
+        is set, output is concatenated from new columns and slices of
+        data, which aren't copied under Copy-on-Write (`isetitem` copies
+        values).
+
+        Parameters
+        ----------
+            data : Pandas data frame.
+            data_new : Pandas data frame.
+                Output data.
+            positions : list of int
+                Positions of processed columns.
+            function : callable
+                `_transform_column` or `_inverse_transform_column`.
+            dtype : numpy dtype, optional
+                If set, scaled columns are written into preallocated 2-D
+                block of this type, which is wrapped into a single data
+                frame.
+
+        Returns
+        -------
+            data_new : Pandas data frame.
+        """
+        scaled = []
+        if dtype is not None:
+            scaled = [
+                position
+                for position in positions
+                if data.columns[position] in self.scalers_
+            ]
+        block = np.empty((len(data), len(scaled)), dtype, order="F")
+        # positions of columns of block, other columns are separate
+        indices = {position: i for i, position in enumerate(scaled)}
+
+        def set_column(position):
+            series, column_name = (
+                data.iloc[:, position],
+                data.columns[position],
+            )
+            if position in indices:
+                return function(
+                    series, column_name, out=block[:, indices[position]]
+                )
+            return function(series, column_name)
+
+        columns = parallel_map(set_column, positions, self.n_jobs)
+        if scaled:
+            block = pd.DataFrame(block, index=data.index, copy=False)
+            columns = [
+                (
+                    block.iloc[:, indices[position]]
+                    if position in indices
+                    else values
+                )
+                for position, values in zip(positions, columns)
+            ]
+        if self.inplace or not positions:
+            for position, values in zip(positions, columns):
+                self._set_column(data_new, position, values)
+            return data_new
+
+        # runs of consecutive columns of data or of block are taken as
+        # slices, so they aren't split into separate arrays
+        columns = dict(zip(positions, columns))
+        pieces = []
+        start = 0
+        for stop in range(1, data.shape[1] + 1):
+            if (
+                stop < data.shape[1]
+                and stop not in columns
+                and start not in columns
+            ) or (stop in indices and start in indices):
+                continue
+            if start in indices:
+                first, last = indices[start], indices[stop - 1] + 1
+                pieces.append(block.iloc[:, first:last])
+            elif start in columns:
+                pieces.append(columns[start])
+            else:
+                pieces.append(data.iloc[:, start:stop])
+            start = stop
+        data_new = pd.concat(pieces, axis=1)
+        data_new.columns = data.columns
+        return data_new
+
+    def _reset(self):
+        """Reset fitted types and vocabularies of columns."""
+        self.types_ = {}
+        self.categories_ = {}
+        self.mappers_ = {}
+        self.lookups_ = {}
+        self.buckets_ = {}
+        self.counts_ = {}
+        self.scalers_ = {}
+        self.scaling_stats_ = {}
+        self.statistics_ = {}
+        self.tables_ = {}
+        self.n_samples_ = 0
+        self.target_sum_ = 0.0
+
+    def _column_parameter(self, name, column_name):
+        """Get value of parameter for column.
+
+        Parameters
+        ----------
+            name : str
+                Name of parameter, `hashing` or `min_frequency`.
+            column_name : Column name of data frame.
+
+        Returns
+        -------
+            value : int or None
+                Value of parameter for column.
+        """
+        value = getattr(self, name)
+        if isinstance(value, dict):
+            value = value.get(column_name)
+        if value is not None and (
+            isinstance(value, bool)
+            or not isinstance(value, (int, np.integer))
+            or value < 1
+        ):
+            raise AttributeError(
+                f"Invalid `{name}` value. It should be positive integer."
+            )
+        return value
+
+    def _scaling_method(self, column_name):
+        """Get scaling of column.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+
+        Returns
+        -------
+            scaling : str or None
+                One of `SCALINGS`.
+        """
+        scaling = self.scaling
+        if isinstance(scaling, dict):
+            scaling = scaling.get(column_name)
+        if scaling is not None and scaling not in SCALINGS:
+            raise AttributeError(
+                f"Invalid `scaling` value. It should be one of {SCALINGS}."
+            )
+        return scaling
+
+    def _encoding_method(self, column_name):
+        """Get encoding of categorical column.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+
+        Returns
+        -------
+            encoding : str
+                One of `ENCODINGS`.
+        """
+        encoding = self.encoding
+        if isinstance(encoding, dict):
+            encoding = encoding.get(column_name)
+        if encoding is None:
+            return "ordinal"
+        if encoding not in ENCODINGS:
+            raise AttributeError(
+                f"Invalid `encoding` value. It should be one of {ENCODINGS}."
+            )
+        return encoding
+
+    def _process_columns(self, data, columns):
+        """Find object columns processed in pool of processes.
+
+        Parameters
+        ----------
+            data : Pandas data frame.
+            columns : list
+                Names of processed columns.
+
+        Returns
+        -------
+            columns : list
+                Names of object and string columns if `backend` is
+                "processes" and `n_jobs` gives more than one worker for
+                them, empty list otherwise.
+        """
+        if self.backend not in BACKENDS:
+            raise AttributeError(
+                f"Invalid `backend` value. It should be one of {BACKENDS}."
+            )
+        if self.backend != "processes":
+            return []
+
+        columns = [
+            column_
+            for column_ in columns
+            if is_string_dtype(data[column_].dtype)
+        ]
+        if n_workers(self.n_jobs, len(columns)) == 1:
+            return []
+        return columns
+
+    def _construct_data_types(self, data):
+        """Create map of relation column/type for data.
+
+        Types of columns seen in previous chunks are kept.
+
+        Parameters
+        ----------
+            data : Pandas data frame.
+        """
+        for column_, type_ in zip(data.columns, data.dtypes):
+            self.types_.setdefault(column_, type_)
+
+    def _construct_data_mappers(self, data):
+        """
+        Create map of column/map of data that consists in this column.
+
+        Vocabularies of columns are extended by categories unseen in
+        previous chunks, codes of already known categories are kept.
+
+        Parameters
+        ----------
+            data : Pandas data frame.
+        """
+        # FIXME currently we use only one mapper. In future we need add more
+        columns = []
+        for column_, type_ in zip(data.columns, data.dtypes):
+            # chunk of categorical column may be parsed as numeric one,
+            # e.g. when it holds only missing values
+            if column_ in self.buckets_:
+                continue
+            if is_explanatory_type(type_) or column_ in self.categories_:
+                n_buckets = self._column_parameter("hashing", column_)
+                if n_buckets is not None:
+                    self.buckets_[column_] = n_buckets
+                else:
+                    columns.append(column_)
+
+        # categories of chunk are found in parallel (of object columns in
+        # processes if `backend` is set), vocabularies are extended in
+        # order of columns
+        processed = self._process_columns(data, columns)
+        chunk_categories = process_map(
+            _object_categories,
+            [
+                (
+                    np.asarray(data[column_]),
+                    self._column_parameter("min_frequency", column_)
+                    is not None,
+                )
+                for column_ in processed
+            ],
+            self.n_jobs,
+        )
+        chunk_categories = dict(
+            zip(processed, map(_unpickled_categories, chunk_categories))
+        )
+        threaded = [_ for _ in columns if _ not in chunk_categories]
+        chunk_categories.update(
+            zip(
+                threaded,
+                parallel_map(
+                    lambda column_: self._chunk_categories(
+                        column_, data.get(column_)
+                    ),
+                    threaded,
+                    self.n_jobs,
+                ),
+            )
+        )
+        for column_ in columns:
+            self._extend_categories(column_, *chunk_categories[column_])
+
+    def _chunk_categories(self, column_name, series):
+        """Find categories of column in chunk of data.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+            series : pandas Series
+                Values of column.
+
+        Returns
+        -------
+            categories : pandas Index
+                Unique values of column in order of their first
+                appearance.
+            counts : numpy array or None
+                Counts of categories, if `min_frequency` is set for
+                column.
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return self._categorical_categories(column_name, series)
+
+        count = self._column_parameter("min_frequency", column_name)
+        return _object_categories((np.asarray(series), count is not None))
+
+    def _categorical_categories(self, column_name, series):
+        """Find categories of categorical column in chunk of data.
+
+        Categories are taken from type of column, so they are found
+        without hashing of values.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+            series : pandas Series
+                Categorical values of column.
+
+        Returns
+        -------
+            categories : pandas Index
+                Categories of type of column in their order, missing
+                value is the last one if column has missing values.
+            counts : numpy array or None
+                Counts of categories, if `min_frequency` is set for
+                column.
+        """
+        categories = pd.Index(series.cat.categories, dtype=object)
+        codes = series.cat.codes.to_numpy()
+        if self._column_parameter("min_frequency", column_name) is None:
+            if (codes == -1).any():
+                categories = _append_categories(categories, [np.nan])
+            return categories, None
+
+        # code -1 of missing value is counted as the last one
+        counts = np.roll(
+            np.bincount(codes + 1, minlength=len(categories) + 1), -1
+        )
+        categories = _append_categories(categories, [np.nan])
+        return categories, counts
+
+    def _extend_categories(self, column_name, new, chunk_counts=None):
+        """Append categories unseen before to vocabulary of column.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+            new : pandas Index
+                Categories of column in chunk of data.
+            chunk_counts : numpy array or None
+                Counts of categories in chunk of data, if `min_frequency`
+                is set for column.
+        """
+        categories = self.categories_.get(column_name)
+        if categories is not None:
+            unseen = categories.get_indexer(new) == -1
+            new = new[unseen]
+            if chunk_counts is not None:
+                chunk_counts = chunk_counts[unseen]
+        if chunk_counts is not None:
+            new = self._frequent_categories(column_name, new, chunk_counts)
+        if categories is None:
+            categories = new[:0]
+
+        mapper = self.mappers_.setdefault(column_name, {})
+        mapper.update(
+            zip(new, range(len(categories), len(categories) + len(new)))
+        )
+        self.categories_[column_name] = _append_categories(categories, new)
+
+    def _frequent_categories(self, column_name, uniques, chunk_counts):
+        """Accumulate counts of categories of column and find frequent
+        ones.
+
+        Counts are accumulated between chunks, so category becomes
+        frequent in the chunk where its total count reaches
+        `min_frequency`. Only rare categories are counted: frequent ones
+        are in vocabulary already, and above `MAX_COUNTS` categories the
+        least frequent ones are pruned, so a category spread thinly
+        over many chunks may never become frequent.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+            uniques : pandas Index
+                Categories of column in chunk of data, that aren't in
+                its vocabulary.
+            chunk_counts : numpy array
+                Counts of categories in chunk of data.
+
+        Returns
+        -------
+            categories : pandas Index
+                Frequent categories of chunk in order of their first
+                appearance.
+        """
+        min_frequency = self._column_parameter("min_frequency", column_name)
+        counts = self.counts_.get(column_name)
+        if counts is None:
+            counts = pd.Series(chunk_counts, index=uniques)
+        else:
+            positions = counts.index.get_indexer(uniques)
+            unseen = positions == -1
+            index = _append_categories(counts.index, uniques[unseen])
+            positions[unseen] = np.arange(len(counts), len(index))
+            values = np.zeros(len(index), dtype=chunk_counts.dtype)
+            values[: len(counts)] = counts.to_numpy()
+            values[positions] += chunk_counts
+            counts = pd.Series(values, index=index)
+            chunk_counts = values[positions]
+
+        counts = counts[counts.to_numpy() < min_frequency]
+        if len(counts) > MAX_COUNTS:
+            # the most frequent ones (the first of ties) are kept in order
+            # of appearance
+            kept = np.argsort(-counts.to_numpy(), kind="stable")
+            counts = counts.iloc[np.sort(kept[:MAX_COUNTS])]
+        self.counts_[column_name] = counts
+
+        return uniques[chunk_counts >= min_frequency]
+
+    def _construct_scalers(self, data):
+        """Compute scaling statistics of numeric columns.
+
+        Statistics of standard and min-max scaling are merged with ones
+        of previous chunks, robust scaling is computed from a single
+        chunk.
+
+        Parameters
+        ----------
+            data : Pandas data frame.
+        """
+        columns = []
+        for column_, type_ in zip(data.columns, data.dtypes):
+            if self._is_encoded(column_) or type_.kind not in {"i", "u", "f"}:
+                continue
+            scaling = self._scaling_method(column_)
+            if scaling is None:
+                continue
+            if scaling == "robust" and column_ in self.scaling_stats_:
+                raise AttributeError(
+                    "Invalid scaling. Robust scaling can't be fitted by "
+                    "chunks."
+                )
+            columns.append((column_, scaling))
+
+        chunk_stats = parallel_map(
+            lambda column: self._scaling_stats(data.get(column[0]), column[1]),
+            columns,
+            self.n_jobs,
+        )
+        for (column_, scaling), stats in zip(columns, chunk_stats):
+            if column_ in self.scaling_stats_:
+                stats = self._merge_scaling_stats(
+                    self.scaling_stats_[column_], stats, scaling
+                )
+            self.scaling_stats_[column_] = stats
+            self.scalers_[column_] = self._scaler(stats, scaling)
+
+    @staticmethod
+    def _scaling_stats(series, scaling):
+        """Compute scaling statistics of chunk of column.
+
+        Parameters
+        ----------
+            series : pandas Series
+                Values of column.
+            scaling : str
+                One of `SCALINGS`.
+
+        Returns
+        -------
+            stats : numpy array
+                Count, mean and sum of squared deviations for standard
+                scaling, minimum and maximum for min-max one, quartiles
+                for robust one. Missing values are ignored.
+        """
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if scaling == "standard":
+            if not len(values):
+                return np.zeros(3)
+            mean = values.mean()
+            return np.array([len(values), mean, ((values - mean) ** 2).sum()])
+        if not len(values):
+            return np.full(2 if scaling == "minmax" else 3, np.nan)
+        if scaling == "minmax":
+            return np.array([values.min(), values.max()])
+        return np.quantile(values, [0.25, 0.5, 0.75])
+
+    @staticmethod
+    def _merge_scaling_stats(stats, chunk_stats, scaling):
+        """Merge scaling statistics of chunks of column.
+
+        Parameters
+        ----------
+            stats : numpy array
+                Statistics of previous chunks.
+            chunk_stats : numpy array
+                Statistics of chunk.
+            scaling : str
+                "standard" or "minmax".
+
+        Returns
+        -------
+            stats : numpy array
+        """
+        if scaling == "minmax":
+            return np.array(
+                [
+                    np.fmin(stats[0], chunk_stats[0]),
+                    np.fmax(stats[1], chunk_stats[1]),
+                ]
+            )
+
+        n_a, mean_a, m2_a = stats
+        n_b, mean_b, m2_b = chunk_stats
+        n = n_a + n_b
+        if not n:
+            return stats
+        delta = mean_b - mean_a
+        return np.array(
+            [
+                n,
+                mean_a + delta * n_b / n,
+                m2_a + m2_b + delta**2 * n_a * n_b / n,
+            ]
+        )
+
+    @staticmethod
+    def _scaler(stats, scaling):
+        """Get shift and scale of column from its statistics.
+
+        Parameters
+        ----------
+            stats : numpy array
+                Scaling statistics of column.
+            scaling : str
+                One of `SCALINGS`.
+
+        Returns
+        -------
+            scaler : tuple
+                Shift and scale, scaled values are `(x - shift) / scale`.
+                Scale of constant column is 1.
+        """
+        if scaling == "standard":
+            n, shift, m2 = stats
+            scale = np.sqrt(m2 / n) if n else 0.0
+        elif scaling == "minmax":
+            shift, scale = stats[0], stats[1] - stats[0]
+        else:
+            shift, scale = stats[1], stats[2] - stats[0]
+
+        shift = 0.0 if np.isnan(shift) else float(shift)
+        scale = 1.0 if np.isnan(scale) or scale == 0 else float(scale)
+        return shift, scale
+
+    def _n_codes(self, column_name):
+        """Get number of codes of encoded column.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+
+        Returns
+        -------
+            n_codes : int
+                Number of categories or hash buckets.
+        """
+        if column_name in self.buckets_:
+            return self.buckets_[column_name]
+        return len(self.categories_[column_name])
+
+    def _construct_statistics(self, data, target=None):
+        """Accumulate group statistics of frequency and target encoded
+        columns.
+
+        Sums of target and counts of rows are aggregated by codes of
+        column with `np.bincount`, one pass over column per chunk.
+
+        Parameters
+        ----------
+            data : Pandas data frame.
+            target : numpy array or None
+                Target values of rows of data.
+        """
+        columns = [
+            (column_, encoding)
+            for column_, encoding in (
+                (column_, self._encoding_method(column_))
+                for column_ in data.columns
+                if self._is_encoded(column_)
+            )
+            if encoding != "ordinal"
+        ]
+        # target is checked by `_check_encoding_target`
+        if any(encoding == "target" for _, encoding in columns):
+            self.target_sum_ += float(target.sum())
+        self.n_samples_ += len(data)
+
+        chunk_statistics = parallel_map(
+            lambda column: self._group_statistics(
+                self._encode(data[column[0]], column[0]).to_numpy(),
+                self._n_codes(column[0]),
+                target if column[1] == "target" else None,
+            ),
+            columns,
+            self.n_jobs,
+        )
+        for (column_, _), statistics in zip(columns, chunk_statistics):
+            previous = self.statistics_.get(column_)
+            if previous is not None:
+                # vocabulary of column may be extended by chunk
+                statistics[:, : previous.shape[1]] += previous
+            self.statistics_[column_] = statistics
+
+    @staticmethod
+    def _group_statistics(codes, n_codes, target=None):
+        """Aggregate target and counts of rows by codes.
+
+        Parameters
+        ----------
+            codes : numpy array
+                Codes of column, -1 for unknown values.
+            n_codes : int
+                Number of codes of column.
+            target : numpy array or None
+                Target values of rows.
+
+        Returns
+        -------
+            statistics : numpy array, shape (2, n_codes)
+                Sums of target (zeros without target) and counts of rows
+                of codes.
+        """
+        known = codes >= 0
+        codes = codes[known]
+        statistics = np.zeros((2, n_codes))
+        if target is not None:
+            statistics[0] = np.bincount(
+                codes, weights=target[known], minlength=n_codes
+            )
+        statistics[1] = np.bincount(codes, minlength=n_codes)
+        return statistics
+
+    def _encoding_table(self, column_name, statistics, n_samples, target_sum):
+        """Compute encoded values of codes of column.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+            statistics : numpy array, shape (..., 2, n_codes)
+                Sums of target and counts of rows of codes.
+            n_samples : float or numpy array
+                Number of rows.
+            target_sum : float or numpy array
+                Sum of target of rows.
+
+        Returns
+        -------
+            table : numpy array, shape (..., n_codes + 1)
+                Encoded values of codes, the last one is value of unknown
+                code -1.
+        """
+        sums, counts = statistics[..., 0, :], statistics[..., 1, :]
+        n_samples = np.asarray(n_samples, dtype=np.float64)[..., None]
+        if self._encoding_method(column_name) == "frequency":
+            values = counts / np.maximum(n_samples, 1)
+            unknown = np.zeros_like(n_samples)
+        else:
+            unknown = np.asarray(target_sum)[..., None] / np.maximum(
+                n_samples, 1
+            )
+            values = (sums + self.smoothing * unknown) / (
+                counts + self.smoothing
+            )
+        return np.concatenate([values, unknown], axis=-1).astype(np.float32)
+
+    def _compile_tables(self):
+        """Create tables of encoded values of frequency and target
+        encoded columns."""
+        self.tables_ = {
+            column_: self._encoding_table(
+                column_, statistics, self.n_samples_, self.target_sum_
+            )
+            for column_, statistics in self.statistics_.items()
+        }
+
+    def _compile_lookups(self):
+        """Create lookup tables of columns for transform of records.
+
+        Lookup table of column is a pair of its mapper and code of
+        missing value (-1 if it wasn't seen during fit), so missing
+        values of any kind (None, NaN) are encoded by the same code.
+        """
+        self.lookups_ = {}
+        for column_, mapper in self.mappers_.items():
+            missing = self.categories_[column_].isna()
+            self.lookups_[column_] = (
+                mapper,
+                int(missing.argmax()) if missing.any() else UNKNOWN_CODE,
+            )
+
+    def _is_encoded(self, column_name):
+        """Check whether column is encoded by data mapper.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+
+        Returns
+        -------
+            is_encoded : bool
+        """
+        return column_name in self.categories_ or column_name in self.buckets_
+
+    def _is_mapped(self, column_name):
+        """Check whether column is encoded or scaled by data mapper.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+
+        Returns
+        -------
+            is_mapped : bool
+        """
+        return self._is_encoded(column_name) or column_name in self.scalers_
+
+    def _transform_column(self, series, column_name, out=None):
+        """Encode or scale values of column.
+
+        Parameters
+        ----------
+            series : pandas Series
+                Values of column.
+            column_name : Column name of data frame.
+            out : numpy array, optional
+                Array where values are written, e.g. column of output
+                block.
+
+        Returns
+        -------
+            values : pandas Series
+                Codes of column of the smallest integer type, scaled,
+                frequency or target encoded values are float32.
+        """
+        if out is None and column_name in self.tables_:
+            out = np.empty(len(series), dtype=np.float32)
+        if column_name in self.scalers_:
+            return self._scale(series, column_name, out)
+        if column_name in self.tables_:
+            codes = self._encode(series, column_name).to_numpy()
+            # unknown code -1 takes the last value of table
+            np.take(self.tables_[column_name], codes, out=out)
+            return pd.Series(
+                out, index=series.index, name=series.name, copy=False
+            )
+        return self._encode(series, column_name, out)
+
+    def _out_of_fold_column(self, series, column_name, out=None, folds=None):
+        """Encode column by statistics of other folds of rows.
+
+        Statistics of all folds are aggregated by a single `np.bincount`
+        of fold and code of rows, statistics of other folds are the total
+        ones without the fold ones.
+
+        Parameters
+        ----------
+            series : pandas Series
+                Values of column.
+            column_name : Column name of data frame.
+            out : numpy array, optional
+                Array where encoded values are written.
+            folds : tuple
+                Folds of rows and target values of rows.
+
+        Returns
+        -------
+            values : pandas Series
+        """
+        if column_name not in self.tables_ or (
+            self._encoding_method(column_name) != "target"
+        ):
+            return self._transform_column(series, column_name, out)
+
+        folds, target = folds
+        codes = self._encode(series, column_name).to_numpy().astype(np.intp)
+        n_codes = self._n_codes(column_name)
+        known = codes >= 0
+        indices = folds * n_codes + codes
+        fold_statistics = self._group_statistics(
+            np.where(known, indices, -1), self.n_folds * n_codes, target
+        )
+        fold_statistics = fold_statistics.reshape(2, self.n_folds, n_codes)
+        fold_samples = np.bincount(folds, minlength=self.n_folds)
+        fold_sums = np.bincount(folds, weights=target, minlength=self.n_folds)
+
+        tables = self._encoding_table(
+            column_name,
+            self.statistics_[column_name] - fold_statistics.swapaxes(0, 1),
+            self.n_samples_ - fold_samples,
+            self.target_sum_ - fold_sums,
+        )
+        if out is None:
+            out = np.empty(len(series), dtype=np.float32)
+        out[:] = tables[folds, np.where(known, codes, n_codes)]
+
+        return pd.Series(out, index=series.index, name=series.name, copy=False)
+
+    def _inverse_transform_column(self, series, column_name):
+        """Decode or unscale values of column.
+
+        Parameters
+        ----------
+            series : pandas Series
+                Codes or scaled values of column.
+            column_name : Column name of data frame.
+
+        Returns
+        -------
+            values : pandas Series
+        """
+        if column_name in self.scalers_:
+            return self._unscale(series, column_name)
+        return self._decode(series, column_name)
+
+    def _is_decodable(self, column_name):
+        """Check whether column can be restored by inverse transform.
+
+        Parameters
+        ----------
+            column_name : Column name of data frame.
+
+        Returns
+        -------
+            is_decodable : bool
+                False for hashed, frequency and target encoded columns.
+        """
+        return (
+            column_name in self.categories_ and column_name not in self.tables_
+        ) or column_name in self.scalers_
+
+    def _scale(self, series, column_name, out=None):
+        """Scale values of numeric column.
+
+        Values are read once, shift and scale are applied while values
+        are written to output.
+
+        Parameters
+        ----------
+            series : pandas Series
+                Values of column.
+            column_name : Column name of data frame.
+            out : numpy array, optional
+                Array where scaled values are written.
+
+        Returns
+        -------
+            values : pandas Series
+                Scaled values, float32 if `out` isn't set.
+        """
+        shift, scale = self.scalers_[column_name]
+        values = series.to_numpy()
+        if values.dtype.kind not in {"i", "u", "f"}:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        if out is None:
+            out = np.empty(len(values), dtype=np.float32)
+
+        np.subtract(values, shift, out=out, casting="unsafe")
+        np.divide(out, scale, out=out, casting="unsafe")
+
+        return pd.Series(out, index=series.index, name=series.name, copy=False)
+
+    def _unscale(self, series, column_name):
+        """Restore scaled values of numeric column.
+
+        Parameters
+        ----------
+            series : pandas Series
+                Scaled values of column.
+            column_name : Column name of data frame.
+
+        Returns
+        -------
+            values : pandas Series
+                Values of fitted type of column, float64 for integer
+                columns with missing values.
+        """
+        shift, scale = self.scalers_[column_name]
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values * scale + shift
+
+        dtype = self.types_[column_name]
+        if dtype.kind in {"i", "u"} and not np.isnan(values).any():
+            values = np.rint(values).astype(dtype)
+        elif dtype.kind == "f":
+            values = values.astype(dtype, copy=False)
+
+        return pd.Series(values, index=series.index, name=series.name)
+
+    def _encode(self, series, column_name, out=None):
+        """Encode values of column by codes of its categories.
+
+        Parameters
+        ----------
+            series : pandas Series
+                Values of column.
+            column_name : Column name of data frame.
+            out : numpy array, optional
+                Array where codes are written.
+
+        Returns
+        -------
+            codes : pandas Series
+                Codes of values of the smallest integer type (or type of
+                `out`), values unseen during fit are encoded as -1.
+        """
+        if column_name in self.buckets_:
+            return self._hash(series, self.buckets_[column_name], out)
+
+        categories = self.categories_[column_name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # categories are looked up once, codes are remapped by them
+            table = categories.get_indexer(series.cat.categories)
+            missing = categories.isna()
+            table = np.append(
+                table, missing.argmax() if missing.any() else UNKNOWN_CODE
+            )
+            return self._remap_categorical(
+                series, table, codes_dtype(len(categories)), out
+            )
+
+        values = series.to_numpy()
+        codes = out
+        if codes is None:
+            codes = np.empty(len(values), dtype=codes_dtype(len(categories)))
+        self._index_codes(categories, values, codes)
+
+        return pd.Series(
+            codes, index=series.index, name=series.name, copy=False
+        )
+
+    @staticmethod
+    def _index_codes(categories, values, codes):
+        """Look up codes of values in categories chunk by chunk of rows.
+
+        Parameters
+        ----------
+            categories : pandas Index
+                Categories of column.
+            values : numpy array
+                Values of column.
+            codes : numpy array
+                Array where codes are written, values unseen during fit
+                are encoded as -1.
+        """
+        for start in range(0, len(values), CHUNK_SIZE):
+            rows = slice(start, start + CHUNK_SIZE)
+            # object index isn't converted to strings, so None and NaN
+            # stay different categories
+            codes[rows] = categories.get_indexer(
+                pd.Index(values[rows], dtype=object, copy=False)
+            )
+
+    def _process_codes(self, data, columns, function):
+        """Encode object columns in pool of processes before `function`.
+
+        Ordinal codes and hash buckets of object and string columns are
+        computed by worker processes (see `backend`) into shared memory,
+        other columns are left to `function`.
+
+        Parameters
+        ----------
+            data : Pandas data frame.
+            columns : list
+                Names of processed columns.
+            function : callable
+                Function of values, name of column and `out` array, e.g.
+                `_transform_column`.
+
+        Returns
+        -------
+            function : callable
+                `function` itself or function that takes codes of
+                columns encoded by processes.
+        """
+        columns = self._process_columns(
+            data,
+            [
+                column
+                for column in columns
+                if self._is_encoded(column) and column not in self.tables_
+            ],
+        )
+        if not columns:
+            return function
+
+        outputs = [
+            SharedArray(len(data), codes_dtype(self._n_codes(column)))
+            for column in columns
+        ]
+        try:
+            process_map(
+                _encode_objects,
+                [
+                    (
+                        np.asarray(data[column], dtype=object),
+                        (
+                            self.buckets_[column]
+                            if column in self.buckets_
+                            else self.categories_[column]
+                        ),
+                        out,
+                    )
+                    for column, out in zip(columns, outputs)
+                ],
+                self.n_jobs,
+            )
+            codes = {
+                column: out.array.copy()
+                for column, out in zip(columns, outputs)
+            }
+        finally:
+            for out in outputs:
+                out.close()
+
+        def apply(series, column_name, out=None):
+            if column_name not in codes:
+                return function(series, column_name, out=out)
+            values = codes[column_name]
+            if out is not None:
+                out[:] = values
+                values = out
+            return pd.Series(
+                values, index=series.index, name=series.name, copy=False
+            )
+
+        return apply
+
+    @staticmethod
+    def _hash(series, n_buckets, out=None):
+        """Encode values of column by hashes modulo number of buckets.
+
+        Parameters
+        ----------
+            series : pandas Series
+                Values of column.
+            n_buckets : int
+                Number of hash buckets.
+            out : numpy array, optional
+                Array where codes are written.
+
+        Returns
+        -------
+            codes : pandas Series
+                Hash buckets of values of the smallest integer type (or
+                type of `out`).
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            table = pd.util.hash_array(
+                np.asarray(series.cat.categories, dtype=object)
+            )
+            table = np.append(table, MISSING_HASH) % np.uint64(n_buckets)
+            return DataMapper._remap_categorical(
+                series, table, codes_dtype(n_buckets), out
+            )
+
+        codes = pd.util.hash_array(np.asarray(series, dtype=object))
+        codes %= np.uint64(n_buckets)
+        if out is None:
+            out = codes.astype(codes_dtype(n_buckets))
+        else:
+            out[:] = codes
+
+        return pd.Series(out, index=series.index, name=series.name, copy=False)
+
+    @staticmethod
+    def _remap_categorical(series, table, dtype, out=None):
+        """Remap codes of categorical column by table of its categories.
+
+        Parameters
+        ----------
+            series : pandas Series
+                Categorical values of column.
+            table : numpy array
+                New codes of categories of column, the last one is code
+                of missing value (code -1 of categorical).
+            dtype : numpy dtype
+                Type of new codes.
+            out : numpy array, optional
+                Array where new codes are written.
+
+        Returns
+        -------
+            codes : pandas Series
+        """
+        codes = table.astype(dtype)[series.cat.codes.to_numpy()]
+        if out is not None:
+            out[:] = codes
+            codes = out
+
+        return pd.Series(
+            codes, index=series.index, name=series.name, copy=False
+        )
+
+    def _decode(self, series, column_name):
+        """Decode codes of column back to its categories.
 
+        Parameters
+        ----------
+            series : pandas Series
+                Codes of values of column.
+            column_name : Column name of data frame.
 
-from_boolean_to_integers_map = {
-    False: 0,
-    True: 1,
-}
-from_integers_to_boolean_map = {
-    0: False,
-    1: True,
-}
+        Returns
+        -------
+            values : pandas Series
+                Categories taken from dense array of categories by codes.
+                Code -1, missing and out of range codes are decoded as
+                missing values.
+        """
+        categories = self.categories_[column_name]
+        codes = series.to_numpy()
+        if codes.dtype.kind not in {"i", "u"}:
+            codes = np.nan_to_num(codes.astype(np.float64), nan=UNKNOWN_CODE)
+        invalid = (codes < UNKNOWN_CODE) | (codes >= len(categories))
+        codes = (
+            np.where(invalid, UNKNOWN_CODE, codes) if invalid.any() else codes
+        )
 
+        dtype = self.types_.get(column_name)
+        if isinstance(dtype, pd.CategoricalDtype):
+            # codes are remapped to categories of fitted type
+            table = np.append(
+                dtype.categories.get_indexer(categories), UNKNOWN_CODE
+            )
+            return pd.Series(
+                pd.Categorical.from_codes(
+                    table[codes.astype(np.intp, copy=False)], dtype=dtype
+                ),
+                index=series.index,
+                name=series.name,
+            )
 
-class DataMapper:
-    """
-    Data mapper that handle bulk map of data.
-    """
+        return pd.Series(
+            categories.take(
+                codes.astype(np.intp, copy=False),
+                allow_fill=True,
+                fill_value=np.nan,
+            ).to_numpy(),
+            index=series.index,
+            name=series.name,
+            # string columns (`str` of pandas 3) keep their type
+            dtype=dtype if isinstance(dtype, pd.StringDtype) else None,
+        )
 
-    def __init__(self, scaling: (dict, str) = None, inplace: bool = False):
-        # TODO use scaling parameter in mapper
-        self.scaling = scaling
-        self.inplace = inplace
+    def fit(self, data, y=None):
+        """Fit the model with data.
 
-    def _get_new_data(self, data, empty_column: str = None):
-        """Prepare output data.
+        Parameters
+        ----------
+            data : narray-like or iterator.
+                Training data that represents as pandas data frame.
+                2-D numpy array of objects or strings is accepted too.
+                Iterator of chunks (e.g. `pd.read_csv(..., chunksize=...)`)
+                is processed chunk by chunk with `partial_fit`.
+            y : array-like or iterator, optional
+                Target values of rows (iterator of chunks of target for
+                iterator of chunks), required for target encoding.
+
+        Returns
+        -------
+        self : object
+            Returns the instance itself.
+        """
+        self._reset()
+
+        if isinstance(data, Iterator):
+            targets = repeat(None) if y is None else y
+            for chunk, chunk_y in zip(data, targets):
+                self.partial_fit(chunk, chunk_y)
+            return self
+
+        return self.partial_fit(data, y)
+
+    def partial_fit(self, data, y=None):
+        """Online fit of the model with chunk of data.
+
+        Vocabularies of columns are extended by categories of chunk,
+        categories seen in previous chunks keep their codes. Counts and
+        target sums of categories are accumulated between chunks.
 
         Parameters
         ----------
-            data: Pandas data frame.
-            empty_column : Column name of data frame.
+            data : narray-like.
+                Chunk of training data that represents as pandas data
+                frame.
+                Columns of 2-D numpy array are named by positions.
+            y : array-like, optional
+                Target values of rows of chunk.
 
         Returns
         -------
-            data_new : narray-like, shape (n_samples, n_components)
+        self : object
+            Returns the instance itself.
         """
-        if self.inplace:
-            data_new = data
-        else:
-            if isinstance(data, pd.DataFrame):
-                if empty_column:
-                    data_new = copy.deepcopy(data)
-                    data_new[empty_column] = np.full(
-                        len(data_new[empty_column]), np.nan
-                    )
-                else:
-                    data_new = pd.DataFrame(
-                        OrderedDict((_, []) for _ in data.columns)
-                    )
-            elif isinstance(data, pd.Series):
-                data_new = data.copy()
-            else:
-                raise AttributeError(
-                    "Invalid `data` type. It should be instance of pandas "
-                    "Series or DataFrame."
-                )
+        # data and target are checked before any fitted state is changed
+        data = self._check_array(data)
+        target = self._check_target(data, y)
+        self._check_encoding_target(data, target)
+        if not hasattr(self, "categories_"):
+            self._reset()
 
-        return data_new
+        self._construct_data_types(data)
+        self._construct_data_mappers(data)
+        self._construct_scalers(data)
+        self._construct_statistics(data, target)
+        self._compile_lookups()
+        self._compile_tables()
 
-    def _construct_data_types(self, data):
-        """Create map of relation column/type for data.
+        return self
+
+    @staticmethod
+    def _check_array(data, kinds=("O", "U", "S")):
+        """Wrap 2-D numpy array into data frame.
+
+        Columns of array are named by their positions. Arrays of objects
+        and numbers are wrapped without copy, arrays of strings are copied
+        into object columns. Columns of objects and strings are kept as
+        objects, so they aren't inferred as `str` columns of pandas 3.
 
         Parameters
         ----------
+            data : narray-like.
+                Pandas data frame or 2-D numpy array.
+            kinds : tuple of str
+                Allowed kinds of type of array.
+
+        Returns
+        -------
             data : Pandas data frame.
         """
-        self.types_ = dict(zip(data.columns, data.dtypes))
+        if not isinstance(data, np.ndarray):
+            return data
+        if data.ndim != 2 or data.dtype.kind not in kinds:
+            raise AttributeError(
+                "Invalid `data` array. It should be 2-D array of "
+                "objects or strings."
+            )
+        if data.dtype.kind in ("U", "S"):
+            data = data.astype(object)
+        return pd.DataFrame(
+            data, dtype=object if data.dtype.kind == "O" else None, copy=False
+        )
 
-    def _construct_data_mappers(self, data):
+    @staticmethod
+    def _check_target(data, y):
+        """Convert target values to float array.
+
+        Parameters
+        ----------
+            data : Pandas data frame.
+            y : array-like or None
+                Target values of rows of data.
+
+        Returns
+        -------
+            target : numpy array or None
         """
-        Create map of column/map of data that consists in this column.
+        if y is None:
+            return None
+
+        target = np.asarray(y, dtype=np.float64)
+        if target.shape != (len(data),):
+            raise AttributeError(
+                "Invalid `y` shape. It should have a value for each row "
+                "of data."
+            )
+        return target
+
+    def _check_encoding_target(self, data, target):
+        """Check that target is passed if data has target encoded columns.
 
         Parameters
         ----------
             data : Pandas data frame.
+            target : numpy array or None
+                Target values of rows of data.
         """
-        # FIXME currently we use only one mapper. In future we need add more
-        self.mappers_ = {}
-        for column_, type_ in self.types_.items():
-            if type_ == "object":
-                self.mappers_.setdefault(
-                    column_, from_explanatory_to_integers(data.get(column_))
+        if target is not None:
+            return
+
+        categories = getattr(self, "categories_", {})
+        buckets = getattr(self, "buckets_", {})
+        for column_, type_ in zip(data.columns, data.dtypes):
+            if (
+                is_explanatory_type(type_)
+                or column_ in categories
+                or column_ in buckets
+            ) and self._encoding_method(column_) == "target":
+                raise AttributeError(
+                    "Invalid target. Target encoding requires `y`."
                 )
 
-    def _get_mapper_for_column(self, column_name):
-        """Get mapper for given column.
+    def transform(self, data):
+        """Apply data mapper on data.
 
         Parameters
         ----------
-            column_name : Column name of data frame.
+            data : narray-like or iterator.
+                Training data that represents as pandas data frame.
+                2-D numpy array of objects or strings is encoded into
+                numpy array.
+                Iterator of chunks is encoded lazily chunk by chunk.
 
         Returns
         -------
-            data_mapper : dict - mapper for given column.
+            data_new : narray-like, shape (n_samples, n_components)
+                Encoded data or generator of encoded chunks.
         """
-        return self.mappers_.get(column_name, {})
+        if isinstance(data, Iterator):
+            return self._transform_chunks(data, self.transform)
 
-    def _get_reversed_mapper_for_column(self, column_name):
-        """
-        Get reversed mapper (where keys and values swap) for given column.
+        return self._transform(data, self._transform_column)
+
+    def _transform(self, data, function):
+        """Apply function to encoded and scaled columns of data.
 
         Parameters
         ----------
-            column_name : Column name of data frame.
+            data : Pandas data frame.
+            function : callable
+                `_transform_column` or out-of-fold encoding of columns.
 
         Returns
         -------
-            data_mapper : dict - mapper for given column.
+            data_new : narray-like, shape (n_samples, n_components)
         """
-        return dict(
-            (v, k) for k, v in self.mappers_.get(column_name, {}).items()
+        if isinstance(data, np.ndarray):
+            return self._transform_array(data, function)
+
+        data_new = self._get_new_data(data)
+
+        # columns without mapper share data with input, scaled columns
+        # are written into a single float32 block, codes of encoded
+        # columns keep their integer types
+        positions = [
+            position
+            for position, column in enumerate(data.columns)
+            if self._is_mapped(column)
+        ]
+        function = self._process_codes(
+            data, [data.columns[_] for _ in positions], function
+        )
+        return self._set_columns(
+            data, data_new, positions, function, dtype=np.float32
         )
 
-    def fit(self, data):
-        """Fit the model with data.
+    def _transform_array(self, data, function):
+        """Apply function to columns of 2-D array.
+
+        Codes of columns are written directly into a preallocated array
+        of the smallest common type of codes (float32 if columns are
+        frequency or target encoded).
 
         Parameters
         ----------
-            data : narray-like.
-                Training data that represents as pandas data frame.
+            data : numpy array, shape (n_samples, n_columns)
+                Array of objects or strings.
+            function : callable
+                `_transform_column` or out-of-fold encoding of columns.
 
         Returns
         -------
-        self : object
-            Returns the instance itself.
+            data_new : numpy array, shape (n_samples, n_columns)
         """
-        self._construct_data_types(data)
-        self._construct_data_mappers(data)
+        frame = self._check_array(data)
+        columns = list(frame.columns)
+        if not all(self._is_encoded(column) for column in columns):
+            raise AttributeError(
+                "Invalid `data` array. All columns of array should be "
+                "encoded by data mapper."
+            )
 
-        return self
+        if any(column in self.tables_ for column in columns):
+            dtype = np.float32
+        else:
+            dtype = np.result_type(
+                np.int8,
+                *[codes_dtype(self._n_codes(column)) for column in columns],
+            )
+        data_new = np.empty(data.shape, dtype=dtype, order="F")
+        function = self._process_codes(frame, columns, function)
+        parallel_map(
+            lambda i: function(
+                frame.iloc[:, i], columns[i], out=data_new[:, i]
+            ),
+            range(len(columns)),
+            self.n_jobs,
+        )
 
-    def transform(self, data):
-        """Apply data mapper on data.
+        return data_new
+
+    def _inverse_transform_array(self, data):
+        """Decode columns of 2-D array of codes.
 
         Parameters
         ----------
-            data : narray-like.
-                Training data that represents as pandas data frame.
+            data : numpy array, shape (n_samples, n_columns)
+                Codes of columns.
 
         Returns
         -------
-            data_new : narray-like, shape (n_samples, n_components)
+            data_new : numpy array, shape (n_samples, n_columns)
+                Array of objects, columns which can't be decoded are
+                left as is.
         """
-        data_new = self._get_new_data(data)
+        frame = self._check_array(data, kinds=("i", "u", "f"))
+        data_new = np.empty(data.shape, dtype=object, order="F")
 
-        for column in data.columns:
-            mapper = self._get_mapper_for_column(column)
-            if mapper:
-                # apply mapper
-                data_new[column] = data.get(column).map(mapper)
-            else:
-                # just copy data
-                data_new[column] = data.get(column)
+        def decode(position):
+            column = frame.columns[position]
+            values = frame.iloc[:, position]
+            if self._is_decodable(column):
+                values = self._inverse_transform_column(values, column)
+            data_new[:, position] = values.to_numpy()
+
+        parallel_map(decode, range(frame.shape[1]), self.n_jobs)
 
         return data_new
 
-    def fit_transform(self, data):
+    def fit_transform(self, data, y=None):
         """Fit the model with data and apply data mapper on data.
 
+        Target encoded columns are encoded out-of-fold: rows are
+        randomly split into `n_folds` folds and rows of each fold are
+        encoded by target statistics of other folds, so encoded values
+        don't leak target of row itself.
+
         Parameters
         ----------
             data : narray-like.
                 Training data that represents as pandas data frame.
+                2-D numpy array of objects or strings is encoded into
+                numpy array.
+            y : array-like, optional
+                Target values of rows, required for target encoding.
+                Out-of-fold encoding needs the whole data, so iterator of
+                chunks isn't accepted together with `y`.
 
         Returns
         -------
             data_new : narray-like, shape (n_samples, n_components)
         """
-        self.fit(data)
-        return self.transform(data)
+        if y is None:
+            self.fit(data)
+            return self.transform(data)
+
+        if isinstance(data, Iterator) or isinstance(y, Iterator):
+            raise AttributeError(
+                "Invalid `data` type. Out-of-fold encoding requires the "
+                "whole data and `y`, not iterators of chunks."
+            )
+        if (
+            isinstance(self.n_folds, bool)
+            or not isinstance(self.n_folds, (int, np.integer))
+            or self.n_folds < 2
+        ):
+            raise AttributeError(
+                "Invalid `n_folds` value. It should be integer greater "
+                "than 1."
+            )
+
+        self.fit(data, y)
+        folds = (
+            check_random_state(self.random_state).permutation(len(data))
+            % self.n_folds
+        )
+        return self._transform(
+            data,
+            partial(
+                self._out_of_fold_column,
+                folds=(folds, self._check_target(data, y)),
+            ),
+        )
 
     def inverse_transform(self, data):
         """Transform data back to its original view.
 
         Parameters
         ----------
-            data : narray-like.
+            data : narray-like or iterator.
                 Training data that represents as pandas data frame.
+                2-D numpy array of codes is decoded into numpy array.
+                Iterator of chunks is decoded lazily chunk by chunk.
 
         Returns
         -------
             data_new : narray-like, shape (n_samples, n_components)
+                Decoded data or generator of decoded chunks.
         """
+        if isinstance(data, Iterator):
+            return self._transform_chunks(data, self.inverse_transform)
+        if isinstance(data, np.ndarray):
+            return self._inverse_transform_array(data)
+
         data_new = self._get_new_data(data)
 
-        for column in data.columns:
-            mapper = self._get_reversed_mapper_for_column(column)
-            if mapper:
-                # apply mapper
-                data_new[column] = data.get(column).map(mapper)
+        # columns without mapper share data with input, hashed,
+        # frequency and target encoded columns can't be decoded
+        positions = [
+            position
+            for position, column in enumerate(data.columns)
+            if self._is_decodable(column)
+        ]
+        return self._set_columns(
+            data, data_new, positions, self._inverse_transform_column
+        )
+
+    def _one_hot_columns(self):
+        """Get encoded columns in order of fit.
+
+        Returns
+        -------
+            columns : list of tuples
+                Pairs of name of column and number of its categories (or
+                hash buckets).
+        """
+        return [
+            (
+                column,
+                (
+                    self.buckets_[column]
+                    if column in self.buckets_
+                    else len(self.categories_[column])
+                ),
+            )
+            for column in self.types_
+            if self._is_encoded(column)
+        ]
+
+    def get_feature_names_out(self):
+        """Get names of one-hot features of `one_hot_transform`.
+
+        Returns
+        -------
+            feature_names : numpy array of str
+                Names of features as `<column>_<category>` (or
+                `<column>_<bucket>` for hashed columns) in order of
+                columns of output matrix.
+        """
+        names = []
+        for column, n_categories in self._one_hot_columns():
+            if column in self.buckets_:
+                categories = range(n_categories)
             else:
-                # just copy data
-                data_new[column] = data.get(column)
+                categories = self.categories_[column]
+            names.extend(f"{column}_{category}" for category in categories)
 
-        return data_new
+        return np.asarray(names, dtype=object)
+
+    def one_hot_transform(self, data, dtype=np.float32):
+        """Apply data mapper on data and one-hot encode its codes.
+
+        Sparse matrix is built from codes of columns directly, one column
+        of matrix per category of encoded column. Values unseen during
+        fit (or rare ones) have no non-zero entry. Columns without mapper
+        aren't included, names of columns of matrix are given by
+        `get_feature_names_out`.
+
+        Parameters
+        ----------
+            data : narray-like.
+                Data that represents as pandas data frame.
+            dtype : numpy dtype
+                Type of values of matrix.
+
+        Returns
+        -------
+            matrix : scipy sparse csr_matrix, shape (n_samples, n_features)
+        """
+        data = self._check_array(data)
+        if not isinstance(data, pd.DataFrame):
+            raise AttributeError(
+                "Invalid `data` type. It should be instance of pandas "
+                "DataFrame or 2-D numpy array."
+            )
+        columns = self._one_hot_columns()
+        missing = [column for column, _ in columns if column not in data]
+        if missing:
+            raise AttributeError(
+                f"Invalid data. Columns {missing} not exists in data."
+            )
+
+        names = [column for column, _ in columns]
+        encode = self._process_codes(data, names, self._encode)
+        codes = parallel_map(
+            lambda column: encode(data[column], column).to_numpy(),
+            names,
+            self.n_jobs,
+        )
+        sizes = np.array([n_categories for _, n_categories in columns])
+        offsets = np.concatenate([[0], np.cumsum(sizes)])
+        # indptr holds number of stored values up to rows, so int32 should
+        # fit both the number of features and the total number of values
+        n_values = max(int(offsets[-1]), len(data) * len(columns))
+        index_dtype = np.int32 if n_values < 2**31 else np.int64
+
+        indices = np.empty((len(data), len(columns)), dtype=index_dtype)
+        for position, column_codes in enumerate(codes):
+            indices[:, position] = column_codes
+        known = indices >= 0
+        indices += offsets[:-1].astype(index_dtype)
+
+        indptr = np.zeros(len(data) + 1, dtype=index_dtype)
+        np.cumsum(known.sum(axis=1), out=indptr[1:])
+        indices = indices[known]
+
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=dtype), indices, indptr),
+            shape=(len(data), int(offsets[-1])),
+        )
+
+    def transform_record(self, record):
+        """Apply data mapper on a single record or list of records.
+
+        Values are encoded by lookup tables of columns without pandas, so
+        this method is intended for online inference of records one by
+        one (e.g. parsed JSON requests).
+
+        Parameters
+        ----------
+            record : dict or list of dicts
+                Record(s) with values of columns by names of columns.
+
+        Returns
+        -------
+            record_new : dict or list of dicts
+                New record(s) where values of mapped columns are replaced
+                by their codes (values unseen during fit are encoded as
+                -1) and values of scaled columns are scaled. Values of
+                other columns are left as is.
+                Hashed columns are encoded value by value with
+                `pd.util.hash_array`, which is slower than lookup.
+        """
+        if isinstance(record, dict):
+            return self._transform_record(record)
+        if not isinstance(record, list):
+            raise AttributeError(
+                "Invalid `record` type. It should be instance of dict or "
+                "list of dicts."
+            )
+        if not record:
+            return []
+
+        columns = ld_to_dl(record)
+        if not columns or any(
+            len(values) != len(record) for values in columns.values()
+        ):
+            # records have different columns
+            return [self._transform_record(record_) for record_ in record]
+
+        for column, (mapper, missing) in self.lookups_.items():
+            if column in columns:
+                columns[column] = [
+                    self._lookup(value, mapper, missing)
+                    for value in columns[column]
+                ]
+        for column, n_buckets in self.buckets_.items():
+            if column in columns:
+                columns[column] = [
+                    self._hash_value(value, n_buckets)
+                    for value in columns[column]
+                ]
+        for column, (shift, scale) in self.scalers_.items():
+            if column in columns:
+                columns[column] = [
+                    self._scale_value(value, shift, scale)
+                    for value in columns[column]
+                ]
+        for column, table in self.tables_.items():
+            if column in columns:
+                columns[column] = [float(table[_]) for _ in columns[column]]
+
+        return dl_to_ld(columns)
+
+    def _transform_record(self, record):
+        """Apply data mapper on a single record.
+
+        Parameters
+        ----------
+            record : dict
+                Values of columns by names of columns.
+
+        Returns
+        -------
+            record_new : dict
+                New record with codes of values of mapped columns.
+        """
+        record_new = dict(record)
+        for column, (mapper, missing) in self.lookups_.items():
+            if column in record_new:
+                record_new[column] = self._lookup(
+                    record_new[column], mapper, missing
+                )
+        for column, n_buckets in self.buckets_.items():
+            if column in record_new:
+                record_new[column] = self._hash_value(
+                    record_new[column], n_buckets
+                )
+        for column, (shift, scale) in self.scalers_.items():
+            if column in record_new:
+                record_new[column] = self._scale_value(
+                    record_new[column], shift, scale
+                )
+        for column, table in self.tables_.items():
+            if column in record_new:
+                record_new[column] = float(table[record_new[column]])
+
+        return record_new
+
+    @staticmethod
+    def _scale_value(value, shift, scale):
+        """Scale a single value of numeric column.
+
+        Parameters
+        ----------
+            value : float or None
+                Value of column.
+            shift : float
+            scale : float
+
+        Returns
+        -------
+            value : float
+                Scaled value, NaN for missing value.
+        """
+        if value is None:
+            return np.nan
+        return (value - shift) / scale
+
+    @staticmethod
+    def _lookup(value, mapper, missing):
+        """Find code of value in lookup table of column.
+
+        Parameters
+        ----------
+            value : object
+                Value of column.
+            mapper : dict
+                Codes of categories of column.
+            missing : int
+                Code of missing value.
+
+        Returns
+        -------
+            code : int
+                Code of value, -1 if value wasn't seen during fit.
+        """
+        code = mapper.get(value)
+        if code is None:
+            # NaN isn't equal to itself, so it's found by identity only
+            code = missing if value is None or value != value else UNKNOWN_CODE
+        return code
+
+    @staticmethod
+    def _hash_value(value, n_buckets):
+        """Find hash bucket of a single value.
+
+        Parameters
+        ----------
+            value : object
+                Value of column.
+            n_buckets : int
+                Number of hash buckets.
+
+        Returns
+        -------
+            code : int
+                Hash bucket of value, the same as `_hash` gives.
+        """
+        if value is None or value != value:
+            return int(MISSING_HASH % np.uint64(n_buckets))
+        values = np.empty(1, dtype=object)
+        values[0] = value
+        code = pd.util.hash_array(values, categorize=False)[0]
+        return int(code % np.uint64(n_buckets))
+
+    @staticmethod
+    def _transform_chunks(chunks, function):
+        """Lazily apply transform to chunks of data.
+
+        Parameters
+        ----------
+            chunks : iterator
+                Chunks of data that represent as pandas data frames.
+            function : callable
+                `transform` or `inverse_transform`.
+
+        Yields
+        ------
+            data_new : narray-like, shape (n_samples, n_components)
+                Transformed chunk.
+        """
+        for chunk in chunks:
+            yield function(chunk)
 
     def column_transform(self, data, column):
         """Apply data mapper on data.
@@ -226,7 +2165,7 @@ class DataMapper:
         -------
             data_new : narray-like, shape (n_samples, n_components)
         """
-        if column not in self.mappers_.keys():
+        if not self._is_mapped(column):
             raise AttributeError(
                 "Invalid name of column. Column not exists in mappers."
             )
@@ -235,19 +2174,7 @@ class DataMapper:
                 "Invalid name of column. Column not exists in data."
             )
 
-        data_new = self._get_new_data(data, empty_column=column)
-        mapper = self._get_mapper_for_column(column)
-        if isinstance(data, pd.DataFrame):
-            data_new[column] = data.get(column).map(mapper)
-        elif isinstance(data, pd.Series):
-            data_new.update(data.map(mapper))
-        else:
-            raise AttributeError(
-                "Invalid `data` type. It should be instance of pandas "
-                "Series or DataFrame."
-            )
-
-        return data_new
+        return self._column_apply(data, column, self._transform_column)
 
     def column_inverse_transform(self, data, column):
         """Transform data back to its original view.
@@ -262,7 +2189,12 @@ class DataMapper:
         -------
             data_new : narray-like, shape (n_samples, n_components)
         """
-        if column not in self.mappers_.keys():
+        if column in self.buckets_ or column in self.tables_:
+            raise AttributeError(
+                "Invalid name of column. Hashed, frequency and target "
+                "encoded columns can't be decoded."
+            )
+        if column not in self.mappers_ and column not in self.scalers_:
             raise AttributeError(
                 "Invalid name of column. Column not exists in mappers."
             )
@@ -271,16 +2203,32 @@ class DataMapper:
                 "Invalid name of column. Column not exists in data."
             )
 
-        data_new = self._get_new_data(data, empty_column=column)
-        mapper = self._get_reversed_mapper_for_column(column)
+        return self._column_apply(data, column, self._inverse_transform_column)
+
+    def _column_apply(self, data, column, function):
+        """Apply encoding or decoding to a single column of data.
+
+        Parameters
+        ----------
+            data : narray-like.
+                Pandas data frame or series with values of column.
+            column : Column name of data frame.
+            function : callable
+                `_transform_column` or `_inverse_transform_column`.
+
+        Returns
+        -------
+            data_new : narray-like, shape (n_samples, n_components)
+                Data frame whose other columns share data with input or
+                new series (series can't change its type inplace).
+        """
+        data_new = self._get_new_data(data)
         if isinstance(data, pd.DataFrame):
-            data_new[column] = data.get(column).map(mapper)
-        elif isinstance(data, pd.Series):
-            data_new.update(data.map(mapper))
-        else:
-            raise AttributeError(
-                "Invalid `data` type. It should be instance of pandas "
-                "Series or DataFrame."
+            position = data.columns.get_loc(column)
+            self._set_column(
+                data_new, position, function(data.iloc[:, position], column)
             )
+        else:
+            data_new = function(data, column)
 
         return data_new
@@ -1,4 +1,4 @@
-from .memory import MemoryOptimiser
+from .memory import FixedPoint, MemoryOptimiser, lookup_dtypes
 
 
-__all__ = ("MemoryOptimiser",)
+__all__ = ("FixedPoint", "MemoryOptimiser", "lookup_dtypes")
@@ -1,13 +1,90 @@
+import os
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+from collections import namedtuple
+from collections.abc import Iterator
+
 import numpy as np
 import pandas as pd
 
-from pandas.api.types import CategoricalDtype
+from pandas.api.extensions import ExtensionDtype
+from pandas.api.types import (
+    CategoricalDtype,
+    is_integer_dtype,
+    is_string_dtype,
+    pandas_dtype,
+)
+from scipy import sparse
 from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils import check_random_state
+
+from ...constants import (
+    NUMERICS,
+    NULLABLE_INTEGERS,
+    INTEGERS_RANGES,
+    ALL_INTEGERS_RANGES,
+    FLOATS_RANGES,
+)
+from ...utils.parallel import n_workers, parallel_map
+
+
+__all__ = ("MemoryOptimiser", "FixedPoint", "lookup_dtypes")
+
+
+# Maximal number of elements in row chunk of data processed at once
+BLOCK_SIZE = 2**20
+
+# Maximal number of columns of pandas block copied to numpy at once
+COLUMN_SLICE = 64
+
+# Modes in which types are determined by analysis of data
+ANALYSIS_MODES = {"auto", "convert", "decimal"}
+
+# Behaviours of `transform` on values out of range of optimised types
+OUT_OF_RANGE = {"ignore", "raise", "widen"}
+
+# Formats of scipy sparse matrices whose arrays are optimised
+SPARSE_FORMATS = {"csr", "csc", "coo", "bsr"}
+
+
+# Fixed-point type of float data stored as integers `dtype` scaled by
+# 10 ** `decimals`
+FixedPoint = namedtuple("FixedPoint", ("dtype", "decimals"))
+
+
+def lookup_dtypes(data_min, data_max, ranges):
+    """Find the narrowest type for every feature from ranges of types.
+
+    Parameters
+    ----------
+        data_min : array_like, shape (n_features,)
+            Per feature minimal values.
+        data_max : array_like, shape (n_features,)
+            Per feature maximal values.
+        ranges : OrderedDict
+            Types with their ranges of values ordered from the widest to
+            the narrowest type, e.g. `INTEGERS_RANGES` or `FLOATS_RANGES`.
 
-from ...constants import NUMERICS, INTEGERS_RANGES, FLOATS_RANGES
+    Returns
+    -------
+        dtypes : list
+            Per feature the narrowest type whose range contains feature
+            values or None if there isn't such type.
+    """
+    types = list(ranges.keys())[::-1]
+    # extended precision represents int64 and float128 bounds exactly
+    bounds = np.array(list(ranges.values())[::-1], dtype=np.longdouble)
+    data_min = np.asarray(data_min, dtype=np.longdouble)[:, None]
+    data_max = np.asarray(data_max, dtype=np.longdouble)[:, None]
 
+    fits = (data_min >= bounds[:, 0]) & (data_max <= bounds[:, 1])
+    found = fits.any(axis=1)
+    indexes = fits.argmax(axis=1)
 
-__all__ = ("MemoryOptimiser",)
+    return [types[i] if f else None for i, f in zip(indexes, found)]
 
 
 class MemoryOptimiser(BaseEstimator, TransformerMixin):
@@ -21,24 +98,191 @@ class MemoryOptimiser(BaseEstimator, TransformerMixin):
         - 'auto' : simply determine types from training data.
         - 'convert' : additional to 'auto' perform inter type
                       optimisation e.g. between float and integer.
+        - 'decimal' : additional to 'convert' store float features
+                      whose values have at most `max_decimals` decimal
+                      places as scaled integers, see `FixedPoint` and
+                      `inverse_transform`.
         - type : predefine type of data. Can be python or numpy types.
-        - array of types : predefine type for every feature.
-                           Feature index used as array index.
-        - dict of types : predefine type for every feature.
-                          Feature index/name used as keys.
+        - array of types : predefine type or mode for every feature.
+                           Feature index used as array index, length
+                           must match number of features.
+        - dict of types : predefine type or mode for every feature.
+                          Feature index/name used as keys. Features
+                          that are absent in dict are kept untouched.
+
+        Array and dict of types are supported for pandas DataFrame only.
+
+        Scipy sparse matrices (formats csr, csc, coo and bsr) are
+        optimised as a single feature - array of stored values is
+        converted to optimised type (float16 is replaced by float32,
+        that is the narrowest float type supported by scipy) and index
+        arrays are converted to int32 if they fit it.
 
     axis : int (0 by default)
         axis used to optimise along. If 0, independently optimise each
         feature, otherwise (if 1) optimise each sample.
 
+    structured : boolean, optional, default False
+        Set to True to optimise columns of 2-D numpy ndarray
+        independently (if `axis` is 0). Transformed array is then always
+        a structured array with field `f<i>` per column, even if all
+        columns get the same type. Otherwise numpy ndarray is optimised
+        as a single feature.
+
     copy : boolean, optional, default True
         Set to False to perform inplace row optimisation and avoid a
-        copy (if the input is already a numpy array).
+        copy (if the input is already a numpy array). Columns of pandas
+        DataFrame are replaced inplace only in `low_memory` mode.
+
+    low_memory : boolean, optional, default False
+        Set to True to transform pandas DataFrame column by column,
+        block of columns with the same type after block, instead of
+        building the whole optimised frame next to the original one.
+        Together with `copy=False` columns are replaced inplace, so the
+        original buffer of every block is released as soon as all its
+        columns are converted. Buffer of a block isn't released column by
+        column: it's held until its last column is replaced and isn't
+        released at all if some of its columns keep their type.
+
+    unsigned : boolean, optional, default True
+        Set to False to search only signed integer types. Otherwise
+        unsigned type is chosen for non-negative features when it is
+        narrower than signed one, e.g. uint8 for values 0-255.
+
+    nullable : boolean, optional, default True
+        Set to False to keep pandas features with missing values as
+        float. Otherwise integral float features with missing values
+        (in 'convert' mode) and pandas nullable integer features are
+        optimised to pandas nullable integer types `Int8`...`UInt64`.
+
+    category_ratio : float or None, optional, default 0.5
+        Object features of pandas data with ratio of unique values to
+        number of values below `category_ratio` are converted to
+        category type with categories found during fit. Pandas picks
+        the narrowest integer type for categories codes itself. Set to
+        None to keep object features untouched.
+
+    category_sample_size : int, optional, default 100000
+        Features longer than `category_sample_size` are checked on the
+        random sample of this size first, so high cardinality features
+        are skipped without hashing of all their values. Ratio of
+        unique values in sample doesn't underestimate ratio of the
+        whole feature, but it can overestimate it when number of unique
+        values is comparable to the sample size.
+
+    parse_strings : boolean, optional, default False
+        Set to True to parse object features of pandas data whose values
+        are numeric, boolean ('true'/'false' in any case) or datetime
+        strings. Sample of feature (see `category_sample_size`) is
+        probed with vectorised pandas parsers first, then the whole
+        feature is parsed and optimised as numeric, boolean or datetime
+        feature. `transform` parses such features the same way.
+
+    max_decimals : int, optional, default 4
+        Maximal number of decimal places of float features stored as
+        fixed-point integers in 'decimal' mode.
+
+    float_atol, float_rtol : float or None, optional, default None
+        Absolute and relative tolerance of float downcasting. If any of
+        them is set, float feature is converted to a narrower float type
+        only if for all its values round trip error through this type
+        satisfies `abs(x - y) <= float_atol + float_rtol * abs(x)`.
+        Otherwise only range of values is checked.
+
+    sample_size : int, float or None, optional, default None
+        Number (if int) or fraction (if float) of rows of data (of every
+        chunk for `partial_fit`) randomly sampled for analysis. Set to
+        None to analyse all rows.
+
+    random_state : int, RandomState instance or None, optional
+        Random state used for sampling of rows.
+
+    out_of_range : 'ignore', 'raise', 'widen' or None, optional, default None
+        What to do in `transform` when numeric feature has values out
+        of range of its optimised type or categorical feature has values
+        unseen during fit, e.g. because optimiser was fitted on sample.
+        None means 'widen' if `sample_size` is set and 'ignore'
+        otherwise.
+
+        - 'ignore' : don't check data, values are wrapped around or
+                     missing after conversion.
+        - 'raise' : raise ValueError.
+        - 'widen' : convert data to the narrowest type that fits both
+                    fitted and new values, fitted `data_types_` aren't
+                    changed.
+
+        Fixed-point features of 'decimal' mode are checked for values
+        with more decimal places too, they raise ValueError or are kept
+        in their float type.
+
+    sparse_ratio : float or None, optional, default None
+        Numeric features of pandas data with ratio of zero (or missing)
+        values to number of values at least `sparse_ratio` are converted
+        to pandas `SparseDtype` with optimised subtype and the most
+        frequent of these values as fill value. Features with missing
+        values get float subtype, that represents exactly all values of
+        integral features. Features that are sparse already are kept
+        sparse with optimised subtype. Set to None to convert only
+        features that are sparse already.
+
+    memmap_dir : str or None, optional, default None
+        Directory where `transform` creates `.npy` files for optimised
+        memory-mapped arrays. `np.memmap` and paths to `.npy` files
+        (opened memory-mapped) are analysed and transformed by row
+        chunks, so arrays larger than memory are optimised on disk.
+        If None, system temporary directory is used.
+
+    n_jobs : int or None, optional, default None
+        Number of threads used to analyse and transform columns of
+        pandas DataFrame. Numpy reductions and conversions release the
+        GIL, so blocks of columns are processed in parallel with the
+        same results as serial processing. None means 1, -1 means all
+        processors, -2 all but one and so on.
+
+    report : boolean, optional, default False
+        Set to True to measure memory usage of features before and after
+        `transform`. Memory of object features is measured deeply, i.e.
+        with their python objects, which takes two extra passes over them,
+        so the report isn't for free.
+
+    trace_memory : boolean, optional, default False
+        Set to True to record peak memory of `transform` with
+        `tracemalloc` in `peak_memory_`. Tracing slows down allocations,
+        and if `tracemalloc` is already tracing, its peak is reset.
 
     Attributes
     ----------
-    data_types_ : ndarray, shape (n_features,)
-        Per feature new data types.
+    data_types_ : type, list or dict
+        New data type, per feature new data types of 2-D ndarray or
+        column name/new data type of pandas DataFrame.
+
+    data_stats_ : dict
+        Per feature statistics (min/max values and integrality)
+        accumulated by `fit`/`partial_fit`. Only set in analysis modes.
+
+    mode_optimisers_ : dict
+        Optimisers that analyse features per analysis mode. Only set if
+        `mode` is array or dict of types.
+
+    peak_memory_ : int
+        Peak memory in bytes allocated by the last `transform` on top of
+        memory used before it (the largest one of chunks of iterator).
+        Only set if `trace_memory` is True.
+
+    analysis_time_ : float
+        Time in seconds spent by `fit`/`partial_fit` calls since the last
+        `fit`.
+
+    transform_time_ : float
+        Time in seconds spent by the last `transform` (by all chunks of
+        iterator).
+
+    memory_report_ : pandas DataFrame
+        Per feature original and optimised types ('dtype_before',
+        'dtype_after') and memory in bytes ('bytes_before', 'bytes_after',
+        'bytes_saved') of the last `transform` (summed over all chunks
+        of iterator). Times of analysis and transform are stored in its
+        `attrs`. Only set if `report` is True.
 
     Examples
     --------
@@ -65,23 +309,84 @@ class MemoryOptimiser(BaseEstimator, TransformerMixin):
         Load data reduce memory usage.
     """
 
-    def __init__(self, mode="auto", axis=0, copy=True):
-        if isinstance(mode, str) and mode in {"auto", "convert"}:
-            self.mode = mode
-
-        elif isinstance(mode, (list, tuple, dict)):
-            raise NotImplementedError("Not implemented yet.")
-
-        elif mode in NUMERICS:
-            self.mode = mode
+    def __init__(
+        self,
+        mode="auto",
+        axis=0,
+        structured=False,
+        copy=True,
+        low_memory=False,
+        unsigned=True,
+        nullable=True,
+        category_ratio=0.5,
+        category_sample_size=100000,
+        parse_strings=False,
+        max_decimals=4,
+        float_atol=None,
+        float_rtol=None,
+        sample_size=None,
+        random_state=None,
+        out_of_range=None,
+        sparse_ratio=None,
+        memmap_dir=None,
+        n_jobs=None,
+        report=False,
+        trace_memory=False,
+    ):
+        if isinstance(mode, (list, tuple, dict)):
+            items = mode.values() if isinstance(mode, dict) else mode
+            for item in items:
+                self._check_mode(item)
 
         else:
-            raise AttributeError(
-                "Passed invalid value of `mode` - `{}`.".format(mode)
-            )
+            self._check_mode(mode)
+
+        self.mode = mode
 
         self.axis = axis
+        self.structured = structured
         self.copy = copy
+        self.low_memory = low_memory
+        self.unsigned = unsigned
+        self.nullable = nullable
+        self.category_ratio = category_ratio
+        self.category_sample_size = category_sample_size
+        self.parse_strings = parse_strings
+        self.max_decimals = max_decimals
+        self.float_atol = float_atol
+        self.float_rtol = float_rtol
+        self.sample_size = sample_size
+        self.random_state = random_state
+        self.out_of_range = out_of_range
+        self.sparse_ratio = sparse_ratio
+        self.memmap_dir = memmap_dir
+        self.n_jobs = n_jobs
+        self.report = report
+        self.trace_memory = trace_memory
+
+    @staticmethod
+    def _check_mode(mode):
+        """Check that mode of a single feature is valid.
+
+        Parameters
+        ----------
+            mode : str or type
+                One of analysis modes or predefined type.
+
+        Raises
+        ------
+            AttributeError
+                If passed invalid value of `mode`.
+        """
+        if isinstance(mode, str) and mode in ANALYSIS_MODES:
+            return
+
+        if not isinstance(mode, (list, tuple, dict)) and mode in NUMERICS:
+            return
+
+        raise AttributeError(
+            "Passed invalid value of `mode` - `{}`.".format(mode)
+        )
 
     def _reset(self):
         """Reset internal data-dependent state of the optimiser, if necessary.
@@ -90,150 +395,2582 @@ class MemoryOptimiser(BaseEstimator, TransformerMixin):
         """
         if hasattr(self, "data_types_"):
             del self.data_types_
+        if hasattr(self, "data_stats_"):
+            del self.data_stats_
+        if hasattr(self, "mode_optimisers_"):
+            del self.mode_optimisers_
+        if hasattr(self, "random_state_"):
+            del self.random_state_
+        if hasattr(self, "analysis_time_"):
+            del self.analysis_time_
+        if hasattr(self, "transform_time_"):
+            del self.transform_time_
+        if hasattr(self, "memory_report_"):
+            del self.memory_report_
 
-    def _analyze_series(self, data):
-        """Analyse pandas Series.
+    def _column_groups(self, n_columns, width=None):
+        """Split columns of block to contiguous groups, one per thread.
 
         Parameters
         ----------
-            data : pandas Series
-                An numobservations by numdimensions array of observations.
+            n_columns : int
+                Number of columns in block.
+            width : int, optional
+                Maximal number of columns in group, groups are not limited
+                by default.
+
+        Returns
+        -------
+            groups : list of slices
         """
-        origin_type = data.dtype
-        dtype = origin_type
+        n_groups = n_workers(self.n_jobs, n_columns)
+        if width is not None:
+            n_groups = max(n_groups, -(-n_columns // width))
+        bounds = np.linspace(0, n_columns, n_groups + 1, dtype=int)
+        return [slice(start, stop) for start, stop in zip(bounds, bounds[1:])]
 
-        if isinstance(origin_type, CategoricalDtype):
-            dtype = "category"
+    @staticmethod
+    def _empty_stats(dtype, kind=None):
+        """Create statistics of data that has not got any observations.
 
-        elif origin_type != object:
-            data_min = data.min()
-            data_max = data.max()
-            convert = False
+        Parameters
+        ----------
+            dtype : numpy dtype or pandas extension dtype
+                Original type of data.
+            kind : str, optional
+                Kind of data - numpy kind character for numeric data,
+                'category' for categorical data or None otherwise.
 
-            if self.mode == "convert":
-                fraction, integral = np.modf(data)
-                if not np.any(fraction):
-                    convert = True
+        Returns
+        -------
+            stats : dict
+                Statistics with keys `dtype`, `kind`, `min`, `max`,
+                `integral` and `nullable` (data has missing values or
+                has nullable type). Statistics of object data (kind 'O')
+                additionally have keys `size` and `categories` (unique
+                values or None for high cardinality data). Statistics of
+                float data have key `precise` with set of narrower float
+                types within tolerance if `float_atol`/`float_rtol` set
+                and key `decimals` with per number of decimal places
+                flags that values are exact fixed-point numbers in
+                'decimal' mode. Statistics of numeric data of pandas
+                Series/DataFrame have keys `size`, `zeros` and `nans`
+                with numbers of all, zero and missing values if
+                `sparse_ratio` is set or data is sparse, in which case
+                key `sparse` is set too.
+        """
+        return {
+            "dtype": dtype,
+            "kind": kind,
+            "min": None,
+            "max": None,
+            "integral": True,
+            "nullable": False,
+        }
 
-            if str(origin_type)[:3] == "int" or convert:
-                for nptype, (range_min, range_max) in INTEGERS_RANGES.items():
-                    if data_min > range_min and data_max < range_max:
-                        dtype = nptype
+    @staticmethod
+    def _numeric_kind(dtype):
+        """Get numpy kind character of numeric type or None otherwise.
 
-            else:
-                for nptype, (range_min, range_max) in FLOATS_RANGES.items():
-                    if data_min > range_min and data_max < range_max:
-                        dtype = nptype
+        Parameters
+        ----------
+            dtype : numpy dtype or pandas extension dtype
+                Type of data.
 
-        return dtype
+        Returns
+        -------
+            kind : str or None
+                One of 'i', 'u', 'f' for numeric numpy types.
+        """
+        if isinstance(dtype, np.dtype) and dtype.kind in {"i", "u", "f"}:
+            return dtype.kind
+        return None
 
-    def _analyze_np_array(self, data):
-        """Analyse numpy ndarray.
+    @staticmethod
+    def _is_nullable_integer(dtype):
+        """Check if type is pandas nullable integer type.
 
         Parameters
         ----------
-            data : narray-like
-                An numobservations by numdimensions array of observations.
+            dtype : numpy dtype or pandas extension dtype
+                Type of data.
+
+        Returns
+        -------
+            result : boolean
+        """
+        return isinstance(dtype, ExtensionDtype) and is_integer_dtype(dtype)
+
+    @staticmethod
+    def _is_string_type(dtype):
+        """Check if type is object or pandas string type.
+
+        Parameters
+        ----------
+            dtype : numpy dtype or pandas extension dtype
+                Type of data.
+
+        Returns
+        -------
+            result : boolean
+                True for object and string (`str` of pandas 3) types.
+        """
+        return is_string_dtype(dtype) and not isinstance(
+            dtype, CategoricalDtype
+        )
+
+    def _is_convert_mode(self):
+        """Check if optimiser performs inter type optimisation.
+
+        Returns
+        -------
+            result : boolean
+        """
+        return self.mode in {"convert", "decimal"}
+
+    def _check_precision(self):
+        """Check if float downcasting should be checked against tolerance.
+
+        Returns
+        -------
+            result : boolean
+        """
+        return self.float_atol is not None or self.float_rtol is not None
+
+    @staticmethod
+    def _narrower_floats(dtype):
+        """Get float types that are narrower than given type.
+
+        Parameters
+        ----------
+            dtype : numpy dtype
+                Float type of data.
+
+        Returns
+        -------
+            types : list
+                Narrower float types from `FLOATS_RANGES`.
         """
-        origin_type = data.dtype.type
-        dtype = origin_type
+        return [
+            _ for _ in FLOATS_RANGES if np.dtype(_).itemsize < dtype.itemsize
+        ]
 
-        if origin_type in NUMERICS:
-            data_min = data.min()
-            data_max = data.max()
-            convert = False
+    def _reduce_block(self, chunks, n_columns, dtype, count_zeros=False):
+        """Reduce homogeneous block of data to per column statistics.
 
-            if self.mode == "convert":
-                fraction, integral = np.modf(data)
-                if not np.any(fraction):
-                    convert = True
+        Block is read by row chunks, so temporary arrays are bounded by
+        size of a chunk instead of size of the whole block.
 
-            if str(origin_type).split(".")[1][:3] == "int" or convert:
-                for nptype, (range_min, range_max) in INTEGERS_RANGES.items():
-                    if data_min > range_min and data_max < range_max:
-                        dtype = nptype
+        Parameters
+        ----------
+            chunks : iterable of 2-D ndarrays
+                Row chunks of block with `n_columns` columns.
+            n_columns : int
+                Number of columns in block.
+            dtype : numpy dtype
+                Type of block.
+            count_zeros : boolean, optional
+                Whether to count zero values.
+
+        Returns
+        -------
+            mins : ndarray or None
+                Per column minimal values ignoring NaN.
+            maxs : ndarray or None
+                Per column maximal values ignoring NaN.
+            integral : ndarray
+                Per column flag that all values except NaN are integral.
+            nans : ndarray
+                Per column number of NaN values.
+            zeros : ndarray or None
+                Per column number of zero values if `count_zeros` is set.
+            precise : ndarray, shape (n_candidates, n_columns)
+                Per narrower float type (see `_narrower_floats`) and per
+                column flag that round trip error of values is within
+                tolerance. All flags are set if precision isn't checked.
+            decimals : ndarray, shape (max_decimals, n_columns)
+                Per number of decimal places (from 1) and per column flag
+                that values scaled by 10 ** decimals are integral and
+                scaling back restores exactly the same values.
+        """
+        mins = maxs = buffer = mask = equal = tolerance = None
+        kind = dtype.kind
+        integral = np.ones(n_columns, dtype=bool)
+        nans = np.zeros(n_columns, dtype=np.int64)
+        zeros = np.zeros(n_columns, dtype=np.int64) if count_zeros else None
+        check_integral = self._is_convert_mode() and kind == "f"
+        check_decimals = self.mode == "decimal" and kind == "f"
+        decimals = np.full((self.max_decimals, n_columns), check_decimals)
+
+        candidates = self._narrower_floats(dtype) if kind == "f" else []
+        precise = np.ones((len(candidates), n_columns), dtype=bool)
+        check_precision = self._check_precision() and candidates
+
+        for chunk in chunks:
+            if not len(chunk):
+                continue
 
+            if buffer is None or buffer.shape != chunk.shape:
+                buffer = np.empty_like(chunk)
+                mask = np.empty(chunk.shape, dtype=bool)
+
+            chunk_min = np.fmin.reduce(chunk, axis=0)
+            chunk_max = np.fmax.reduce(chunk, axis=0)
+            if mins is None:
+                mins, maxs = chunk_min, chunk_max
             else:
-                for nptype, (range_min, range_max) in FLOATS_RANGES.items():
-                    if data_min > range_min and data_max < range_max:
-                        dtype = nptype
+                np.fmin(mins, chunk_min, out=mins)
+                np.fmax(maxs, chunk_max, out=maxs)
 
-        return dtype
+            if check_integral:
+                # fraction is computed inplace into the reused buffer,
+                # NaN fraction of missing values is ignored by fmin/fmax
+                np.trunc(chunk, out=buffer)
+                np.subtract(chunk, buffer, out=buffer)
+                integral &= np.nan_to_num(np.fmax.reduce(buffer, axis=0)) == 0
+                integral &= np.nan_to_num(np.fmin.reduce(buffer, axis=0)) == 0
 
-    def _data_analyze(self, data):
-        """Create map of relation column/type for data.
+            if kind == "f":
+                np.isnan(chunk, out=mask)
+                nans += np.count_nonzero(mask, axis=0)
+
+            if check_decimals:
+                if equal is None or equal.shape != chunk.shape:
+                    equal = np.empty(chunk.shape, dtype=bool)
+                for position in range(self.max_decimals):
+                    scale = 10.0 ** (position + 1)
+                    np.multiply(chunk, scale, out=buffer)
+                    np.rint(buffer, out=buffer)
+                    np.divide(buffer, scale, out=buffer)
+                    # missing values are stored as missing in any type
+                    np.equal(buffer, chunk, out=equal)
+                    np.logical_or(equal, mask, out=equal)
+                    decimals[position] &= np.logical_and.reduce(equal, axis=0)
+
+            if count_zeros:
+                np.equal(chunk, 0, out=mask)
+                zeros += np.count_nonzero(mask, axis=0)
+
+            if check_precision:
+                if tolerance is None or tolerance.shape != chunk.shape:
+                    tolerance = np.empty_like(chunk)
+                np.abs(chunk, out=tolerance)
+                np.multiply(tolerance, self.float_rtol or 0, out=tolerance)
+                np.add(tolerance, self.float_atol or 0, out=tolerance)
+
+                for position, candidate in enumerate(candidates):
+                    # round trip error, NaN error of missing values and
+                    # infinities fails the comparison and is ignored
+                    with np.errstate(over="ignore", invalid="ignore"):
+                        np.subtract(chunk, chunk.astype(candidate), out=buffer)
+                    np.abs(buffer, out=buffer)
+                    np.greater(buffer, tolerance, out=mask)
+                    precise[position] &= ~np.logical_or.reduce(mask, axis=0)
+
+        return mins, maxs, integral, nans, zeros, precise, decimals
+
+    def _block_stats(self, chunks, dtype, n_columns, nullable=True, size=None):
+        """Compute statistics of homogeneous block of data.
 
         Parameters
         ----------
-            data : narray-like, pandas Series/DataFrame
+            chunks : iterable of 2-D ndarrays
+                Row chunks of block.
+            dtype : numpy dtype
+                Original type of block.
+            n_columns : int
+                Number of columns in block.
+            nullable : boolean, optional
+                Whether data can be converted to nullable integer types.
+                If not, columns with missing values are not integral.
+            size : int, optional
+                Number of rows of block. If set, zero and missing values
+                are counted for sparse conversion.
+
+        Returns
+        -------
+            stats : list of dict
+                Per column statistics, see `_empty_stats`.
+        """
+        mins, maxs, integral, nans, zeros, precise, decimals = (
+            self._reduce_block(
+                chunks, n_columns, dtype, count_zeros=size is not None
+            )
+        )
+        missing = nans > 0
+        if not (nullable and self.nullable):
+            integral &= ~missing
+            decimals &= ~missing
+
+        candidates = []
+        if dtype.kind == "f" and self._check_precision():
+            candidates = self._narrower_floats(dtype)
+
+        stats = []
+        for position in range(n_columns):
+            column_stats = self._empty_stats(dtype, kind=dtype.kind)
+            column_stats["nullable"] = bool(missing[position])
+            if candidates:
+                column_stats["precise"] = {
+                    candidate
+                    for candidate, flags in zip(candidates, precise)
+                    if flags[position]
+                }
+            if self.mode == "decimal" and dtype.kind == "f":
+                column_stats["decimals"] = decimals[:, position].tolist()
+            if size is not None:
+                column_stats["size"] = size
+                column_stats["zeros"] = int(zeros[position])
+                column_stats["nans"] = int(nans[position])
+            if mins is not None and not np.isnan(mins[position]):
+                column_stats["min"] = mins[position]
+                column_stats["max"] = maxs[position]
+                column_stats["integral"] = bool(integral[position])
+            stats.append(column_stats)
+
+        return stats
+
+    @staticmethod
+    def _row_chunks(values, n_columns):
+        """Split rows of data to chunks of bounded size.
+
+        Parameters
+        ----------
+            values : ndarray or pandas DataFrame
+                Data with rows along first axis.
+            n_columns : int
+                Number of columns in data.
+
+        Returns
+        -------
+            slices : generator of slices
+        """
+        step = max(1, BLOCK_SIZE // max(1, n_columns))
+        for start in range(0, len(values), step):
+            yield slice(start, start + step)
+
+    def _nullable_integer_stats(self, data):
+        """Compute statistics of pandas Series with nullable integer type.
+
+        Parameters
+        ----------
+            data : pandas Series
                 An numobservations by numdimensions array of observations.
+
+        Returns
+        -------
+            stats : dict
+                Statistics of the series, see `_empty_stats`.
         """
-        if isinstance(data, pd.Series):
-            self.data_types_ = self._analyze_series(data)
-        elif isinstance(data, pd.DataFrame):
-            self.data_types_ = dict()
-            for column_name in data.columns:
-                self.data_types_[column_name] = self._analyze_series(
-                    data[column_name]
-                )
-        elif isinstance(data, np.ndarray):
-            self.data_types_ = self._analyze_np_array(data)
+        stats = self._empty_stats(data.dtype, kind=data.dtype.kind)
+        stats["nullable"] = True
+        if data.count():
+            stats["min"] = data.min()
+            stats["max"] = data.max()
 
-    def _fill_data_types(self, data):
-        """Fill map of relation column/type for data with mode as dtype.
+        return stats
+
+    def _object_stats(self, data):
+        """Compute statistics of pandas Series with object or string type.
+
+        Features with unhashable values (lists, dicts) can't be converted
+        to categories and are left as is.
 
         Parameters
         ----------
-            data : narray-like, pandas Series/DataFrame
+            data : pandas Series
                 An numobservations by numdimensions array of observations.
+
+        Returns
+        -------
+            stats : dict
+                Statistics of the series, see `_empty_stats`.
         """
-        if isinstance(data, pd.Series):
-            self.data_types_ = self.mode
-        elif isinstance(data, pd.DataFrame):
-            self.data_types_ = dict()
-            for column_name in data.columns:
-                self.data_types_[column_name] = self.mode
-        elif isinstance(data, np.ndarray):
-            self.data_types_ = self.mode
+        values = sample = data.to_numpy()
+        if len(values) > self.category_sample_size:
+            sample = values[
+                np.random.RandomState(0).randint(
+                    0, len(values), self.category_sample_size
+                )
+            ]
 
-    def fit(self, data):
-        """Fit a preprocessor with data.
+        if self.parse_strings:
+            kind = self._probe_strings(sample[pd.notnull(sample)])
+            if kind is not None:
+                parsed = self._parse_strings(data, kind)
+                if parsed.count() == data.count():
+                    return self._series_stats(parsed)
 
-        Compute optimized types for columns.
+        if self.category_ratio is None:
+            return self._empty_stats(data.dtype)
+
+        stats = self._empty_stats(data.dtype, kind="O")
+        stats["size"] = len(data)
+        stats["categories"] = None
+
+        try:
+            if sample is not values:
+                n_unique = len(pd.unique(sample[pd.notnull(sample)]))
+                if n_unique >= self.category_ratio * len(sample):
+                    return stats
+
+            # ratio is checked for all chunks together in `_stats_to_dtypes`
+            stats["categories"] = pd.Index(
+                pd.unique(values[pd.notnull(values)])
+            )
+        except TypeError:
+            # unhashable values
+            return self._empty_stats(data.dtype)
+
+        return stats
+
+    @staticmethod
+    def _probe_strings(sample):
+        """Find parser that parses all values of sample.
 
         Parameters
         ----------
-            data : narray-like, pandas Series/DataFrame
-                Input data based on which we compute parameters.
+            sample : ndarray
+                Sample of not missing values of object feature.
 
         Returns
         -------
-            self : object
-                Returns the instance itself.
+            kind : str or None
+                'numeric', 'bool' or 'datetime' or None if values can't
+                be parsed.
         """
-        if self.mode in {
-            "auto",
-            "convert",
-        }:
-            self._data_analyze(data)
+        if not len(sample):
+            return None
 
-        elif self.mode in NUMERICS:
-            self._fill_data_types(data)
+        sample = pd.Series(sample, dtype=object)
+        for kind in ("numeric", "bool", "datetime"):
+            if MemoryOptimiser._parse_strings(sample, kind).notnull().all():
+                return kind
+
+        return None
+
+    @staticmethod
+    def _parse_strings(data, kind):
+        """Parse values of object feature with vectorised pandas parser.
+
+        Parameters
+        ----------
+            data : pandas Series
+                Values of object feature.
+            kind : str
+                Kind of values - 'numeric', 'bool' or 'datetime'.
+
+        Returns
+        -------
+            parsed : pandas Series
+                Parsed values, values that can't be parsed are missing.
+        """
+        if kind == "numeric":
+            return pd.to_numeric(data, errors="coerce")
+
+        if kind == "bool":
+            values = data.astype("string").str.lower()
+            return (values == "true").where(values.isin(("true", "false")))
+
+        with warnings.catch_warnings():
+            # format that can't be inferred falls back to slow parsing
+            warnings.simplefilter("ignore", UserWarning)
+            return pd.to_datetime(data, errors="coerce")
+
+    def _counts_size(self, values):
+        """Get number of rows for `_block_stats` if values are counted.
+
+        Parameters
+        ----------
+            values : ndarray
+                Values of pandas Series/DataFrame.
+
+        Returns
+        -------
+            size : int or None
+                Number of rows if `sparse_ratio` is set or None otherwise.
+        """
+        return None if self.sparse_ratio is None else len(values)
+
+    def _sparse_series_stats(self, data):
+        """Compute statistics of pandas Series with sparse type.
+
+        Only stored values are processed, positions with fill value are
+        accounted for by their number.
+
+        Parameters
+        ----------
+            data : pandas Series
+                An numobservations by numdimensions array of observations.
+
+        Returns
+        -------
+            stats : dict
+                Statistics of the series, see `_empty_stats`.
+        """
+        origin_type = data.dtype
+        subtype, fill_value = origin_type.subtype, origin_type.fill_value
+        if self._numeric_kind(subtype) is None or not (
+            pd.isnull(fill_value) or fill_value == 0
+        ):
+            return self._empty_stats(origin_type)
+
+        values = data.array.sp_values[:, None]
+        chunks = (values[_] for _ in self._row_chunks(values, 1))
+        stats = self._block_stats(chunks, subtype, 1, size=len(values))[0]
+        stats["sparse"] = True
+        stats["size"] = len(data)
 
+        n_fill = len(data) - len(values)
+        if not n_fill:
+            return stats
+
+        if pd.isnull(fill_value):
+            stats["nans"] += n_fill
+            stats["nullable"] = True
+            if not self.nullable:
+                stats["integral"] = False
         else:
-            pass
-            # TODO implement functionality with list and dict of types
+            stats["zeros"] += n_fill
+            if stats["min"] is None:
+                stats["min"] = stats["max"] = subtype.type(0)
+            else:
+                stats["min"] = min(stats["min"], subtype.type(0))
+                stats["max"] = max(stats["max"], subtype.type(0))
 
-    def transform(self, data):
-        """Apply preprocessor to data.
+        return stats
+
+    def _series_stats(self, data):
+        """Compute statistics needed for type analysis of pandas Series.
 
         Parameters
         ----------
-            data : narray-like, pandas Series/DataFrame
-                Input data that will be transformed.
+            data : pandas Series
+                An numobservations by numdimensions array of observations.
 
         Returns
         -------
-            data_new : narray-like, shape (n_samples, n_components)
+            stats : dict
+                Statistics of the series, see `_empty_stats`.
+        """
+        origin_type = data.dtype
+
+        if isinstance(origin_type, CategoricalDtype):
+            return self._empty_stats(origin_type, kind="category")
+
+        if isinstance(origin_type, pd.SparseDtype):
+            return self._sparse_series_stats(data)
+
+        if self._is_nullable_integer(origin_type):
+            return self._nullable_integer_stats(data)
+
+        if self._is_string_type(origin_type) and (
+            self.category_ratio is not None or self.parse_strings
+        ):
+            return self._object_stats(data)
+
+        if self._numeric_kind(origin_type) is None:
+            return self._empty_stats(origin_type)
+
+        values = data.to_numpy()[:, None]
+        chunks = (values[_] for _ in self._row_chunks(values, 1))
+        return self._block_stats(
+            chunks, origin_type, 1, size=self._counts_size(values)
+        )[0]
+
+    def _frame_stats(self, data):
+        """Compute statistics needed for type analysis of pandas DataFrame.
+
+        Columns are grouped into homogeneous blocks by type and every
+        block is reduced in slices of at most `COLUMN_SLICE` columns, so
+        only the slices being reduced are copied to numpy. With `n_jobs`
+        slices are reduced in parallel together with other columns.
+
+        Parameters
+        ----------
+            data : pandas DataFrame
+                An numobservations by numdimensions array of observations.
+
+        Returns
+        -------
+            stats : dict
+                Column name/statistics of the column.
+        """
+        stats = [None] * len(data.columns)
+
+        # tasks are tuples of positions of columns, function and its
+        # arguments, that computes statistics of these columns
+        tasks = []
+        blocks = {}
+        for position, origin_type in enumerate(data.dtypes):
+            if isinstance(origin_type, CategoricalDtype):
+                stats[position] = self._empty_stats(
+                    origin_type, kind="category"
+                )
+            elif (
+                isinstance(origin_type, pd.SparseDtype)
+                or self._is_nullable_integer(origin_type)
+                or (
+                    self._is_string_type(origin_type)
+                    and (self.category_ratio is not None or self.parse_strings)
+                )
+            ):
+                tasks.append(
+                    (
+                        [position],
+                        self._series_stats,
+                        (data.iloc[:, position],),
+                    )
+                )
+            elif self._numeric_kind(origin_type) is None:
+                stats[position] = self._empty_stats(origin_type)
+            else:
+                blocks.setdefault(origin_type, []).append(position)
+
+        for origin_type, positions in blocks.items():
+            for group in self._column_groups(len(positions), COLUMN_SLICE):
+                tasks.append(
+                    (
+                        positions[group],
+                        self._slice_stats,
+                        (data, positions[group], origin_type),
+                    )
+                )
+
+        results = parallel_map(
+            lambda task: task[1](*task[2]), tasks, self.n_jobs
+        )
+        for (positions, _, _), task_stats in zip(tasks, results):
+            if isinstance(task_stats, dict):
+                task_stats = [task_stats]
+            for position, column_stats in zip(positions, task_stats):
+                stats[position] = column_stats
+
+        return dict(zip(data.columns, stats))
+
+    def _slice_stats(self, data, positions, dtype):
+        """Compute statistics of slice of columns of pandas DataFrame.
+
+        Parameters
+        ----------
+            data : pandas DataFrame
+                An numobservations by numdimensions array of observations.
+            positions : list of int
+                Positions of columns of the same type.
+            dtype : numpy dtype
+                Type of the columns.
+
+        Returns
+        -------
+            stats : list of dict
+                Per column statistics, see `_empty_stats`.
+        """
+        first, last = positions[0], positions[-1]
+        if last - first + 1 == len(positions):
+            # contiguous columns of single block are taken as a view
+            positions = slice(first, last + 1)
+
+        return self._values_stats(
+            data.iloc[:, positions].to_numpy(dtype=dtype)
+        )
+
+    def _values_stats(self, values, nullable=True):
+        """Compute statistics of columns of homogeneous numeric block.
+
+        Parameters
+        ----------
+            values : 2-D ndarray
+                Columns of block, possibly a view of the whole block.
+            nullable : boolean, optional
+                Whether values are columns of pandas data, that can be
+                converted to nullable or sparse types.
+
+        Returns
+        -------
+            stats : list of dict
+                Per column statistics, see `_empty_stats`.
+        """
+        n_columns = values.shape[1]
+        chunks = (values[_] for _ in self._row_chunks(values, n_columns))
+        return self._block_stats(
+            chunks,
+            values.dtype,
+            n_columns,
+            nullable=nullable,
+            size=self._counts_size(values) if nullable else None,
+        )
+
+    def _np_array_stats(self, data):
+        """Compute statistics needed for type analysis of numpy ndarray.
+
+        Parameters
+        ----------
+            data : narray-like
+                An numobservations by numdimensions array of observations.
+
+        Returns
+        -------
+            stats : dict or list of dict
+                Statistics of the array, see `_empty_stats`, or per column
+                statistics of 2-D array if `structured` is set.
+        """
+        origin_type = data.dtype
+
+        if data.ndim == 2 and self.axis == 0 and self.structured:
+            if self._numeric_kind(origin_type) is None:
+                return [self._empty_stats(origin_type)] * data.shape[1]
+
+            # row chunks of memory-mapped array are read from disk one
+            # after another
+            groups = [data[:, _] for _ in self._column_groups(data.shape[1])]
+            return [
+                column_stats
+                for group_stats in parallel_map(
+                    lambda values: self._values_stats(values, False),
+                    groups,
+                    self.n_jobs,
+                )
+                for column_stats in group_stats
+            ]
+
+        if self._numeric_kind(origin_type) is None:
+            return self._empty_stats(origin_type)
+
+        values = data.reshape(-1, 1)
+        chunks = (values[_] for _ in self._row_chunks(values, 1))
+        return self._block_stats(chunks, origin_type, 1, nullable=False)[0]
+
+    def _sparse_matrix_stats(self, data):
+        """Compute statistics needed for type analysis of scipy sparse
+        matrix.
+
+        Parameters
+        ----------
+            data : scipy sparse matrix
+                An numobservations by numdimensions matrix of observations.
+
+        Returns
+        -------
+            stats : dict
+                Statistics of stored values and implicit zeros, see
+                `_empty_stats`.
+        """
+        stats = self._np_array_stats(data.data)
+        if stats["kind"] is None or data.nnz == np.prod(data.shape):
+            return stats
+
+        zero = data.dtype.type(0)
+        if stats["min"] is None:
+            stats["min"] = stats["max"] = zero
+        else:
+            stats["min"] = min(stats["min"], zero)
+            stats["max"] = max(stats["max"], zero)
+
+        return stats
+
+    @staticmethod
+    def _merge_stats(stats, other):
+        """Merge statistics of two chunks of the same feature.
+
+        Parameters
+        ----------
+            stats : dict
+                Statistics accumulated from previous chunks.
+            other : dict
+                Statistics of a new chunk.
+
+        Returns
+        -------
+            stats : dict
+                Statistics that describe both chunks.
+        """
+        if stats["kind"] == "category" and other["kind"] == "category":
+            return other
+
+        if stats["kind"] == "O" and other["kind"] == "O":
+            merged = dict(other)
+            merged["size"] = stats["size"] + other["size"]
+            if stats["categories"] is None or other["categories"] is None:
+                merged["categories"] = None
+            else:
+                categories = other["categories"]
+                merged["categories"] = stats["categories"].append(
+                    categories[~categories.isin(stats["categories"])]
+                )
+            return merged
+
+        for chunk, rest in ((stats, other), (other, stats)):
+            # chunk of object or categorical feature may be parsed as
+            # numeric one, e.g. when it holds only missing values
+            if (
+                chunk["min"] is None
+                and chunk["kind"] not in {None, "category", "O"}
+                and rest["kind"] in {"category", "O"}
+            ):
+                return rest
+
+        if stats["kind"] in {None, "category", "O"} or other["kind"] in {
+            None,
+            "category",
+            "O",
+        }:
+            dtype = other["dtype"] if stats["kind"] else stats["dtype"]
+            return MemoryOptimiser._empty_stats(dtype)
+
+        dtype = np.promote_types(
+            getattr(stats["dtype"], "numpy_dtype", stats["dtype"]),
+            getattr(other["dtype"], "numpy_dtype", other["dtype"]),
+        )
+        merged = MemoryOptimiser._empty_stats(dtype, kind=dtype.kind)
+        merged["integral"] = stats["integral"] and other["integral"]
+        merged["nullable"] = stats["nullable"] or other["nullable"]
+        if "decimals" in stats or "decimals" in other:
+            merged["decimals"] = [
+                a and b
+                for a, b in zip(
+                    stats.get("decimals", [False] * len(other["decimals"])),
+                    other.get("decimals", [False] * len(stats["decimals"])),
+                )
+            ]
+        if "precise" in stats or "precise" in other:
+            merged["precise"] = stats.get("precise", set()) & other.get(
+                "precise", set()
+            )
+        if "zeros" in stats or "zeros" in other:
+            for key in ("size", "zeros", "nans"):
+                merged[key] = stats.get(key, 0) + other.get(key, 0)
+        if stats.get("sparse") or other.get("sparse"):
+            merged["sparse"] = True
+        if (
+            merged["nullable"]
+            and dtype.kind in {"i", "u"}
+            and not merged.get("sparse")
+        ):
+            merged["dtype"] = pandas_dtype(NULLABLE_INTEGERS[dtype.type])
+
+        values = [_ for _ in (stats, other) if _["min"] is not None]
+        if values:
+            merged["min"] = values[0]["min"]
+            merged["max"] = values[0]["max"]
+            for item in values[1:]:
+                merged["min"] = np.minimum(merged["min"], item["min"])
+                merged["max"] = np.maximum(merged["max"], item["max"])
+
+        return merged
+
+    def _stats_to_dtypes(self, stats):
+        """Determine optimised types of features from their statistics.
+
+        Numeric features are matched against types ranges at once, see
+        `lookup_dtypes`.
+
+        Parameters
+        ----------
+            stats : list of dict
+                Per feature statistics, see `_empty_stats`.
+
+        Returns
+        -------
+            dtypes : list
+                Per feature optimised types.
+        """
+        dtypes = []
+        integers, fixed, floats = [], [], []
+        fill_values = {}
+        for position, feature_stats in enumerate(stats):
+            if feature_stats["kind"] == "category":
+                dtypes.append("category")
+                continue
+
+            if feature_stats["kind"] == "O":
+                categories = feature_stats["categories"]
+                if (
+                    categories is not None
+                    and len(categories)
+                    < self.category_ratio * feature_stats["size"]
+                ):
+                    dtypes.append(CategoricalDtype(categories))
+                else:
+                    dtypes.append(feature_stats["dtype"])
+                continue
+
+            dtypes.append(feature_stats["dtype"])
+            fill_value = self._sparse_fill_value(feature_stats)
+            if fill_value is not None:
+                fill_values[position] = fill_value
+            if feature_stats["kind"] is None or feature_stats["min"] is None:
+                continue
+
+            if feature_stats["kind"] in {"i", "u"} or (
+                self._is_convert_mode() and feature_stats["integral"]
+            ):
+                integers.append(position)
+            elif fill_value is None and any(feature_stats.get("decimals", ())):
+                fixed.append(position)
+            else:
+                floats.append(position)
+
+        integers_ranges = (
+            ALL_INTEGERS_RANGES if self.unsigned else INTEGERS_RANGES
+        )
+        if fixed:
+            floats.extend(
+                self._stats_to_fixed_points(
+                    stats, fixed, dtypes, integers_ranges
+                )
+            )
+
+        for positions, ranges in (
+            (integers, integers_ranges),
+            (floats, FLOATS_RANGES),
+        ):
+            if not positions:
+                continue
+
+            found = lookup_dtypes(
+                [stats[_]["min"] for _ in positions],
+                [stats[_]["max"] for _ in positions],
+                ranges,
+            )
+            for position, dtype in zip(positions, found):
+                if dtype is None:
+                    continue
+                if "precise" in stats[position] and ranges is FLOATS_RANGES:
+                    dtype = self._precise_float(stats[position], dtype)
+                if stats[position]["nullable"] and ranges is not FLOATS_RANGES:
+                    if position in fill_values:
+                        # sparse type can't be nullable integer
+                        dtype = self._exact_float(dtype, stats[position])
+                    else:
+                        dtype = NULLABLE_INTEGERS[dtype]
+                dtypes[position] = dtype
+
+        for position, fill_value in fill_values.items():
+            dtypes[position] = pd.SparseDtype(dtypes[position], fill_value)
+
+        return dtypes
+
+    def _sparse_fill_value(self, stats):
+        """Determine fill value of sparse type of numeric feature.
+
+        Parameters
+        ----------
+            stats : dict
+                Statistics of feature, see `_empty_stats`.
+
+        Returns
+        -------
+            fill_value : 0, NaN or None
+                The most frequent of zero and missing values if feature is
+                sparse or should be converted to sparse type, otherwise
+                None.
+        """
+        if "zeros" not in stats:
+            return None
+
+        if stats["zeros"] >= stats["nans"]:
+            fill_value, count = 0, stats["zeros"]
+        else:
+            fill_value, count = np.nan, stats["nans"]
+
+        if stats.get("sparse") or (
+            self.sparse_ratio is not None
+            and stats["size"]
+            and count >= self.sparse_ratio * stats["size"]
+        ):
+            return fill_value
+        return None
+
+    @staticmethod
+    def _exact_float(dtype, stats):
+        """Find float type that represents exactly all values of integer
+        type.
+
+        Parameters
+        ----------
+            dtype : type
+                Integer type that fits range of data.
+            stats : dict
+                Statistics of data, see `_empty_stats`.
+
+        Returns
+        -------
+            dtype : type
+                Float type with twice wider item than integer type (so its
+                mantissa is wider than integer) or float type of data if
+                it isn't wider.
+        """
+        itemsize = min(2 * np.dtype(dtype).itemsize, 8)
+        for candidate in reversed(FLOATS_RANGES):
+            if np.dtype(candidate).itemsize == itemsize:
+                break
+
+        origin_type = np.dtype(stats["dtype"])
+        if origin_type.kind == "f" and origin_type.itemsize <= itemsize:
+            return origin_type.type
+        return candidate
+
+    def _stats_to_fixed_points(self, stats, positions, dtypes, ranges):
+        """Determine fixed-point types of features from their statistics.
+
+        Parameters
+        ----------
+            stats : list of dict
+                Per feature statistics, see `_empty_stats`.
+            positions : list of int
+                Positions of features with fixed-point values.
+            dtypes : list
+                Per feature optimised types, updated inplace.
+            ranges : OrderedDict
+                Ranges of integer types.
+
+        Returns
+        -------
+            positions : list of int
+                Positions of features that don't fit any integer type
+                narrower than original type.
+        """
+        decimals = [stats[_]["decimals"].index(True) + 1 for _ in positions]
+        found = lookup_dtypes(
+            [
+                np.rint(stats[_]["min"] * 10.0**k)
+                for _, k in zip(positions, decimals)
+            ],
+            [
+                np.rint(stats[_]["max"] * 10.0**k)
+                for _, k in zip(positions, decimals)
+            ],
+            ranges,
+        )
+
+        rest = []
+        for position, dtype, k in zip(positions, found, decimals):
+            feature_stats = stats[position]
+            if (
+                dtype is None
+                or np.dtype(dtype).itemsize
+                >= np.dtype(feature_stats["dtype"]).itemsize
+            ):
+                rest.append(position)
+                continue
+
+            if feature_stats["nullable"]:
+                dtype = NULLABLE_INTEGERS[dtype]
+            dtypes[position] = FixedPoint(dtype, k)
+
+        return rest
+
+    @staticmethod
+    def _precise_float(stats, dtype):
+        """Find the narrowest float type within tolerance.
+
+        Parameters
+        ----------
+            stats : dict
+                Statistics of float data, see `_empty_stats`.
+            dtype : type
+                The narrowest float type that fits range of data.
+
+        Returns
+        -------
+            dtype : type
+                The narrowest float type that fits range of data and
+                keeps round trip error within tolerance.
+        """
+        for candidate in reversed(FLOATS_RANGES):
+            if np.dtype(candidate).itemsize < np.dtype(dtype).itemsize:
+                continue
+            if (
+                candidate in stats["precise"]
+                or np.dtype(candidate).itemsize
+                >= np.dtype(stats["dtype"]).itemsize
+            ):
+                return candidate
+
+        return stats["dtype"]
+
+    def _stats_to_dtype(self, stats):
+        """Determine optimised type of data from its statistics.
+
+        Parameters
+        ----------
+            stats : dict
+                Statistics of data, see `_empty_stats`.
+
+        Returns
+        -------
+            dtype : type or str
+                Optimised type of data.
+        """
+        return self._stats_to_dtypes([stats])[0]
+
+    def _analyze_series(self, data):
+        """Analyse pandas Series.
+
+        Parameters
+        ----------
+            data : pandas Series
+                An numobservations by numdimensions array of observations.
+        """
+        return self._stats_to_dtype(self._series_stats(data))
+
+    def _analyze_np_array(self, data):
+        """Analyse numpy ndarray.
+
+        Parameters
+        ----------
+            data : narray-like
+                An numobservations by numdimensions array of observations.
+        """
+        return self._stats_to_dtype(self._np_array_stats(data))
+
+    def _data_stats(self, data):
+        """Compute statistics of data needed for type analysis.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                An numobservations by numdimensions array of observations.
+
+        Returns
+        -------
+            stats : dict or list of dict
+                Statistics of data - a single statistics dict for Series
+                and ndarray, list of per column statistics for 2-D
+                ndarray (if `structured` is set) or dict of column
+                name/statistics for DataFrame.
+        """
+        if isinstance(data, pd.Series):
+            return self._series_stats(data)
+        elif isinstance(data, pd.DataFrame):
+            return self._frame_stats(data)
+        elif isinstance(data, np.ndarray):
+            return self._np_array_stats(data)
+        elif sparse.issparse(data) and data.format in SPARSE_FORMATS:
+            return self._sparse_matrix_stats(data)
+        else:
+            raise AttributeError(
+                "Invalid `data` type. It should be instance of pandas "
+                "Series/DataFrame, numpy ndarray or scipy sparse matrix."
+            )
+
+    def _update_data_stats(self, data):
+        """Update statistics accumulated from previous chunks with data.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                An numobservations by numdimensions array of observations.
+        """
+        stats = self._data_stats(data)
+
+        if not hasattr(self, "data_stats_"):
+            self.data_stats_ = stats
+        elif isinstance(data, pd.DataFrame):
+            for column_name, column_stats in stats.items():
+                if column_name in self.data_stats_:
+                    column_stats = self._merge_stats(
+                        self.data_stats_[column_name], column_stats
+                    )
+                self.data_stats_[column_name] = column_stats
+        elif isinstance(stats, list):
+            if len(stats) != len(self.data_stats_):
+                raise AttributeError(
+                    "Invalid `data` shape. Number of features should be "
+                    "{}.".format(len(self.data_stats_))
+                )
+            self.data_stats_ = [
+                self._merge_stats(*_) for _ in zip(self.data_stats_, stats)
+            ]
+        else:
+            self.data_stats_ = self._merge_stats(self.data_stats_, stats)
+
+    def _data_analyze(self, data):
+        """Create map of relation column/type for data.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                An numobservations by numdimensions array of observations.
+        """
+        self._update_data_stats(data)
+
+        if isinstance(data, pd.DataFrame):
+            self.data_types_ = dict(
+                zip(
+                    self.data_stats_.keys(),
+                    self._stats_to_dtypes(list(self.data_stats_.values())),
+                )
+            )
+        elif isinstance(self.data_stats_, list):
+            self.data_types_ = self._stats_to_dtypes(self.data_stats_)
+        else:
+            self.data_types_ = self._stats_to_dtype(self.data_stats_)
+
+        # scipy doesn't support float16 values of sparse matrices
+        if sparse.issparse(data) and self.data_types_ == np.float16:
+            self.data_types_ = np.float32
+
+    def _fill_data_types(self, data):
+        """Fill map of relation column/type for data with mode as dtype.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                An numobservations by numdimensions array of observations.
+        """
+        if isinstance(data, pd.Series):
+            self.data_types_ = self.mode
+        elif isinstance(data, pd.DataFrame):
+            self.data_types_ = dict()
+            for column_name in data.columns:
+                self.data_types_[column_name] = self.mode
+        elif isinstance(data, np.ndarray) or sparse.issparse(data):
+            self.data_types_ = self.mode
+
+    def fit(self, data):
+        """Fit a preprocessor with data.
+
+        Compute optimized types for columns.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame or iterator
+                Input data based on which we compute parameters. Iterator
+                of chunks (e.g. `pd.read_csv(..., chunksize=...)`) is
+                processed chunk by chunk with `partial_fit`.
+
+        Returns
+        -------
+            self : object
+                Returns the instance itself.
+        """
+        self._reset()
+
+        if isinstance(data, Iterator):
+            for chunk in data:
+                self.partial_fit(chunk)
+            return self
+
+        return self.partial_fit(data)
+
+    def partial_fit(self, data):
+        """Online computation of optimised types of data for later
+        optimisation.
+
+        All of data is processed as a single chunk. Statistics of
+        features (min/max values and integrality) are accumulated
+        between calls, so this method can be used when data doesn't fit
+        in memory, e.g. with chunks from `pd.read_csv(..., chunksize=...)`.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                Chunk of input data based on which we compute parameters.
+
+        Returns
+        -------
+            self : object
+                Returns the instance itself.
+        """
+        data = self._load(data)
+        start = time.perf_counter()
+
+        if isinstance(self.mode, (list, tuple, dict)):
+            self._features_analyze(data)
+
+        elif self.mode in ANALYSIS_MODES:
+            self._data_analyze(self._sample(data))
+
+        elif self.mode in NUMERICS:
+            self._fill_data_types(data)
+
+        self.analysis_time_ = (
+            getattr(self, "analysis_time_", 0.0) + time.perf_counter() - start
+        )
+
+        return self
+
+    @staticmethod
+    def _load(data):
+        """Open path to `.npy` file as memory-mapped array.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame or path
+                Input data.
+
+        Returns
+        -------
+            data : narray-like, pandas Series/DataFrame
+                Input data itself or read-only memory-mapped array.
+        """
+        if isinstance(data, (str, os.PathLike)) and os.fspath(data).endswith(
+            ".npy"
+        ):
+            return np.load(data, mmap_mode="r")
+        return data
+
+    def _sample(self, data):
+        """Randomly sample rows of data for analysis.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                An numobservations by numdimensions array of observations.
+
+        Returns
+        -------
+            sample : narray-like, pandas Series/DataFrame
+                Sampled rows of data or data itself if `sample_size` is
+                None or isn't less than number of rows.
+        """
+        if self.sample_size is None:
+            return data
+
+        n_rows = data.shape[0]
+        if isinstance(self.sample_size, float):
+            size = int(np.ceil(self.sample_size * n_rows))
+        else:
+            size = self.sample_size
+        if size >= n_rows:
+            return data
+
+        if not hasattr(self, "random_state_"):
+            self.random_state_ = check_random_state(self.random_state)
+        indexes = np.sort(
+            self.random_state_.choice(n_rows, size, replace=False)
+        )
+
+        if isinstance(data, (pd.Series, pd.DataFrame)):
+            return data.iloc[indexes]
+        if sparse.issparse(data):
+            # rows of coo matrix can't be indexed
+            return data.tocsr()[indexes]
+        return data[indexes]
+
+    def _features_analyze(self, data):
+        """Create map of relation column/type for data with per feature
+        modes.
+
+        Features with the same analysis mode are analysed together by
+        optimiser with this mode, see `mode_optimisers_`.
+
+        Parameters
+        ----------
+            data : pandas DataFrame
+                An numobservations by numdimensions array of observations.
+        """
+        if not isinstance(data, pd.DataFrame):
+            raise AttributeError(
+                "Invalid `data` type. Array or dict of types in `mode` "
+                "requires pandas DataFrame."
+            )
+
+        if isinstance(self.mode, dict):
+            modes = [
+                (column_name, self.mode[column_name])
+                for column_name in data.columns
+                if column_name in self.mode
+            ]
+        else:
+            if len(self.mode) != data.shape[1]:
+                raise AttributeError(
+                    "Length of `mode` - {} doesn't match number of "
+                    "features - {}.".format(len(self.mode), data.shape[1])
+                )
+            modes = list(zip(data.columns, self.mode))
+
+        if not hasattr(self, "data_types_"):
+            self.data_types_ = dict()
+            self.data_stats_ = dict()
+            self.mode_optimisers_ = dict()
+
+        groups = {}
+        for column_name, mode in modes:
+            if mode in ANALYSIS_MODES:
+                groups.setdefault(mode, []).append(column_name)
+
+        for mode, columns in groups.items():
+            if mode not in self.mode_optimisers_:
+                params = self.get_params()
+                # data is already sampled by this optimiser
+                params.update(mode=mode, sample_size=None)
+                self.mode_optimisers_[mode] = type(self)(**params)
+            self.mode_optimisers_[mode].partial_fit(
+                self._sample(data[columns])
+            )
+
+        # types are stored in order of columns of data
+        for column_name, mode in modes:
+            if mode not in ANALYSIS_MODES:
+                self.data_types_[column_name] = mode
+                continue
+            optimiser = self.mode_optimisers_[mode]
+            self.data_types_[column_name] = optimiser.data_types_[column_name]
+            self.data_stats_[column_name] = optimiser.data_stats_[column_name]
+
+    @staticmethod
+    def _dtype_to_spec(dtype):
+        """Convert optimised type to portable specification.
+
+        Parameters
+        ----------
+            dtype : type, str, CategoricalDtype or FixedPoint
+                Optimised type of feature.
+
+        Returns
+        -------
+            spec : str or dict
+                Name of type, dict with keys `categories` and `ordered`
+                for categorical type, dict with keys `fixed_point` and
+                `decimals` for fixed-point type or dict with keys
+                `sparse` and `fill_value` (None for NaN) for sparse type.
+        """
+        if isinstance(dtype, FixedPoint):
+            return {
+                "fixed_point": MemoryOptimiser._dtype_to_spec(dtype.dtype),
+                "decimals": dtype.decimals,
+            }
+
+        dtype = pandas_dtype(dtype)
+        if isinstance(dtype, pd.SparseDtype):
+            fill_value = dtype.fill_value
+            return {
+                "sparse": dtype.subtype.name,
+                "fill_value": None if pd.isnull(fill_value) else fill_value,
+            }
+
+        if isinstance(dtype, CategoricalDtype) and (
+            dtype.categories is not None
+        ):
+            return {
+                "categories": dtype.categories.tolist(),
+                "ordered": bool(dtype.ordered),
+            }
+
+        return dtype.name
+
+    @staticmethod
+    def _spec_to_dtype(spec):
+        """Convert portable specification to optimised type.
+
+        Parameters
+        ----------
+            spec : str or dict
+                Specification of type, see `_dtype_to_spec`.
+
+        Returns
+        -------
+            dtype : type, str, CategoricalDtype or FixedPoint
+                Optimised type of feature.
+        """
+        if isinstance(spec, dict) and "fixed_point" in spec:
+            return FixedPoint(
+                MemoryOptimiser._spec_to_dtype(spec["fixed_point"]),
+                spec["decimals"],
+            )
+
+        if isinstance(spec, dict) and "sparse" in spec:
+            fill_value = spec["fill_value"]
+            return pd.SparseDtype(
+                spec["sparse"], np.nan if fill_value is None else fill_value
+            )
+
+        if isinstance(spec, dict):
+            return CategoricalDtype(spec["categories"], spec["ordered"])
+
+        dtype = pandas_dtype(spec)
+        if isinstance(dtype, np.dtype) and dtype.kind in {"i", "u", "f"}:
+            return dtype.type
+
+        return spec
+
+    def to_schema(self):
+        """Export fitted types as portable schema.
+
+        Schema consists of built-in python types only, so it can be
+        saved e.g. as JSON (if columns names are strings) and loaded
+        later with `from_schema` to apply optimisation to new data
+        without analysis.
+
+        Returns
+        -------
+            schema : dict
+                Dict with key `columns` - column name/type specification
+                for pandas DataFrame, with key `dtypes` - list of per
+                feature type specifications for 2-D ndarray or with key
+                `dtype` - a single type specification otherwise.
+        """
+        if isinstance(self.data_types_, dict):
+            return {
+                "columns": {
+                    column_name: self._dtype_to_spec(dtype)
+                    for column_name, dtype in self.data_types_.items()
+                }
+            }
+
+        if isinstance(self.data_types_, list):
+            return {
+                "dtypes": [self._dtype_to_spec(_) for _ in self.data_types_]
+            }
+
+        return {"dtype": self._dtype_to_spec(self.data_types_)}
+
+    @classmethod
+    def from_schema(cls, schema, **params):
+        """Create fitted optimiser from schema.
+
+        Parameters
+        ----------
+            schema : dict
+                Schema exported with `to_schema`.
+            params : dict
+                Parameters of optimiser, see `MemoryOptimiser`.
+
+        Returns
+        -------
+            optimiser : MemoryOptimiser
+                Optimiser ready to transform data.
+        """
+        optimiser = cls(**params)
+        if "columns" in schema:
+            optimiser.data_types_ = {
+                column_name: cls._spec_to_dtype(spec)
+                for column_name, spec in schema["columns"].items()
+            }
+        elif "dtypes" in schema:
+            optimiser.data_types_ = [
+                cls._spec_to_dtype(_) for _ in schema["dtypes"]
+            ]
+        else:
+            optimiser.data_types_ = cls._spec_to_dtype(schema["dtype"])
+
+        return optimiser
+
+    def get_dtypes(self):
+        """Get fitted types as `dtype` mapping for pandas readers.
+
+        Mapping can be passed as `dtype` to `pd.read_csv` or to `astype`
+        after `pd.read_parquet`, so data is parsed with optimised types
+        from the start. Fixed-point features can't be parsed as scaled
+        integers and are absent in mapping. Sparse features are parsed
+        with their subtype.
+
+        Returns
+        -------
+            dtypes : dict
+                Column name/pandas type.
+        """
+        if not isinstance(self.data_types_, dict):
+            raise AttributeError(
+                "Types mapping is available only for pandas DataFrame."
+            )
+
+        dtypes = {}
+        for column_name, dtype in self.data_types_.items():
+            if isinstance(dtype, FixedPoint):
+                continue
+            dtype = pandas_dtype(dtype)
+            if isinstance(dtype, pd.SparseDtype):
+                dtype = dtype.subtype
+            dtypes[column_name] = dtype
+
+        return dtypes
+
+    def transform(self, data):
+        """Apply preprocessor to data.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame or iterator
+                Input data that will be transformed. Iterator of chunks
+                is transformed lazily chunk by chunk.
+
+        Returns
+        -------
+            data_new : narray-like, shape (n_samples, n_components)
+                Transformed data or generator of transformed chunks.
+
+        Raises
+        ------
+            AttributeError
+                If passed invalid value of `out_of_range`.
+        """
+        if self.out_of_range is not None and (
+            self.out_of_range not in OUT_OF_RANGE
+        ):
+            raise AttributeError(
+                "Passed invalid value of `out_of_range` - `{}`.".format(
+                    self.out_of_range
+                )
+            )
+
+        if isinstance(data, Iterator):
+            return self._transform_chunks(data)
+
+        self._reset_report()
+        return self._transform_chunk(data)
+
+    def _transform_chunks(self, chunks):
+        """Lazily apply preprocessor to chunks of data.
+
+        Parameters
+        ----------
+            chunks : iterator
+                Chunks of input data that will be transformed.
+
+        Yields
+        ------
+            data_new : narray-like, shape (n_samples, n_components)
+                Transformed chunk.
+        """
+        self._reset_report()
+        for chunk in chunks:
+            yield self._transform_chunk(chunk)
+
+    def _reset_report(self):
+        """Reset time and memory report of the last transform."""
+        self.transform_time_ = 0.0
+        if hasattr(self, "memory_report_"):
+            del self.memory_report_
+        if self.trace_memory:
+            self.peak_memory_ = 0
+        elif hasattr(self, "peak_memory_"):
+            del self.peak_memory_
+
+    def _transform_chunk(self, data):
+        """Apply preprocessor to single chunk of data and record its time
+        and memory usage.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                Input data that will be transformed.
+
+        Returns
+        -------
+            data_new : narray-like, shape (n_samples, n_components)
+        """
+        data = self._load(data)
+
+        # measured before transform, as inplace one changes data
+        if self.report:
+            usage = self._memory_usage(data)
+
+        start = time.perf_counter()
+        if self.trace_memory:
+            data_new = self._trace_transform_data(data)
+        else:
+            data_new = self._transform_data(data)
+        self.transform_time_ += time.perf_counter() - start
+
+        if self.report:
+            self._update_report(usage, self._memory_usage(data_new))
+
+        return data_new
+
+    @staticmethod
+    def _memory_usage(data):
+        """Compute per feature types and memory usage of data.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                Input data.
+
+        Returns
+        -------
+            usage : pandas DataFrame
+                Per feature types ('dtype') and memory in bytes, including
+                memory of python objects ('bytes').
+        """
+        if sparse.issparse(data):
+            arrays = (
+                getattr(data, _, None)
+                for _ in ("data", "indices", "indptr", "row", "col")
+            )
+            return pd.DataFrame(
+                {
+                    "dtype": [data.dtype],
+                    "bytes": [sum(_.nbytes for _ in arrays if _ is not None)],
+                }
+            )
+
+        if isinstance(data, pd.Series):
+            data = data.to_frame()
+        elif not isinstance(data, pd.DataFrame):
+            # frame is a view of homogeneous array, no data is copied;
+            # trailing axes of multidimensional array are flattened
+            values = np.asarray(data)
+            if values.dtype.names:
+                fields = [values.dtype[_] for _ in values.dtype.names]
+                return pd.DataFrame(
+                    {
+                        "dtype": fields,
+                        "bytes": [_.itemsize * len(values) for _ in fields],
+                    }
+                )
+            values = values.reshape(
+                values.shape[:1] + (int(np.prod(values.shape[1:])),)
+                if values.ndim
+                else (1, 1)
+            )
+            data = pd.DataFrame(values, copy=False)
+
+        return pd.DataFrame(
+            {
+                "dtype": data.dtypes,
+                "bytes": data.memory_usage(index=False, deep=True),
+            }
+        )
+
+    def _update_report(self, usage, usage_new):
+        """Add memory usage of transformed chunk to memory report.
+
+        Parameters
+        ----------
+            usage : pandas DataFrame
+                Memory usage of chunk before transform.
+            usage_new : pandas DataFrame
+                Memory usage of chunk after transform.
+        """
+        report = pd.DataFrame(
+            {
+                "dtype_before": usage["dtype"],
+                "dtype_after": usage_new["dtype"],
+                "bytes_before": usage["bytes"],
+                "bytes_after": usage_new["bytes"],
+            }
+        )
+
+        if hasattr(self, "memory_report_"):
+            columns = ["bytes_before", "bytes_after"]
+            report[columns] = report[columns].add(
+                self.memory_report_[columns], fill_value=0
+            )
+
+        report["bytes_saved"] = report["bytes_before"] - report["bytes_after"]
+        report.attrs["analysis_time"] = getattr(self, "analysis_time_", 0.0)
+        report.attrs["transform_time"] = self.transform_time_
+
+        self.memory_report_ = report
+
+    def _trace_transform_data(self, data):
+        """Convert single chunk of data and record its peak memory.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                Input data that will be transformed.
+
+        Returns
+        -------
+            data_new : narray-like, shape (n_samples, n_components)
+        """
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        try:
+            return self._transform_data(data)
+        finally:
+            _, memory_peak = tracemalloc.get_traced_memory()
+            if not tracing:
+                tracemalloc.stop()
+            self.peak_memory_ = max(
+                self.peak_memory_, memory_peak - memory_before
+            )
+
+    def _transform_data(self, data):
+        """Convert single chunk of data to optimised types.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                Input data that will be transformed.
+
+        Returns
+        -------
+            data_new : narray-like, shape (n_samples, n_components)
+        """
+        if self.parse_strings:
+            data = self._parse_data(data)
+
+        out_of_range = self.out_of_range
+        if out_of_range is None:
+            # sample may miss extreme values and categories of data
+            out_of_range = "ignore" if self.sample_size is None else "widen"
+
+        data_types = self.data_types_
+        if out_of_range != "ignore":
+            data_types = self._check_data_types(data)
+
+        if isinstance(data_types, list) or isinstance(data, np.memmap):
+            return self._transform_array(data, data_types)
+
+        if self.low_memory:
+            if isinstance(data, pd.DataFrame):
+                return self._transform_columns(data, data_types)
+            return self._astype(data, data_types, self.copy)
+
+        if (
+            isinstance(data, pd.DataFrame)
+            and isinstance(data_types, dict)
+            and n_workers(self.n_jobs, len(data.columns)) > 1
+        ):
+            # input frame is replaced inplace only in `low_memory` mode
+            data_new = data.copy(deep=False)
+            self._astype_columns(
+                data_new,
+                range(len(data.columns)),
+                [
+                    data_types.get(column_name, origin_type)
+                    for column_name, origin_type in data.dtypes.items()
+                ],
+            )
+            return data_new
+
+        if isinstance(data, pd.DataFrame) and isinstance(data_types, dict):
+            data_new = data.astype(
+                {
+                    column_name: dtype
+                    for column_name, dtype in data_types.items()
+                    if column_name in data.columns
+                    and not isinstance(dtype, (FixedPoint, CategoricalDtype))
+                }
+            )
+
+            for position, column_name in enumerate(data.columns):
+                dtype = data_types.get(column_name)
+                if isinstance(dtype, (FixedPoint, CategoricalDtype)):
+                    data_new.isetitem(
+                        position, self._astype(data.iloc[:, position], dtype)
+                    )
+
+            return data_new
+
+        return self._astype(data, data_types, self.copy)
+
+    @staticmethod
+    def _parse_kind(dtype):
+        """Get kind of parser that converts strings to optimised type.
+
+        Parameters
+        ----------
+            dtype : type, str, CategoricalDtype or FixedPoint
+                Optimised type of object feature.
+
+        Returns
+        -------
+            kind : str or None
+                'numeric', 'bool', 'datetime' or None if feature isn't
+                parsed.
+        """
+        if isinstance(dtype, FixedPoint):
+            return "numeric"
+
+        dtype = pandas_dtype(dtype)
+        if dtype.kind in {"i", "u", "f"}:
+            return "numeric"
+        if dtype.kind == "b":
+            return "bool"
+        if dtype.kind == "M":
+            return "datetime"
+        return None
+
+    def _parse_feature(self, data, dtype, name=None):
+        """Parse values of object feature if its optimised type requires.
+
+        Parameters
+        ----------
+            data : pandas Series
+                Values of feature.
+            dtype : type, str, CategoricalDtype or FixedPoint
+                Optimised type of feature.
+            name : str, optional
+                Name of feature used in error message.
+
+        Returns
+        -------
+            data_new : pandas Series or None
+                Parsed values or None if feature isn't parsed.
+
+        Raises
+        ------
+            ValueError
+                If some values can't be parsed.
+        """
+        if not self._is_string_type(data.dtype) or dtype is None:
+            return None
+
+        kind = self._parse_kind(dtype)
+        if kind is None:
+            return None
+
+        data_new = self._parse_strings(data, kind)
+        if data_new.count() != data.count():
+            raise ValueError(
+                "Values of feature `{}` can't be parsed as {}.".format(
+                    name, kind
+                )
+            )
+        return data_new
+
+    def _parse_data(self, data):
+        """Parse object features whose optimised types are numeric,
+        boolean or datetime.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                Input data that will be transformed.
+
+        Returns
+        -------
+            data : narray-like, pandas Series/DataFrame
+                Data with parsed features, a shallow copy of DataFrame
+                if `copy` is set.
+        """
+        if isinstance(data, pd.Series) and not isinstance(
+            self.data_types_, (dict, list)
+        ):
+            data_new = self._parse_feature(data, self.data_types_, data.name)
+            return data if data_new is None else data_new
+
+        if not (
+            isinstance(data, pd.DataFrame)
+            and isinstance(self.data_types_, dict)
+        ):
+            return data
+
+        data_new = data
+        for position, (column_name, origin_type) in enumerate(
+            data.dtypes.items()
+        ):
+            if not self._is_string_type(origin_type):
+                continue
+
+            column = self._parse_feature(
+                data.iloc[:, position],
+                self.data_types_.get(column_name),
+                column_name,
+            )
+            if column is None:
+                continue
+
+            if data_new is data and self.copy:
+                data_new = data.copy(deep=False)
+            data_new.isetitem(position, column)
+
+        return data_new
+
+    def _check_array_shape(self, data):
+        """Check that array has features the optimiser was fitted with.
+
+        Parameters
+        ----------
+            data : narray-like
+                Input data.
+
+        Raises
+        ------
+            AttributeError
+                If data isn't 2-D array with the same number of features.
+        """
+        if (
+            not isinstance(data, np.ndarray)
+            or data.ndim != 2
+            or data.shape[1] != len(self.data_types_)
+        ):
+            raise AttributeError(
+                "Invalid `data` shape. It should be 2-D numpy ndarray with "
+                "{} features.".format(len(self.data_types_))
+            )
+
+    @staticmethod
+    def _array_dtype(data_types):
+        """Get type of transformed numpy ndarray.
+
+        Parameters
+        ----------
+            data_types : type, str, FixedPoint or list
+                Optimised type or per feature optimised types.
+
+        Returns
+        -------
+            dtype : numpy dtype
+                Optimised type or structured type with field `f<i>` per
+                feature.
+        """
+        if not isinstance(data_types, list):
+            return np.dtype(
+                data_types.dtype
+                if isinstance(data_types, FixedPoint)
+                else data_types
+            )
+
+        return np.dtype(
+            [
+                ("f{}".format(i), MemoryOptimiser._array_dtype(dtype))
+                for i, dtype in enumerate(data_types)
+            ]
+        )
+
+    def _transform_array(self, data, data_types):
+        """Apply optimised types to numpy ndarray.
+
+        Array is converted by row chunks, so memory-mapped array is
+        converted out-of-core into new memory-mapped `.npy` file in
+        `memmap_dir`.
+
+        Parameters
+        ----------
+            data : narray-like
+                Input data that will be transformed.
+            data_types : type, str, FixedPoint or list
+                Optimised type or per feature optimised types of 2-D
+                ndarray.
+
+        Returns
+        -------
+            data_new : narray-like
+                Array of optimised type or structured array with field
+                `f<i>` per feature (memory-mapped array opened for
+                reading and writing if data is memory-mapped).
+        """
+        if isinstance(data_types, list):
+            self._check_array_shape(data)
+
+        dtype = self._array_dtype(data_types)
+        shape = data.shape if dtype.names is None else data.shape[:1]
+        if isinstance(data, np.memmap):
+            descriptor, path = tempfile.mkstemp(
+                suffix=".npy", dir=self.memmap_dir
+            )
+            os.close(descriptor)
+            data_new = np.lib.format.open_memmap(
+                path, mode="w+", dtype=dtype, shape=shape
+            )
+        else:
+            data_new = np.empty(shape, dtype=dtype)
+
+        n_columns = int(np.prod(data.shape[1:]))
+        for rows in self._row_chunks(data, n_columns):
+            chunk = data[rows]
+            if dtype.names is None:
+                data_new[rows] = self._astype(chunk, data_types)
+                continue
+
+            for position, feature_type in enumerate(data_types):
+                data_new[dtype.names[position]][rows] = self._astype(
+                    chunk[:, position], feature_type
+                )
+
+        if isinstance(data_new, np.memmap):
+            data_new.flush()
+        return data_new
+
+    def _check_data_types(self, data):
+        """Check that data fits optimised types and widen them if needed.
+
+        Fitted `data_types_` aren't changed, widened types are used only
+        for conversion of data.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                Input data that will be transformed.
+
+        Returns
+        -------
+            data_types : type, list or dict
+                Optimised types of data.
+
+        Raises
+        ------
+            ValueError
+                If data doesn't fit optimised types and `out_of_range`
+                is 'raise'.
+        """
+        if isinstance(self.data_types_, dict):
+            if not isinstance(data, pd.DataFrame):
+                return self.data_types_
+
+            features = [
+                (position, column_name, self.data_types_[column_name])
+                for position, column_name in enumerate(data.columns)
+                if self.data_types_.get(column_name) is not None
+            ]
+            checked = parallel_map(
+                lambda item: self._check_data_type(
+                    data.iloc[:, item[0]], item[2], item[1]
+                ),
+                features,
+                self.n_jobs,
+            )
+            data_types = dict(self.data_types_)
+            for (_, column_name, _), dtype in zip(features, checked):
+                data_types[column_name] = dtype
+            return data_types
+
+        if isinstance(self.data_types_, list):
+            self._check_array_shape(data)
+            if self._numeric_kind(data.dtype) is None or not len(data):
+                return self.data_types_
+
+            fixed = [
+                position
+                for position, dtype in enumerate(self.data_types_)
+                if isinstance(dtype, FixedPoint)
+            ]
+            exact = dict.fromkeys(fixed, True)
+            mins = maxs = None
+            for rows in self._row_chunks(data, data.shape[1]):
+                chunk_min = np.fmin.reduce(data[rows], axis=0)
+                chunk_max = np.fmax.reduce(data[rows], axis=0)
+                if data.dtype.kind == "f":
+                    for position in fixed:
+                        exact[position] = exact[position] and (
+                            self._has_decimals(
+                                data[rows, position],
+                                self.data_types_[position].decimals,
+                            )
+                        )
+                if mins is None:
+                    mins, maxs = chunk_min, chunk_max
+                else:
+                    np.fmin(mins, chunk_min, out=mins)
+                    np.fmax(maxs, chunk_max, out=maxs)
+
+            # range of feature is checked as array of its bounds
+            return [
+                self._check_data_type(
+                    np.array([mins[position], maxs[position]]),
+                    dtype,
+                    position,
+                    exact.get(position),
+                )
+                for position, dtype in enumerate(self.data_types_)
+            ]
+
+        if isinstance(data, (pd.Series, np.ndarray)):
+            return self._check_data_type(
+                data, self.data_types_, getattr(data, "name", None)
+            )
+
+        if sparse.issparse(data):
+            # implicit zeros fit any type
+            return self._check_data_type(data.data, self.data_types_)
+
+        return self.data_types_
+
+    def _check_data_type(self, data, dtype, name=None, exact=None):
+        """Check that single feature fits its optimised type.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series
+                Values of feature.
+            dtype : type, str, CategoricalDtype or FixedPoint
+                Optimised type of feature.
+            name : str, optional
+                Name of feature used in error message.
+            exact : boolean or None, optional
+                Whether float values of fixed-point feature have at
+                most its number of decimal places. Checked on `data`
+                if None.
+
+        Returns
+        -------
+            dtype : type, str, CategoricalDtype or FixedPoint
+                Optimised type itself or widened type.
+        """
+        if isinstance(dtype, CategoricalDtype):
+            return self._check_categories(data, dtype, name)
+
+        target, scale = dtype, 1
+        if isinstance(dtype, FixedPoint):
+            target, scale = dtype.dtype, 10.0**dtype.decimals
+
+        target = pandas_dtype(target)
+        if isinstance(target, pd.SparseDtype):
+            numpy_type = target.subtype
+        else:
+            numpy_type = getattr(target, "numpy_dtype", target)
+        origin_type = data.dtype
+        if isinstance(origin_type, pd.SparseDtype):
+            # fill value is either missing or zero that fits any type
+            origin_type = origin_type.subtype
+            data = data.array.sp_values
+        if (
+            not isinstance(numpy_type, np.dtype)
+            or numpy_type.kind not in {"i", "u", "f"}
+            or not (
+                self._numeric_kind(origin_type)
+                or self._is_nullable_integer(origin_type)
+            )
+        ):
+            return dtype
+
+        if self._is_nullable_integer(origin_type):
+            data_min, data_max = data.min(), data.max()
+        else:
+            values = np.asarray(data).reshape(-1)
+            if not len(values):
+                return dtype
+            data_min, data_max = np.fmin.reduce(values), np.fmax.reduce(values)
+        if pd.isnull(data_min):
+            return dtype
+
+        if isinstance(dtype, FixedPoint) and origin_type.kind == "f":
+            if exact is None:
+                exact = self._has_decimals(values, dtype.decimals)
+            if not exact:
+                if self.out_of_range == "raise":
+                    raise ValueError(
+                        "Values of feature `{}` have more than {} decimal "
+                        "places.".format(name, dtype.decimals)
+                    )
+                # fixed-point type can't represent values exactly
+                return origin_type
+
+        data_min, data_max = data_min * scale, data_max * scale
+        if numpy_type.kind == "f":
+            info, ranges = np.finfo(numpy_type), FLOATS_RANGES
+        else:
+            info = np.iinfo(numpy_type)
+            ranges = ALL_INTEGERS_RANGES if self.unsigned else INTEGERS_RANGES
+        if info.min <= data_min and data_max <= info.max:
+            return dtype
+
+        if self.out_of_range == "raise":
+            raise ValueError(
+                "Values of feature `{}` are out of range of type `{}`.".format(
+                    name, target
+                )
+            )
+
+        # fitted values can be anywhere in range of optimised type
+        widened = lookup_dtypes(
+            [min(data_min, info.min)], [max(data_max, info.max)], ranges
+        )[0]
+        if isinstance(target, pd.SparseDtype):
+            return pd.SparseDtype(widened or origin_type, target.fill_value)
+        if widened is None:
+            return origin_type
+        if isinstance(target, ExtensionDtype):
+            widened = NULLABLE_INTEGERS[widened]
+        if isinstance(dtype, FixedPoint):
+            return FixedPoint(widened, dtype.decimals)
+        return widened
+
+    @staticmethod
+    def _has_decimals(values, decimals):
+        """Check that float values have at most given decimal places.
+
+        Parameters
+        ----------
+            values : ndarray
+                Float values, missing values are ignored.
+            decimals : int
+                Number of decimal places.
+
+        Returns
+        -------
+            result : boolean
+        """
+        scale = 10.0**decimals
+        rounded = np.rint(values * scale) / scale
+        return bool(np.all((rounded == values) | np.isnan(values)))
+
+    def _check_categories(self, data, dtype, name=None):
+        """Check that categorical feature has only categories seen in fit.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series
+                Values of feature.
+            dtype : CategoricalDtype
+                Optimised type of feature.
+            name : str, optional
+                Name of feature used in error message.
+
+        Returns
+        -------
+            dtype : CategoricalDtype
+                Optimised type itself or type with new categories.
+        """
+        if dtype.categories is None:
+            return dtype
+
+        values = pd.Series(data) if isinstance(data, np.ndarray) else data
+        unseen = values[~values.isin(dtype.categories) & values.notnull()]
+        if not len(unseen):
+            return dtype
+
+        if self.out_of_range == "raise":
+            raise ValueError(
+                "Feature `{}` has categories unseen during fit.".format(name)
+            )
+
+        return CategoricalDtype(
+            dtype.categories.append(pd.Index(pd.unique(unseen.to_numpy()))),
+            dtype.ordered,
+        )
+
+    @staticmethod
+    def _astype(data, dtype, copy=True):
+        """Convert data to optimised type.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                Input data that will be converted.
+            dtype : type, str or FixedPoint
+                Optimised type of data.
+            copy : boolean, optional
+                Whether to copy numpy ndarray if type isn't changed.
+                pandas data is copied lazily under Copy-on-Write.
+
+        Returns
+        -------
+            data_new : narray-like, pandas Series/DataFrame
+        """
+        if sparse.issparse(data):
+            return MemoryOptimiser._astype_sparse(data, dtype, copy)
+
+        if isinstance(dtype, FixedPoint):
+            return np.rint(data * 10.0**dtype.decimals).astype(dtype.dtype)
+
+        if isinstance(dtype, CategoricalDtype) and isinstance(data, pd.Series):
+            # values unseen during fit are set to missing values explicitly
+            return pd.Series(
+                pd.Categorical(
+                    data.where(data.isin(dtype.categories)), dtype=dtype
+                ),
+                index=data.index,
+                name=data.name,
+            )
+
+        if isinstance(data, (pd.Series, pd.DataFrame)):
+            return data.astype(dtype)
+
+        return data.astype(dtype, copy=copy)
+
+    @staticmethod
+    def _astype_sparse(data, dtype, copy=True):
+        """Convert scipy sparse matrix to optimised type.
+
+        Parameters
+        ----------
+            data : scipy sparse matrix
+                Input data that will be converted.
+            dtype : type or FixedPoint
+                Optimised type of stored values.
+            copy : boolean, optional
+                Whether to copy matrix or to replace its arrays inplace.
+
+        Returns
+        -------
+            data_new : scipy sparse matrix
+                Matrix of the same format with stored values converted
+                to optimised type and index arrays converted to int32 if
+                they fit it (scipy doesn't support narrower indices).
+        """
+        data_new = data.copy() if copy else data
+        data_new.data = MemoryOptimiser._astype(data_new.data, dtype, False)
+
+        if max(data.shape + (data.nnz,)) > np.iinfo(np.int32).max:
+            return data_new
+
+        for name in ("indices", "indptr", "row", "col"):
+            index = getattr(data_new, name, None)
+            if index is not None and index.dtype != np.int32:
+                setattr(data_new, name, index.astype(np.int32))
+
+        return data_new
+
+    def _transform_columns(self, data, data_types):
+        """Apply preprocessor to pandas DataFrame column by column.
+
+        Columns are converted grouped by their original type, so every
+        block of frame is converted completely before the next one and
+        its buffer can be released (if `copy` is False). Buffer of a
+        block is shared by all its columns, so it's released only when
+        all of them are replaced, not column by column.
+
+        Parameters
+        ----------
+            data : pandas DataFrame
+                Input data that will be transformed.
+            data_types : type, str or dict
+                Optimised types of data.
+
+        Returns
+        -------
+            data_new : pandas DataFrame
+        """
+        data_new = data.copy(deep=False) if self.copy else data
+
+        if isinstance(data_types, dict):
+            data_types = [data_types.get(_) for _ in data_new.columns]
+        else:
+            data_types = [data_types] * len(data_new.columns)
+
+        blocks = {}
+        for position, origin_type in enumerate(data_new.dtypes):
+            blocks.setdefault(origin_type, []).append(position)
+
+        for origin_type, positions in blocks.items():
+            positions = [
+                position
+                for position in positions
+                if data_types[position] is not None
+                and (
+                    isinstance(data_types[position], FixedPoint)
+                    or origin_type != pandas_dtype(data_types[position])
+                )
+            ]
+            self._astype_columns(data_new, positions, data_types)
+
+        return data_new
+
+    def _astype_columns(self, data, positions, data_types):
+        """Convert columns of pandas DataFrame inplace, in parallel if
+        `n_jobs` is set.
+
+        Parameters
+        ----------
+            data : pandas DataFrame
+                Data whose columns are replaced by converted ones.
+            positions : iterable of int
+                Positions of columns to convert.
+            data_types : list
+                Per column optimised types.
+        """
+        positions = list(positions)
+        columns = parallel_map(
+            lambda position: self._astype(
+                data.iloc[:, position], data_types[position], self.copy
+            ),
+            positions,
+            self.n_jobs,
+        )
+        for position, column in zip(positions, columns):
+            data.isetitem(position, column)
+
+    def inverse_transform(self, data):
+        """Transform fixed-point features back to float.
+
+        Features optimised to `FixedPoint` types in 'decimal' mode are
+        scaled back to float64 values, other features are returned as
+        is.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame or iterator
+                Transformed data. Iterator of chunks is transformed
+                lazily chunk by chunk.
+
+        Returns
+        -------
+            data_new : narray-like, shape (n_samples, n_components)
+                Restored data or generator of restored chunks.
+        """
+        if isinstance(data, Iterator):
+            return (self._inverse_transform_chunk(chunk) for chunk in data)
+
+        return self._inverse_transform_chunk(data)
+
+    def _inverse_transform_chunk(self, data):
+        """Transform fixed-point features of single chunk back to float.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series/DataFrame
+                Transformed data.
+
+        Returns
+        -------
+            data_new : narray-like, shape (n_samples, n_components)
+        """
+        if isinstance(data, pd.DataFrame) and isinstance(
+            self.data_types_, dict
+        ):
+            data_new = data.copy(deep=False) if self.copy else data
+            for position, column_name in enumerate(data_new.columns):
+                dtype = self.data_types_.get(column_name)
+                if isinstance(dtype, FixedPoint):
+                    data_new.isetitem(
+                        position,
+                        self._from_fixed_point(
+                            data_new.iloc[:, position], dtype
+                        ),
+                    )
+            return data_new
+
+        if isinstance(self.data_types_, list):
+            return self._inverse_transform_array(data)
+
+        if isinstance(self.data_types_, FixedPoint):
+            return self._from_fixed_point(data, self.data_types_)
+
+        return data
+
+    def _inverse_transform_array(self, data):
+        """Transform fixed-point features of 2-D ndarray back to float.
+
+        Parameters
+        ----------
+            data : narray-like
+                Transformed structured array.
+
+        Returns
+        -------
+            data_new : narray-like
+                Structured array with float64 fixed-point fields.
+        """
+        fixed = {
+            position: dtype
+            for position, dtype in enumerate(self.data_types_)
+            if isinstance(dtype, FixedPoint)
+        }
+        if not fixed:
+            return data
+
+        names = data.dtype.names
+        data_new = np.empty(
+            data.shape,
+            dtype=[
+                (name, np.float64 if position in fixed else data.dtype[name])
+                for position, name in enumerate(names)
+            ],
+        )
+        for position, name in enumerate(names):
+            if position in fixed:
+                data_new[name] = self._from_fixed_point(
+                    data[name], fixed[position]
+                )
+            else:
+                data_new[name] = data[name]
+        return data_new
+
+    @staticmethod
+    def _from_fixed_point(data, dtype):
+        """Scale fixed-point data back to float.
+
+        Parameters
+        ----------
+            data : narray-like, pandas Series
+                Fixed-point data.
+            dtype : FixedPoint
+                Fixed-point type of data.
+
+        Returns
+        -------
+            data_new : narray-like, pandas Series
         """
-        return data.astype(self.data_types_, copy=self.copy)
+        return data.astype(np.float64) / 10.0**dtype.decimals
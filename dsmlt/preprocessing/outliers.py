@@ -31,7 +31,7 @@ def outlier_data_sanitize(points):
     """
     if isinstance(points, pd.Series):
         points = points.convert_objects(convert_numeric=True)
-    if not (points.dtype.type == np.float_ or points.dtype.type == np.int_):
+    if not (points.dtype.type == np.float64 or points.dtype.type == np.int_):
         return np.full(len(points), False, dtype=bool)
 
     return points
@@ -60,7 +60,7 @@ def mad_outlier(points, thresh=3.5):
         Statistical Techniques, Edward F. Mykytka, Ph.D., Editor.
     """
     points = outlier_data_sanitize(points)
-    if np.issubsctype(points, bool):
+    if np.issubdtype(np.asarray(points).dtype, np.bool_):
         return points
 
     if len(points.shape) == 1:
@@ -90,7 +90,7 @@ def percentile_outlier(points, threshold=95):
         mask : A numobservations-length boolean array.
     """
     points = outlier_data_sanitize(points)
-    if np.issubsctype(points, bool):
+    if np.issubdtype(np.asarray(points).dtype, np.bool_):
         return points
 
     diff = (100 - threshold) / 2.0
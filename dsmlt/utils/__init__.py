@@ -6,6 +6,7 @@ from .buildin import (
 )
 from .missing import missing, missing_count, single_missing
 from .pandas import join_indices, join_indices_dataframe
+from .parallel import SharedArray, n_workers, parallel_map, process_map
 from .random_data import (
     random_narray,
     random_size,
@@ -25,6 +26,10 @@ __all__ = (
     "single_missing",
     "join_indices",
     "join_indices_dataframe",
+    "SharedArray",
+    "n_workers",
+    "parallel_map",
+    "process_map",
     "random_narray",
     "random_size",
     "columns_names_generator",
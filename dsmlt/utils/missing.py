@@ -36,7 +36,7 @@ def single_missing(
             If passed invalid type of `missing_value` value.
     """
     if isinstance(points, (pd.DataFrame, pd.Series, np.ndarray)):
-        if single_missing_value is np.NAN or single_missing_value is None:
+        if single_missing_value is np.nan or single_missing_value is None:
             return pd.isnull(points)
 
         else:
@@ -50,7 +50,7 @@ def single_missing(
         )
 
 
-def missing(points, missing_value: (int, float, str, list, tuple) = np.NAN):
+def missing(points, missing_value: (int, float, str, list, tuple) = np.nan):
     """
     Returns a boolean array with True if points have missing and False
     otherwise.
@@ -83,7 +83,7 @@ def missing(points, missing_value: (int, float, str, list, tuple) = np.NAN):
 
     elif (
         isinstance(missing_value, (int, float, str))
-        or missing_value is np.NAN
+        or missing_value is np.nan
         or missing_value is None
     ):
         result = single_missing(points, missing_value)
@@ -98,7 +98,7 @@ def missing(points, missing_value: (int, float, str, list, tuple) = np.NAN):
 
 
 def missing_count(
-    points, missing_value: (int, float, str, list, tuple) = np.NAN
+    points, missing_value: (int, float, str, list, tuple) = np.nan
 ):
     """
     Returns a count of missing values.
@@ -29,9 +29,9 @@ def join_indices(index1, index2, operation: str):
     -------
         mask : A numobservations-length boolean array.
     """
-    if not np.issubsctype(index1, bool):
+    if not np.issubdtype(np.asarray(index1).dtype, np.bool_):
         raise AttributeError("Invalid type of index1.")
-    if not np.issubsctype(index2, bool):
+    if not np.issubdtype(np.asarray(index2).dtype, np.bool_):
         raise AttributeError("Invalid type of index2.")
     if operation not in ("and", "or"):
         raise AttributeError(
@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+__all__ = (
+    "SharedArray",
+    "n_workers",
+    "parallel_map",
+    "process_map",
+)
+
+
+def n_workers(n_jobs, n_tasks):
+    """Get number of workers used to process tasks.
+
+    Parameters
+    ----------
+        n_jobs : int or None
+            Number of jobs. None means 1, -1 means all processors, -2 all
+            but one and so on.
+        n_tasks : int
+            Number of independent tasks.
+
+    Returns
+    -------
+        n_workers : int
+            Number of workers from `n_jobs`, but not more than number of
+            tasks.
+    """
+    n_jobs = n_jobs or 1
+    if n_jobs < 0:
+        n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+
+    return max(1, min(n_jobs, n_tasks))
+
+
+def parallel_map(function, items, n_jobs=None):
+    """Apply function to every item, in thread pool if `n_jobs` is set.
+
+    Parameters
+    ----------
+        function : callable
+            Function of single item.
+        items : iterable
+            Items to process.
+        n_jobs : int or None
+            Number of threads, see `n_workers`.
+
+    Returns
+    -------
+        results : list
+            Results in order of items. The first exception in order of
+            items is raised, as in serial processing.
+    """
+    items = list(items)
+    n_threads = n_workers(n_jobs, len(items))
+    if n_threads == 1:
+        return [function(_) for _ in items]
+
+    with ThreadPoolExecutor(n_threads) as executor:
+        return list(executor.map(function, items))
+
+
+def process_map(function, items, n_jobs=None):
+    """Apply function to every item, in process pool if `n_jobs` is set.
+
+    Function and items are pickled to worker processes, so function
+    should be defined at module level. Large results should be written
+    into `SharedArray` instead of being pickled back.
+
+    Parameters
+    ----------
+        function : callable
+            Function of single item.
+        items : iterable
+            Items to process.
+        n_jobs : int or None
+            Number of processes, see `n_workers`.
+
+    Returns
+    -------
+        results : list
+            Results in order of items. The first exception in order of
+            items is raised, as in serial processing.
+    """
+    items = list(items)
+    n_processes = n_workers(n_jobs, len(items))
+    if n_processes == 1:
+        return [function(_) for _ in items]
+
+    with ProcessPoolExecutor(n_processes) as executor:
+        return list(executor.map(function, items))
+
+
+class SharedArray:
+    """Numpy array in shared memory of processes.
+
+    Array is pickled as name of its memory block, so worker processes
+    attach to the same memory and write their results into it without
+    copy. Memory is released by process that created array on `close`
+    (or on exit of `with` block), values that are used after it should
+    be copied.
+
+    Parameters
+    ----------
+        shape : int or tuple of int
+            Shape of array.
+        dtype : numpy dtype
+            Type of values of array.
+        name : str, optional
+            Name of memory block to attach to, new block is created if
+            None.
+
+    Attributes
+    ----------
+        array : numpy array
+            Array backed by shared memory.
+    """
+
+    def __init__(self, shape, dtype, name=None):
+        self.shape = tuple(np.atleast_1d(shape).tolist())
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+        size = int(np.prod(self.shape)) * self.dtype.itemsize
+        # memory block can't be empty
+        self._memory = SharedMemory(name, create=self.owner, size=max(size, 1))
+        self.array = np.ndarray(self.shape, self.dtype, self._memory.buf)
+
+    def __reduce__(self):
+        return type(self), (self.shape, self.dtype, self._memory.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Detach from shared memory and release it in owner process."""
+        if getattr(self, "array", None) is None:
+            return
+        self.array = None
+        self._memory.close()
+        if self.owner:
+            self._memory.unlink()
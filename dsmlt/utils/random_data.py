@@ -83,7 +83,7 @@ def random_narray(
         mask = np.random.binomial(1, p_missing, size=out.shape) == 1
         if out.dtype.type in INTEGERS:
             out = out.astype(float)
-        out[mask] = np.NAN
+        out[mask] = np.nan
 
     return out
 
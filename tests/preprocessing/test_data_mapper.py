@@ -0,0 +1,723 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+from dsmlt.preprocessing import data as data_module
+from dsmlt.preprocessing import (
+    DataMapper,
+    UNKNOWN_CODE,
+    codes_dtype,
+    explanatory_categories,
+    from_explanatory_to_integers,
+    is_explanatory_type,
+)
+
+
+class TestDataMapper:
+    def test_default_string_dtypes(self):
+        # strings are `str` columns in pandas 3 and `object` ones before
+        data = pd.DataFrame(
+            {"A": ["x", "y", None, "x"], "B": [1, 2, 3, 4], "C": ["u"] * 4}
+        )
+        assert is_explanatory_type(data["A"].dtype)
+        assert not is_explanatory_type(data["B"].dtype)
+
+        mapper = DataMapper().fit(data)
+        assert list(mapper.mappers_) == ["A", "C"]
+        assert mapper.categories_["A"][:2].tolist() == ["x", "y"]
+        data_new = mapper.transform(data)
+        assert data_new["A"].tolist() == [0, 1, 2, 0]
+        assert data_new["C"].tolist() == [0] * 4
+        assert data_new["B"].tolist() == [1, 2, 3, 4]
+        assert mapper.transform_record({"A": "y"}) == {"A": 1}
+
+        restored = mapper.inverse_transform(data_new)
+        pd.testing.assert_frame_equal(restored, data)
+
+        # series can't be converted inplace to codes
+        mapper = DataMapper(inplace=True).fit(data)
+        series = mapper.column_transform(data["A"], "A")
+        assert series.tolist() == [0, 1, 2, 0]
+        assert data["A"].tolist()[:2] == ["x", "y"]
+
+    def test_explanatory_categories(self):
+        series = pd.Series(["b", "a", None, "b", "c"], dtype=object)
+        categories = explanatory_categories(series)
+        assert categories.tolist() == ["b", "a", None, "c"]
+        assert from_explanatory_to_integers(series) == {
+            "b": 0,
+            "a": 1,
+            None: 2,
+            "c": 3,
+        }
+
+    def test_codes_dtype(self):
+        assert codes_dtype(0) == np.int8
+        assert codes_dtype(128) == np.int8
+        assert codes_dtype(129) == np.int16
+        assert codes_dtype(2**15 + 1) == np.int32
+
+    def test_fit_transform(self):
+        data = pd.DataFrame(
+            {
+                "A": ["x", "y", "x", "z"],
+                "B": [1.5, 2.5, 3.5, 4.5],
+                "C": ["c%d" % _ for _ in range(4)],
+            }
+        )
+        mapper = DataMapper()
+        data_new = mapper.fit_transform(data)
+        assert mapper.mappers_["A"] == {"x": 0, "y": 1, "z": 2}
+        assert data_new["A"].tolist() == [0, 1, 0, 2]
+        assert data_new["A"].dtype == np.int8
+        assert data_new["B"].tolist() == data["B"].tolist()
+        assert data_new["C"].tolist() == [0, 1, 2, 3]
+
+        # unseen values are encoded as -1
+        data_new = mapper.transform(data.assign(A=["x", "w", None, "z"]))
+        assert data_new["A"].tolist() == [0, -1, -1, 2]
+
+        data_new = mapper.transform(data)
+        pd.testing.assert_frame_equal(mapper.inverse_transform(data_new), data)
+
+    def test_deterministic_codes(self):
+        values = np.array(["v%d" % _ for _ in range(1000)], dtype=object)
+        data = pd.DataFrame({"A": values[::-1]})
+        first = DataMapper().fit_transform(data)
+        second = DataMapper().fit_transform(data.copy())
+        pd.testing.assert_frame_equal(first, second)
+        assert first["A"].dtype == np.int16
+        assert first["A"].tolist() == list(range(1000))
+
+    def test_column_transform(self):
+        data = pd.DataFrame({"A": ["x", "y", "x"], "B": ["u", "v", "u"]})
+        mapper = DataMapper().fit(data)
+        data_new = mapper.column_transform(data, "A")
+        assert data_new["A"].tolist() == [0, 1, 0]
+        assert data_new["B"].tolist() == ["u", "v", "u"]
+
+        with pytest.raises(AttributeError) as exc:
+            mapper.column_transform(data, "C")
+        assert (
+            str(exc.value)
+            == "Invalid name of column. Column not exists in mappers."
+        )
+
+    def test_inverse_transform(self):
+        data = pd.DataFrame({"A": ["x", "y", None, "z"], "B": [1, 2, 3, 4]})
+        mapper = DataMapper().fit(data)
+        codes = pd.DataFrame({"A": [2, -1, 0, 7], "B": [1, 2, 3, 4]})
+        data_new = mapper.inverse_transform(codes)
+        assert data_new["A"].tolist()[2] == "x"
+        assert data_new["A"].isnull().tolist() == [True, True, False, True]
+        assert data_new["B"].tolist() == [1, 2, 3, 4]
+
+        # missing codes are decoded as missing values
+        codes = pd.DataFrame({"A": [1.0, np.nan, 3.0], "B": [1, 2, 3]})
+        data_new = mapper.column_inverse_transform(codes, "A")
+        assert data_new["A"].tolist()[::2] == ["y", "z"]
+        assert pd.isnull(data_new["A"].iloc[1])
+
+    def test_transform_shares_untouched_columns(self):
+        size = 2 * 10**6
+        data = pd.DataFrame(
+            {
+                "A": np.arange(size, dtype=np.float64),
+                "B": np.array(["x", "y"], dtype=object)[np.arange(size) % 2],
+                "C": np.arange(size, dtype=np.int64),
+            }
+        )
+        mapper = DataMapper().fit(data)
+        dtype = data["B"].dtype
+
+        tracemalloc.start()
+        try:
+            data_new = mapper.transform(data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # only codes of encoded column are allocated
+        assert peak < data["A"].nbytes / 2
+        assert np.shares_memory(data_new["A"].to_numpy(), data["A"].to_numpy())
+        assert data_new["B"].dtype == np.int8
+        assert data["B"].dtype == dtype
+
+        data_new = mapper.column_transform(data, "B")
+        assert np.shares_memory(data_new["C"].to_numpy(), data["C"].to_numpy())
+        assert data_new["B"].tolist()[:2] == [0, 1]
+        assert data["B"].tolist()[:2] == ["x", "y"]
+
+        data_new = mapper.column_inverse_transform(data_new, "B")
+        pd.testing.assert_frame_equal(data_new, data)
+
+        series = mapper.column_transform(data["B"], "B")
+        assert series.dtype == np.int8
+        assert data["B"].dtype == dtype
+
+        mapper = DataMapper(inplace=True).fit(data)
+        series = mapper.column_transform(data["B"], "B")
+        assert series.dtype == np.int8
+        assert series.tolist()[:2] == [0, 1]
+        assert data["B"].dtype == dtype
+        series = mapper.column_inverse_transform(series, "B")
+        pd.testing.assert_series_equal(series, data["B"])
+
+        assert mapper.transform(data) is data
+        assert data["B"].dtype == np.int8
+
+    def test_partial_fit(self, tmp_path):
+        data = pd.DataFrame(
+            {
+                "A": ["x", "y", "x", "z", "w", "y"],
+                "B": np.arange(6, dtype=np.float64),
+            }
+        )
+        mapper = DataMapper().fit(data.iloc[:3])
+        assert mapper.mappers_["A"] == {"x": 0, "y": 1}
+
+        # codes of known categories are stable
+        mapper.partial_fit(data.iloc[3:])
+        assert mapper.mappers_["A"] == {"x": 0, "y": 1, "z": 2, "w": 3}
+        assert mapper.categories_["A"].tolist() == ["x", "y", "z", "w"]
+        assert mapper.transform(data)["A"].tolist() == [0, 1, 0, 2, 3, 1]
+
+        # fit with iterator of chunks is the same as partial fits
+        path = tmp_path / "data.csv"
+        data.to_csv(path, index=False)
+        chunked = DataMapper().fit(pd.read_csv(path, chunksize=2))
+        assert chunked.mappers_ == mapper.mappers_
+
+        # fit resets vocabularies
+        mapper.fit(data.iloc[3:])
+        assert mapper.mappers_["A"] == {"z": 0, "w": 1, "y": 2}
+
+    def test_transform_chunks(self, tmp_path):
+        data = pd.DataFrame(
+            {"A": ["x", "y", "x", "z", None], "B": [1, 2, 3, 4, 5]}
+        )
+        path = tmp_path / "data.csv"
+        data.to_csv(path, index=False)
+        mapper = DataMapper().fit(pd.read_csv(path, chunksize=2))
+
+        chunks = mapper.transform(pd.read_csv(path, chunksize=2))
+        assert not isinstance(chunks, pd.DataFrame)
+        chunks = list(chunks)
+        assert [len(_) for _ in chunks] == [2, 2, 1]
+        data_new = pd.concat(chunks)
+        assert data_new["A"].tolist() == [0, 1, 0, 2, 3]
+
+        restored = pd.concat(mapper.inverse_transform(iter(chunks)))
+        assert restored["A"].tolist()[:4] == ["x", "y", "x", "z"]
+        assert pd.isna(restored["A"].iloc[4])
+        assert restored["B"].tolist() == data["B"].tolist()
+
+    def test_transform_record(self):
+        data = pd.DataFrame(
+            {
+                "A": ["x", "y", None, "z"],
+                "B": [1.5, 2.5, 3.5, 4.5],
+                "C": ["u", "v", "u", "v"],
+            }
+        )
+        mapper = DataMapper().fit(data)
+        record = {"A": "y", "B": 0.5, "C": "v"}
+        assert mapper.transform_record(record) == {"A": 1, "B": 0.5, "C": 1}
+        # input record isn't modified
+        assert record == {"A": "y", "B": 0.5, "C": "v"}
+
+        # missing values of any kind, unseen values and absent columns
+        assert mapper.transform_record({"A": np.nan, "C": "w"}) == {
+            "A": 2,
+            "C": -1,
+        }
+        assert mapper.transform_record({"A": None, "D": "x"}) == {
+            "A": 2,
+            "D": "x",
+        }
+        assert mapper.transform_record({"C": None}) == {"C": -1}
+
+        # the same codes as transform of data frame
+        records = data.to_dict("records")
+        expected = mapper.transform(data).to_dict("records")
+        assert mapper.transform_record(records) == expected
+        assert mapper.transform_record(records[:1] + [{"C": "u"}]) == [
+            expected[0],
+            {"C": 0},
+        ]
+        assert mapper.transform_record([]) == []
+        assert mapper.transform_record([{}]) == [{}]
+
+        with pytest.raises(AttributeError):
+            mapper.transform_record(data)
+
+    def test_hashing(self):
+        data = pd.DataFrame(
+            {
+                "A": ["u%d" % _ for _ in range(1000)] + [None, np.nan],
+                "B": ["x", "y"] * 501,
+            }
+        )
+        mapper = DataMapper(hashing={"A": 16}).fit(data)
+        assert mapper.buckets_ == {"A": 16}
+        assert "A" not in mapper.mappers_
+        assert mapper.mappers_["B"] == {"x": 0, "y": 1}
+
+        data_new = mapper.transform(data)
+        assert data_new["A"].dtype == np.int8
+        assert data_new["A"].between(0, 15).all()
+        assert data_new["A"].nunique() == 16
+        # hashes don't depend on other values
+        assert (
+            mapper.transform(data.iloc[::-1])["A"].tolist()
+            == data_new["A"].tolist()[::-1]
+        )
+        assert data_new["A"].iloc[-1] == data_new["A"].iloc[-2]
+
+        # records are hashed to the same buckets
+        records = mapper.transform_record(data.to_dict("records"))
+        assert [_["A"] for _ in records] == data_new["A"].tolist()
+
+        # hashed columns are left encoded
+        restored = mapper.inverse_transform(data_new)
+        assert restored["A"].tolist() == data_new["A"].tolist()
+        assert restored["B"].tolist() == data["B"].tolist()
+        with pytest.raises(AttributeError):
+            mapper.column_inverse_transform(data_new, "A")
+
+        mapper = DataMapper(hashing=300).fit(data)
+        assert mapper.buckets_ == {"A": 300, "B": 300}
+        assert mapper.column_transform(data, "B")["B"].dtype == np.int16
+
+        with pytest.raises(AttributeError):
+            DataMapper(hashing=0).fit(data)
+
+    def test_min_frequency(self):
+        data = pd.DataFrame({"A": ["x", "y", "x", "z", "y", "x", "w", None]})
+        mapper = DataMapper(min_frequency=2).fit(data)
+        assert mapper.mappers_["A"] == {"x": 0, "y": 1}
+        # only rare categories are counted
+        counts = mapper.counts_["A"]
+        assert counts.tolist() == [1, 1, 1]
+        assert counts.index[:2].tolist() == ["z", "w"]
+        assert pd.isna(counts.index[2])
+        data_new = mapper.transform(data)
+        assert data_new["A"].tolist() == [0, 1, 0, -1, 1, 0, -1, -1]
+        assert data_new["A"].dtype == np.int8
+        assert mapper.transform_record({"A": "z"}) == {"A": UNKNOWN_CODE}
+
+        # counts are accumulated between chunks and codes are stable
+        mapper = DataMapper(min_frequency={"A": 2})
+        mapper.partial_fit(data.iloc[:4])
+        assert mapper.mappers_["A"] == {"x": 0}
+        mapper.partial_fit(data.iloc[4:])
+        assert mapper.mappers_["A"] == {"x": 0, "y": 1}
+        mapper.partial_fit(pd.DataFrame({"A": ["w", "v"]}))
+        assert mapper.mappers_["A"] == {"x": 0, "y": 1, "w": 2}
+        assert mapper.counts_["A"]["v"] == 1
+        assert "w" not in mapper.counts_["A"].index
+        mapper.partial_fit(pd.DataFrame({"A": ["x", "v"]}))
+        assert mapper.mappers_["A"] == {"x": 0, "y": 1, "w": 2, "v": 3}
+        assert len(mapper.counts_["A"]) == 2
+
+    def test_min_frequency_bounded_counts(self, monkeypatch):
+        monkeypatch.setattr(data_module, "MAX_COUNTS", 3)
+        mapper = DataMapper(min_frequency=3)
+        mapper.partial_fit(pd.DataFrame({"A": ["a", "b", "b", "c", "d"]}))
+        assert mapper.counts_["A"].to_dict() == {"a": 1, "b": 2, "c": 1}
+        mapper.partial_fit(pd.DataFrame({"A": ["b", "e", "e"]}))
+        assert mapper.mappers_["A"] == {"b": 0}
+        assert mapper.counts_["A"].to_dict() == {"a": 1, "c": 1, "e": 2}
+
+    def test_n_jobs(self):
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame(
+            {
+                "C%d"
+                % i: rng.choice(["a", "b", "c", None], 100).astype(object)
+                for i in range(12)
+            }
+        ).assign(N=rng.random(100))
+        kwargs = {"min_frequency": {"C0": 30}, "hashing": {"C1": 8}}
+        serial = DataMapper(**kwargs).fit(data)
+        for n_jobs in [2, 4, -1]:
+            mapper = DataMapper(n_jobs=n_jobs, **kwargs).fit(data)
+            assert list(mapper.mappers_) == list(serial.mappers_)
+            assert mapper.mappers_ == serial.mappers_
+            assert mapper.buckets_ == serial.buckets_
+            data_new = mapper.transform(data)
+            pd.testing.assert_frame_equal(data_new, serial.transform(data))
+            pd.testing.assert_frame_equal(
+                mapper.inverse_transform(data_new),
+                serial.inverse_transform(data_new),
+            )
+
+        # object columns are processed in pool of processes
+        data["S"] = pd.Series(
+            rng.choice(["x", "y", None], 100).astype(object), dtype="str"
+        )
+        data["K"] = pd.Categorical(data["C2"])
+        kwargs["encoding"] = {"C3": "frequency"}
+        serial = DataMapper(**kwargs).fit(data)
+        mapper = DataMapper(n_jobs=2, backend="processes", **kwargs)
+        mapper.fit(data)
+        assert mapper.mappers_ == serial.mappers_
+        assert mapper.counts_["C0"].equals(serial.counts_["C0"])
+        pd.testing.assert_frame_equal(
+            mapper.transform(data), serial.transform(data)
+        )
+        assert (
+            mapper.one_hot_transform(data) != serial.one_hot_transform(data)
+        ).nnz == 0
+        array = data.iloc[:, :4].to_numpy()
+        mapper.fit(array)
+        np.testing.assert_array_equal(
+            mapper.transform(array), serial.fit(array).transform(array)
+        )
+
+        with pytest.raises(AttributeError):
+            DataMapper(backend="fork").fit(data)
+
+    def test_one_hot_transform(self):
+        data = pd.DataFrame(
+            {
+                "A": pd.Series(["x", "y", "x", "z", None], dtype=object),
+                "B": [1.5, 2.5, 3.5, 4.5, 5.5],
+                "C": ["u", "v", "u", "v", "u"],
+            }
+        )
+        mapper = DataMapper().fit(data)
+        matrix = mapper.one_hot_transform(data)
+        assert sparse.isspmatrix_csr(matrix)
+        assert matrix.dtype == np.float32
+        assert matrix.indices.dtype == matrix.indptr.dtype == np.int32
+        assert matrix.has_sorted_indices
+        assert matrix.nnz == 10
+        assert mapper.get_feature_names_out().tolist() == [
+            "A_x",
+            "A_y",
+            "A_z",
+            "A_None",
+            "C_u",
+            "C_v",
+        ]
+        expected = pd.get_dummies(
+            data[["A", "C"]], dummy_na=True, dtype=np.float32
+        )
+        expected = expected[
+            ["A_x", "A_y", "A_z", "A_nan", "C_u", "C_v"]
+        ].to_numpy()
+        np.testing.assert_array_equal(matrix.toarray(), expected)
+
+        # unseen values have no entries, order of data columns is ignored
+        matrix = mapper.one_hot_transform(
+            data[["C", "A"]].assign(A=["w", "y", "x", "w", "z"]),
+            dtype=np.float64,
+        )
+        assert matrix.dtype == np.float64
+        assert matrix.getnnz(axis=1).tolist() == [1, 2, 2, 1, 2]
+        assert matrix[1].indices.tolist() == [1, 5]
+
+        # hashed columns have a feature per bucket
+        mapper = DataMapper(hashing={"A": 4}).fit(data)
+        assert mapper.get_feature_names_out().tolist()[:4] == [
+            "A_0",
+            "A_1",
+            "A_2",
+            "A_3",
+        ]
+        matrix = mapper.one_hot_transform(data)
+        assert matrix.shape == (5, 6)
+        assert matrix[:, :4].argmax(axis=1).A1.tolist() == (
+            mapper.transform(data)["A"].tolist()
+        )
+
+        with pytest.raises(AttributeError):
+            mapper.one_hot_transform(data[["A"]])
+
+    def test_scaling(self):
+        from sklearn.preprocessing import (
+            MinMaxScaler,
+            RobustScaler,
+            StandardScaler,
+        )
+
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame(
+            {
+                "A": rng.normal(5, 2, 100),
+                "B": rng.integers(0, 50, 100),
+                "C": rng.choice(["x", "y", "z"], 100).astype(object),
+                "D": rng.exponential(3, 100),
+                "E": pd.date_range("2020-01-01", periods=100),
+            }
+        )
+        scalers = {
+            "standard": StandardScaler(),
+            "minmax": MinMaxScaler(),
+            "robust": RobustScaler(),
+        }
+        for scaling, scaler in scalers.items():
+            mapper = DataMapper(scaling=scaling).fit(data)
+            assert list(mapper.scalers_) == ["A", "B", "D"]
+            data_new = mapper.transform(data)
+            assert data_new.dtypes.tolist()[:4] == [
+                np.float32,
+                np.float32,
+                np.int8,
+                np.float32,
+            ]
+            expected = scaler.fit_transform(data[["A", "B", "D"]])
+            np.testing.assert_allclose(
+                data_new[["A", "B", "D"]].to_numpy(), expected, atol=1e-5
+            )
+            assert data_new["C"].tolist() == [
+                mapper.mappers_["C"][_] for _ in data["C"]
+            ]
+            # scaled columns are written in the same block, codes keep
+            # their type
+            block = data_new["A"].to_numpy().base
+            assert block.shape == (100, 3)
+            assert np.shares_memory(block, data_new["D"].to_numpy())
+            assert not np.shares_memory(block, data_new["C"].to_numpy())
+            assert data_new["E"].equals(data["E"])
+
+            restored = mapper.inverse_transform(data_new)
+            assert restored["B"].tolist() == data["B"].tolist()
+            assert restored["C"].tolist() == data["C"].tolist()
+            np.testing.assert_allclose(restored["A"], data["A"], rtol=1e-5)
+
+        mapper = DataMapper(scaling={"A": "minmax"}).fit(data)
+        assert list(mapper.scalers_) == ["A"]
+        data_new = mapper.column_transform(data, "A")
+        assert data_new["A"].min() == 0 and data_new["A"].max() == 1
+        assert data_new["C"].dtype == data["C"].dtype
+        record = mapper.transform_record(data.iloc[0].to_dict())
+        assert record["A"] == pytest.approx(data_new["A"].iloc[0], rel=1e-6)
+        assert record["B"] == data["B"].iloc[0]
+
+        with pytest.raises(AttributeError):
+            DataMapper(scaling="log").fit(data)
+
+    def test_scaling_partial_fit(self):
+        rng = np.random.default_rng(1)
+        data = pd.DataFrame(
+            {"A": rng.normal(5, 2, 100), "B": rng.integers(0, 50, 100)}
+        )
+        data.loc[[3, 50], "A"] = np.nan
+        for scaling in ["standard", "minmax"]:
+            mapper = DataMapper(scaling=scaling).fit(data)
+            chunked = DataMapper(scaling=scaling)
+            for start in range(0, 100, 30):
+                chunked.partial_fit(data.iloc[start:][:30])
+            for column in ["A", "B"]:
+                np.testing.assert_allclose(
+                    chunked.scalers_[column], mapper.scalers_[column]
+                )
+            data_new = mapper.transform(data)
+            assert data_new["A"].isna().sum() == 2
+
+        mapper = DataMapper(scaling="robust").partial_fit(data)
+        with pytest.raises(AttributeError):
+            mapper.partial_fit(data)
+
+        # constant column isn't scaled
+        mapper = DataMapper(scaling="standard").fit(data.assign(B=7))
+        assert mapper.scalers_["B"] == (7.0, 1.0)
+
+    def test_frequency_encoding(self):
+        data = pd.DataFrame(
+            {
+                "A": ["x", "y", "x", "z", "x", None, "y", "x"],
+                "B": ["u", "v"] * 4,
+            }
+        )
+        mapper = DataMapper(encoding={"A": "frequency"}).fit(data)
+        data_new = mapper.transform(data)
+        assert data_new["A"].dtype == np.float32
+        expected = data["A"].map(
+            data["A"].value_counts(normalize=True, dropna=False)
+        )
+        np.testing.assert_allclose(data_new["A"], expected)
+        assert data_new["B"].tolist() == [0, 1] * 4
+
+        # unknown values have zero frequency
+        assert mapper.transform(data.assign(A="w"))["A"].eq(0).all()
+        assert mapper.transform_record({"A": "y", "B": "v"}) == {
+            "A": pytest.approx(0.25),
+            "B": 1,
+        }
+
+        # frequency encoded columns aren't decoded
+        restored = mapper.inverse_transform(data_new)
+        assert restored["A"].equals(data_new["A"])
+        with pytest.raises(AttributeError):
+            mapper.column_inverse_transform(data_new, "A")
+
+        # counts are accumulated between chunks
+        chunked = DataMapper(encoding="frequency")
+        for start in range(0, 8, 3):
+            chunked.partial_fit(data.iloc[start:][:3])
+        np.testing.assert_allclose(chunked.transform(data)["A"], expected)
+
+        with pytest.raises(AttributeError):
+            DataMapper(encoding="binary").fit(data)
+
+    def test_target_encoding(self):
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame(
+            {
+                "A": rng.choice(["x", "y", "z"], 300).astype(object),
+                "B": rng.choice(["u", "v"], 300).astype(object),
+            }
+        )
+        y = (data["A"] == "x") * 2.0 + rng.random(300)
+        mapper = DataMapper(encoding={"A": "target"}, smoothing=2.0)
+        mapper.fit(data, y)
+        prior = y.mean()
+        groups = y.groupby(data["A"]).agg(["sum", "count"])
+        expected = (groups["sum"] + 2.0 * prior) / (groups["count"] + 2.0)
+        data_new = mapper.transform(data)
+        assert data_new["A"].dtype == np.float32
+        np.testing.assert_allclose(
+            data_new["A"], data["A"].map(expected), rtol=1e-6
+        )
+        assert data_new["B"].dtype == np.int8
+        assert mapper.transform(data.assign(A="w"))["A"].iloc[0] == (
+            pytest.approx(prior)
+        )
+        assert mapper.transform_record({"A": "y"})["A"] == pytest.approx(
+            expected["y"]
+        )
+
+        # out-of-fold encoding of training data
+        mapper = DataMapper(
+            encoding={"A": "target"}, n_folds=3, random_state=0
+        )
+        data_new = mapper.fit_transform(data, y)
+        folds = np.random.RandomState(0).permutation(300) % 3
+        for fold in range(3):
+            train = folds != fold
+            prior = y[train].mean()
+            groups = y[train].groupby(data["A"][train]).agg(["sum", "count"])
+            expected = (groups["sum"] + prior) / (groups["count"] + 1.0)
+            np.testing.assert_allclose(
+                data_new["A"][~train],
+                data["A"][~train].map(expected),
+                rtol=1e-6,
+            )
+        # out-of-fold values differ from full-data ones
+        assert not np.allclose(data_new["A"], mapper.transform(data)["A"])
+        assert data_new["B"].tolist() == mapper.transform(data)["B"].tolist()
+
+        # the same statistics are accumulated from chunks
+        chunked = DataMapper(encoding={"A": "target"}).fit(
+            iter([data.iloc[:100], data.iloc[100:]]),
+            iter([y[:100], y[100:]]),
+        )
+        np.testing.assert_allclose(
+            chunked.transform(data)["A"], mapper.transform(data)["A"]
+        )
+
+        with pytest.raises(AttributeError):
+            DataMapper(encoding="target").fit(data)
+        with pytest.raises(AttributeError):
+            DataMapper(encoding="target").fit(data, y[:10])
+        with pytest.raises(AttributeError):
+            DataMapper(encoding="target", n_folds=1).fit_transform(data, y)
+        with pytest.raises(AttributeError):
+            DataMapper(encoding="target").fit_transform(
+                iter([data.iloc[:100], data.iloc[100:]]),
+                iter([y[:100], y[100:]]),
+            )
+
+        # failed chunk leaves fitted state untouched
+        mappers = {
+            column_: dict(mapper_)
+            for column_, mapper_ in chunked.mappers_.items()
+        }
+        n_samples = chunked.n_samples_
+        with pytest.raises(AttributeError):
+            chunked.partial_fit(data.assign(A="w"))
+        assert chunked.mappers_ == mappers
+        assert chunked.n_samples_ == n_samples
+
+    def test_categorical(self):
+        data = pd.DataFrame(
+            {
+                "A": pd.Categorical(
+                    ["x", "y", None, "x"], categories=["y", "x", "w"]
+                ),
+                "B": ["u", "v", "u", "v"],
+            }
+        )
+        mapper = DataMapper().fit(data)
+        assert mapper.categories_["A"].tolist()[:3] == ["y", "x", "w"]
+        assert pd.isna(mapper.categories_["A"][3])
+        data_new = mapper.transform(data)
+        assert data_new["A"].dtype == np.int8
+        assert data_new["A"].tolist() == [1, 0, 3, 1]
+
+        # categories of other data are remapped to fitted codes
+        other = data.assign(
+            A=pd.Categorical(
+                ["z", "x", "w", "y"], categories=["z", "x", "w", "y"]
+            )
+        )
+        assert mapper.transform(other)["A"].tolist() == [-1, 1, 2, 0]
+        # the same codes as for object values
+        assert (
+            mapper.transform(other.astype({"A": object}))["A"].tolist()
+            == mapper.transform(other)["A"].tolist()
+        )
+
+        restored = mapper.inverse_transform(data_new)
+        assert restored["A"].dtype == data["A"].dtype
+        pd.testing.assert_frame_equal(restored, data)
+
+        # categorical columns are hashed by categories
+        mapper = DataMapper(hashing={"A": 8}).fit(data)
+        assert (
+            mapper.transform(data)["A"].tolist()
+            == mapper.transform(data.astype({"A": object}))["A"].tolist()
+        )
+
+        mapper = DataMapper(min_frequency=2).fit(data)
+        assert mapper.mappers_["A"] == {"x": 0}
+        assert mapper.counts_["A"].tolist() == [1, 0, 1]
+
+    def test_numpy_ndarray(self):
+        data = np.array(
+            [["x", "u"], ["y", "v"], ["x", "w"], [None, "u"]], dtype=object
+        )
+        mapper = DataMapper().fit(data)
+        assert mapper.mappers_[0] == {"x": 0, "y": 1, None: 2}
+        assert mapper.mappers_[1] == {"u": 0, "v": 1, "w": 2}
+
+        data_new = mapper.transform(data)
+        assert isinstance(data_new, np.ndarray)
+        assert data_new.dtype == np.int8
+        assert data_new.tolist() == [[0, 0], [1, 1], [0, 2], [2, 0]]
+        np.testing.assert_array_equal(
+            data_new,
+            mapper.transform(pd.DataFrame(data, dtype=object)).to_numpy(),
+        )
+        restored = mapper.inverse_transform(data_new)
+        assert restored.dtype == object
+        assert restored[:3].tolist() == data[:3].tolist()
+        assert pd.isna(restored[3, 0])
+
+        # arrays of strings
+        strings = np.array([["a", "b"], ["c", "b"]])
+        mapper = DataMapper(encoding={1: "frequency"}).fit(strings)
+        data_new = mapper.transform(strings)
+        assert data_new.dtype == np.float32
+        assert data_new.tolist() == [[0, 1], [1, 1]]
+        assert mapper.one_hot_transform(strings).shape == (2, 3)
+
+        with pytest.raises(AttributeError):
+            mapper.transform(np.array([[1.0, 2.0]]))
+        with pytest.raises(AttributeError):
+            mapper.transform(np.array(["a", "b"]))
@@ -1,8 +1,18 @@
+import io
+import json
+import warnings
+
+from collections.abc import Iterator
+
 import numpy as np
 import pandas as pd
 import pytest
 
+from pandas.api.types import CategoricalDtype
+
+from dsmlt.constants import FLOATS_RANGES, INTEGERS_RANGES
 from dsmlt.preprocessing import MemoryOptimiser
+from dsmlt.preprocessing.optimisation import FixedPoint, lookup_dtypes
 from dsmlt.utils.random_data import (
     random_narray,
     random_series,
@@ -17,6 +27,10 @@ class TestMemoryOptimisation:
         assert optimiser.axis == 0
         assert optimiser.copy is True
 
+        optimiser = MemoryOptimiser(mode="decimal")
+        assert optimiser.mode == "decimal"
+        assert optimiser.max_decimals == 4
+
         optimiser = MemoryOptimiser(mode="convert", axis=3, copy=False)
         assert optimiser.mode == "convert"
         assert optimiser.axis == 3
@@ -34,6 +48,12 @@ class TestMemoryOptimisation:
         optimiser = MemoryOptimiser(mode=np.float128)
         assert optimiser.mode == np.float128
 
+        optimiser = MemoryOptimiser(mode=[int, np.int8, np.float128])
+        assert optimiser.mode == [int, np.int8, np.float128]
+
+        optimiser = MemoryOptimiser(mode={"a": "auto", "b": np.int8})
+        assert optimiser.mode == {"a": "auto", "b": np.int8}
+
     def test_wrong_init_optimiser(self):
         with pytest.raises(AttributeError) as exc:
             MemoryOptimiser(mode="random")
@@ -46,13 +66,16 @@ class TestMemoryOptimisation:
             == "Passed invalid value of `mode` - `<class 'set'>`."
         )
 
-        with pytest.raises(NotImplementedError) as exc:
-            MemoryOptimiser(mode=[int, np.int8, np.float128])
-        assert str(exc.value) == "Not implemented yet."
+        with pytest.raises(AttributeError) as exc:
+            MemoryOptimiser(mode=[int, np.int8, "random"])
+        assert str(exc.value) == "Passed invalid value of `mode` - `random`."
 
-        with pytest.raises(NotImplementedError) as exc:
-            MemoryOptimiser(mode={"a": int, "b": np.int8, "c": np.float16})
-        assert str(exc.value) == "Not implemented yet."
+        with pytest.raises(AttributeError) as exc:
+            MemoryOptimiser(mode={"a": int, "b": [np.int8]})
+        assert (
+            str(exc.value)
+            == "Passed invalid value of `mode` - `[<class 'numpy.int8'>]`."
+        )
 
     def test_reset_optimiser(self):
         data = random_narray((2, 3, 4), astype=np.int64)
@@ -293,3 +316,913 @@ class TestMemoryOptimisation:
 
         data = optimiser.transform(data)
         assert data.dtypes.values[-1] == "category"
+
+    def test_partial_fit_pandas_dataframe(self):
+        data = random_dataframe(
+            100, 4, low=0, high=100, dtype=np.int8, astype=np.int64
+        )
+        data.iloc[-1, 0] = 1000
+        data["E"] = data["B"].astype(np.float64) / 2
+
+        optimiser = MemoryOptimiser(mode="convert")
+        for start, end in zip(range(0, 100, 30), range(30, 130, 30)):
+            optimiser.partial_fit(data.iloc[start:end])
+
+        expected = MemoryOptimiser(mode="convert").fit(data)
+        assert optimiser.data_types_ == expected.data_types_
+        assert optimiser.data_types_.get("A") == np.int16
+        assert optimiser.data_types_.get("B") == np.int8
+        assert optimiser.data_types_.get("E") == np.float16
+
+        # chunks with different inferred types are merged
+        optimiser = MemoryOptimiser(mode="convert")
+        optimiser.partial_fit(pd.DataFrame({"A": [1, 2, 3]}))
+        optimiser.partial_fit(pd.DataFrame({"A": [4.0, np.nan]}))
+        assert optimiser.data_stats_["A"]["dtype"] == np.float64
+        assert optimiser.data_types_.get("A") == "Int8"
+
+    def test_partial_fit_numpy_ndarray(self):
+        data = random_narray(
+            (10, 3), low=0, high=100, dtype=np.int8, astype=np.int64
+        )
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.partial_fit(data[:5])
+        optimiser.partial_fit(data[5:] + 1000)
+        assert optimiser.data_types_ == np.int16
+
+    def test_chunks_pandas_dataframe(self):
+        data = random_dataframe(
+            100, 4, low=0, high=100, dtype=np.int8, astype=np.int64
+        )
+        buffer = io.StringIO(data.to_csv(index=False))
+
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.fit(pd.read_csv(buffer, chunksize=30))
+        assert list(optimiser.data_types_.values()) == [np.int8] * 4
+
+        buffer.seek(0)
+        chunks = optimiser.transform(pd.read_csv(buffer, chunksize=30))
+        assert isinstance(chunks, Iterator)
+
+        data_new = pd.concat(list(chunks))
+        assert len(data_new) == 100
+        for item_type in data_new.dtypes.values:
+            assert item_type == np.int8
+        np.testing.assert_array_equal(data_new.values, data.values)
+
+    def test_lookup_dtypes(self):
+        dtypes = lookup_dtypes(
+            [0, -200, 0, -(2**40), 0],
+            [100, 200, 40000, 2**40, 2**63],
+            INTEGERS_RANGES,
+        )
+        assert dtypes == [np.int8, np.int16, np.int32, np.int64, None]
+
+        dtypes = lookup_dtypes([0.5, -1e10], [1.5, 1e10], FLOATS_RANGES)
+        assert dtypes == [np.float16, np.float32]
+
+    def test_analyze_wide_pandas_dataframe(self):
+        data = random_dataframe(
+            50, 60, low=0, high=100, dtype=np.int8, astype=np.float64
+        )
+        data.iloc[:, :20] += 0.5
+        data.iloc[:, 20:30] *= 1000
+        data.iloc[3, 30:40] = np.nan
+        data["int"] = np.arange(50, dtype=np.int64) * 10
+        data["object"] = "a"
+
+        optimiser = MemoryOptimiser(mode="convert")
+        optimiser.fit(data)
+        for column_name in data.columns:
+            assert optimiser.data_types_[
+                column_name
+            ] == optimiser._analyze_series(data[column_name])
+
+        assert optimiser.data_types_[data.columns[0]] == np.float16
+        assert optimiser.data_types_[data.columns[20]] == np.int32
+        assert optimiser.data_types_[data.columns[30]] == "Int8"
+        assert optimiser.data_types_[data.columns[40]] == np.int8
+        assert optimiser.data_types_["int"] == np.int16
+        assert isinstance(optimiser.data_types_["object"], CategoricalDtype)
+
+        # blocks wider than a column slice are reduced slice by slice
+        groups = optimiser._column_groups(150, 64)
+        assert [_.stop - _.start for _ in groups] == [50, 50, 50]
+        types = [optimiser.data_types_[_] for _ in data.columns]
+        wide = pd.concat([data] * 3, axis=1, ignore_index=True)
+        optimiser.fit(wide)
+        assert [optimiser.data_types_[_] for _ in wide.columns] == types * 3
+
+    def test_low_memory_pandas_dataframe(self):
+        data = random_dataframe(
+            1000, 4, low=0, high=100, dtype=np.int8, astype=np.int64
+        )
+        data["E"] = data["A"].astype(np.float64) / 2
+        data["F"] = data["B"].astype("category")
+        data["G"] = "a"
+
+        optimiser = MemoryOptimiser(mode="convert")
+        expected = optimiser.fit(data).transform(data)
+
+        optimiser = MemoryOptimiser(mode="convert", low_memory=True)
+        data_new = optimiser.fit(data).transform(data)
+        pd.testing.assert_frame_equal(data_new, expected)
+        assert data_new is not data
+        assert data["A"].dtype == np.int64
+        # peak memory is traced only on request
+        assert not hasattr(optimiser, "peak_memory_")
+
+        optimiser.set_params(trace_memory=True)
+        optimiser.transform(data)
+        assert 0 < optimiser.peak_memory_ < data.memory_usage(deep=True).sum()
+
+        # inplace conversion replaces columns of the original frame
+        optimiser = MemoryOptimiser(
+            mode="convert", copy=False, low_memory=True
+        )
+        data_new = optimiser.fit(data).transform(data)
+        assert data_new is data
+        pd.testing.assert_frame_equal(data_new, expected)
+
+    def test_analyze_unsigned_integers(self):
+        data = pd.DataFrame(
+            {
+                "A": np.arange(256, dtype=np.int64),
+                "B": np.arange(256, dtype=np.int64) - 128,
+                "C": np.arange(256, dtype=np.int64) % 100,
+                "D": np.arange(256, dtype=np.uint64) * 256,
+            }
+        )
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {
+            "A": np.uint8,
+            "B": np.int8,
+            "C": np.int8,
+            "D": np.uint16,
+        }
+
+        data_new = optimiser.transform(data)
+        np.testing.assert_array_equal(data_new.values, data.values)
+
+        optimiser = MemoryOptimiser(mode="auto", unsigned=False)
+        optimiser.fit(data)
+        assert optimiser.data_types_.get("A") == np.int16
+        assert optimiser.data_types_.get("D") == np.int32
+
+    def test_analyze_nullable_integers(self):
+        data = pd.DataFrame(
+            {
+                "A": [1.0, 2.0, np.nan, 200.0],
+                "B": pd.array([1, None, 300, 4], dtype="Int64"),
+                "C": pd.array([-1, None, 3, 4], dtype="Int64"),
+                "D": [1.5, 2.0, np.nan, 200.0],
+            }
+        )
+        optimiser = MemoryOptimiser(mode="convert")
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {
+            "A": "UInt8",
+            "B": "Int16",
+            "C": "Int8",
+            "D": np.float16,
+        }
+
+        data_new = optimiser.transform(data)
+        assert data_new["A"].isna().tolist() == [False, False, True, False]
+        assert data_new["B"].tolist()[2] == 300
+
+        # auto mode keeps float features as float
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.fit(data)
+        assert optimiser.data_types_.get("A") == np.float16
+        assert optimiser.data_types_.get("B") == "Int16"
+
+        optimiser = MemoryOptimiser(mode="convert", nullable=False)
+        optimiser.fit(data)
+        assert optimiser.data_types_.get("A") == np.float16
+
+        # numpy ndarray can't hold missing values in integer types
+        optimiser = MemoryOptimiser(mode="convert")
+        optimiser.fit(data["A"].to_numpy())
+        assert optimiser.data_types_ == np.float16
+
+    def test_analyze_object_to_category(self):
+        data = pd.DataFrame(
+            {
+                "A": ["a", "b", None, "a"] * 25,
+                "B": [str(_) for _ in range(100)],
+                "C": ["c"] * 100,
+            }
+        )
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.fit(data)
+        assert list(optimiser.data_types_["A"].categories) == ["a", "b"]
+        assert optimiser.data_types_["B"] == data["B"].dtype
+        assert list(optimiser.data_types_["C"].categories) == ["c"]
+
+        data_new = optimiser.transform(data)
+        assert data_new["A"].cat.codes.dtype == np.int8
+        assert data_new["A"].isna().sum() == 25
+        assert data_new["B"].dtype == data["B"].dtype
+
+        # unseen at fit values are missing after transform, explicitly
+        # and without warnings of pandas
+        other = pd.DataFrame({"A": ["a", "d"], "C": ["e", "c"]})
+        for params in ({}, {"low_memory": True}, {"n_jobs": 2}):
+            optimiser.set_params(**params)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                data_new = optimiser.transform(other)
+            assert data_new["A"].isna().tolist() == [False, True]
+            assert data_new["C"].isna().tolist() == [True, False]
+            assert data_new["A"].dtype == optimiser.data_types_["A"]
+
+        optimiser = MemoryOptimiser(mode="auto", category_ratio=None)
+        optimiser.fit(data)
+        assert optimiser.data_types_["A"] == data["A"].dtype
+
+        # unhashable values are left as is
+        other = pd.DataFrame({"A": [[1], {"a": 1}, [1], None] * 25})
+        optimiser = MemoryOptimiser(mode="auto").fit(other)
+        assert optimiser.data_types_["A"] == object
+        assert optimiser.transform(other)["A"].tolist() == other["A"].tolist()
+
+        # high cardinality is detected on sample
+        optimiser = MemoryOptimiser(mode="auto", category_sample_size=10)
+        optimiser.fit(data)
+        assert optimiser.data_stats_["B"]["categories"] is None
+        assert isinstance(optimiser.data_types_["C"], CategoricalDtype)
+
+    def test_partial_fit_object_to_category(self):
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.partial_fit(pd.Series(["a", "b", "a", "a"]))
+        optimiser.partial_fit(pd.Series(["c", "a", "a", "b"]))
+        assert list(optimiser.data_types_.categories) == ["a", "b", "c"]
+
+        data = pd.Series(["d", "e", "f", "g", "h"])
+        optimiser.partial_fit(data)
+        assert optimiser.data_types_ == data.dtype
+
+    def test_partial_fit_empty_chunk(self):
+        # chunk without values is parsed from csv as float64
+        chunks = [
+            pd.DataFrame({"A": ["a", "b", "a", "a"] * 5, "B": range(20)}),
+            pd.DataFrame({"A": [np.nan] * 2, "B": [5, 6]}),
+        ]
+        optimiser = MemoryOptimiser(mode="auto")
+        for chunk in chunks:
+            optimiser.partial_fit(chunk)
+        assert isinstance(optimiser.data_types_["A"], CategoricalDtype)
+        assert list(optimiser.data_types_["A"].categories) == ["a", "b"]
+        assert optimiser.data_types_["B"] == np.int8
+
+        optimiser = MemoryOptimiser(mode="auto")
+        for chunk in chunks[::-1]:
+            optimiser.partial_fit(chunk)
+        assert list(optimiser.data_types_["A"].categories) == ["a", "b"]
+
+        data_new = optimiser.transform(chunks[1])
+        assert data_new["A"].isna().all()
+
+    def test_analyze_float_precision(self):
+        data = pd.DataFrame(
+            {
+                "A": np.linspace(0, 1, 100),
+                "B": np.linspace(0, 1, 100) + 1000,
+                "C": np.arange(100) / 4,
+            }
+        )
+        data.iloc[3, :] = np.nan
+
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.fit(data)
+        assert list(optimiser.data_types_.values()) == [np.float16] * 3
+
+        optimiser = MemoryOptimiser(mode="auto", float_atol=1e-3)
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {
+            "A": np.float16,
+            "B": np.float32,
+            "C": np.float16,
+        }
+
+        optimiser = MemoryOptimiser(mode="auto", float_rtol=1e-6)
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {
+            "A": np.float32,
+            "B": np.float32,
+            "C": np.float16,
+        }
+
+        optimiser = MemoryOptimiser(mode="auto", float_atol=1e-12)
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {
+            "A": np.float64,
+            "B": np.float64,
+            "C": np.float16,
+        }
+
+        data_new = optimiser.transform(data)
+        pd.testing.assert_frame_equal(data_new.astype(np.float64), data)
+
+        # precision is checked for all chunks together
+        optimiser = MemoryOptimiser(mode="auto", float_atol=1e-12)
+        optimiser.partial_fit(data["C"])
+        assert optimiser.data_types_ == np.float16
+        optimiser.partial_fit(data["A"])
+        assert optimiser.data_types_ == np.float64
+
+    def test_analyze_decimal(self):
+        data = pd.DataFrame(
+            {
+                "A": np.arange(100) * 0.01 + 100,
+                "B": np.arange(100) / 10000,
+                "C": np.arange(100) * 1000.5,
+                "D": np.arange(100) * 0.00001,
+                "E": np.arange(100) * 1.0,
+                "F": np.arange(100) / 3,
+            }
+        )
+        data.loc[3, "C"] = np.nan
+
+        optimiser = MemoryOptimiser(mode="decimal")
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {
+            "A": FixedPoint(np.int16, 2),
+            "B": FixedPoint(np.int8, 4),
+            "C": FixedPoint("Int32", 1),
+            "D": np.float16,
+            "E": np.int8,
+            "F": np.float16,
+        }
+
+        data_new = optimiser.transform(data)
+        assert data_new["A"].dtype == np.int16
+        assert data_new["A"].tolist()[:2] == [10000, 10001]
+        assert data_new["C"].dtype == "Int32"
+
+        data_restored = optimiser.inverse_transform(data_new)
+        for column_name in ["A", "B", "C"]:
+            np.testing.assert_array_equal(
+                data_restored[column_name].to_numpy(dtype=np.float64),
+                data[column_name].to_numpy(),
+            )
+
+        # numpy ndarray with missing values stays float
+        optimiser = MemoryOptimiser(mode="decimal")
+        optimiser.fit(data["C"].to_numpy())
+        assert optimiser.data_types_ == np.float32
+
+        optimiser = MemoryOptimiser(mode="decimal")
+        optimiser.fit(data["B"].to_numpy())
+        assert optimiser.data_types_ == FixedPoint(np.int8, 4)
+        np.testing.assert_array_equal(
+            optimiser.inverse_transform(
+                optimiser.transform(data["B"].to_numpy())
+            ),
+            data["B"].to_numpy(),
+        )
+
+    def test_features_modes_pandas_dataframe(self):
+        data = pd.DataFrame(
+            {
+                "A": np.arange(100, dtype=np.int64),
+                "B": np.arange(100, dtype=np.float64),
+                "C": np.arange(100, dtype=np.float64),
+                "D": np.arange(100, dtype=np.float64) / 100,
+                "E": ["a", "b"] * 50,
+            }
+        )
+        optimiser = MemoryOptimiser(
+            mode={"A": np.int32, "B": "auto", "C": "convert", "D": "decimal"}
+        )
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {
+            "A": np.int32,
+            "B": np.float16,
+            "C": np.int8,
+            "D": FixedPoint(np.int8, 2),
+        }
+        assert set(optimiser.mode_optimisers_) == {
+            "auto",
+            "convert",
+            "decimal",
+        }
+
+        data_new = optimiser.transform(data)
+        assert data_new.dtypes.tolist() == [
+            np.int32,
+            np.float16,
+            np.int8,
+            np.int8,
+            data["E"].dtype,
+        ]
+
+        # types are stored in order of columns
+        optimiser = MemoryOptimiser(mode={"D": "decimal", "A": np.int32})
+        optimiser.fit(data)
+        assert list(optimiser.data_types_) == ["A", "D"]
+
+        optimiser = MemoryOptimiser(mode=["convert", np.float32])
+        optimiser.partial_fit(data[["A", "B"]].iloc[:50])
+        optimiser.partial_fit(data[["A", "B"]].iloc[50:] * 10)
+        assert optimiser.data_types_ == {"A": np.int16, "B": np.float32}
+
+        with pytest.raises(AttributeError):
+            optimiser.fit(data["A"])
+        with pytest.raises(AttributeError):
+            optimiser.fit(data)
+
+    def test_schema(self):
+        data = pd.DataFrame(
+            {
+                "A": np.arange(100, dtype=np.int64),
+                "B": np.arange(100, dtype=np.float64) / 100,
+                "C": ["a", "b"] * 50,
+                "D": [1.0, np.nan] * 50,
+            }
+        )
+        optimiser = MemoryOptimiser(mode="decimal")
+        optimiser.fit(data)
+
+        schema = json.loads(json.dumps(optimiser.to_schema()))
+        assert schema == {
+            "columns": {
+                "A": "int8",
+                "B": {"fixed_point": "int8", "decimals": 2},
+                "C": {"categories": ["a", "b"], "ordered": False},
+                "D": "Int8",
+            }
+        }
+
+        restored = MemoryOptimiser.from_schema(schema, mode="decimal")
+        assert restored.data_types_ == optimiser.data_types_
+        pd.testing.assert_frame_equal(
+            restored.transform(data), optimiser.transform(data)
+        )
+
+        buffer = io.StringIO(data.to_csv(index=False))
+        data_new = pd.read_csv(buffer, dtype=restored.get_dtypes())
+        assert data_new.dtypes.to_dict() == {
+            "A": np.int8,
+            "B": np.float64,
+            "C": CategoricalDtype(["a", "b"]),
+            "D": "Int8",
+        }
+
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.fit(data["A"])
+        assert optimiser.to_schema() == {"dtype": "int8"}
+        restored = MemoryOptimiser.from_schema(optimiser.to_schema())
+        assert restored.data_types_ == np.int8
+
+    def test_sample_fit(self):
+        data = pd.DataFrame(
+            {
+                "A": np.arange(1000, dtype=np.int64),
+                "B": np.arange(1000, dtype=np.float64) / 1000,
+            }
+        )
+        optimiser = MemoryOptimiser(
+            mode="auto", sample_size=100, random_state=0
+        )
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {"A": np.int16, "B": np.float16}
+
+        optimiser = MemoryOptimiser(
+            mode="auto", sample_size=0.1, random_state=0
+        )
+        optimiser.fit(data["A"].to_numpy())
+        assert optimiser.data_types_ == np.int16
+
+        optimiser = MemoryOptimiser(
+            mode="auto", sample_size=10000, random_state=0
+        )
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {"A": np.int16, "B": np.float16}
+
+        # sampled optimiser widens types of new data by default
+        optimiser = MemoryOptimiser(mode="auto", sample_size=10)
+        optimiser.fit(data["A"].iloc[:100])
+        assert optimiser.data_types_ == np.int8
+        data_new = optimiser.transform(data["A"])
+        assert data_new.dtype == np.int16
+        assert data_new.tolist() == data["A"].tolist()
+
+        # data is sampled once for per feature modes
+        optimiser = MemoryOptimiser(
+            mode={"A": "auto", "B": "decimal"}, sample_size=100
+        )
+        optimiser.fit(data)
+        assert optimiser.mode_optimisers_["auto"].sample_size is None
+        assert optimiser.mode_optimisers_["decimal"].sample_size is None
+
+    def test_out_of_range(self):
+        data = pd.DataFrame(
+            {
+                "A": np.arange(100, dtype=np.int64),
+                "B": np.arange(100, dtype=np.float64),
+                "C": [1.0, np.nan] * 50,
+                "D": np.arange(100, dtype=np.float64) / 100,
+                "E": ["a", "b"] * 50,
+            }
+        )
+        batch = pd.DataFrame(
+            {
+                "A": [-1, 300],
+                "B": [0.0, 1e6],
+                "C": [np.nan, 1000.0],
+                "D": [0.5, 3.0],
+                "E": ["c", None],
+            }
+        )
+
+        optimiser = MemoryOptimiser(mode="decimal", out_of_range="widen")
+        optimiser.fit(data)
+        data_types = dict(optimiser.data_types_)
+        data_new = optimiser.transform(batch)
+        # fitted types aren't changed by transform
+        assert optimiser.data_types_ == data_types
+        assert data_new["A"].dtype == np.int16
+        assert data_new["B"].dtype == np.int32
+        assert data_new["C"].dtype == "Int16"
+        assert data_new["D"].dtype == np.int16
+        assert data_new["E"].dtype == CategoricalDtype(["a", "b", "c"])
+        assert data_new["A"].tolist() == [-1, 300]
+        assert data_new["B"].tolist() == [0, 1000000]
+        assert data_new["C"].tolist()[1] == 1000
+        assert data_new["E"].tolist()[0] == "c"
+        assert optimiser.inverse_transform(data_new)["D"].tolist() == [
+            0.5,
+            3.0,
+        ]
+
+        # fixed-point features with more decimal places are kept as float
+        data_new = optimiser.transform(pd.DataFrame({"D": [0.5, 0.125]}))
+        assert data_new["D"].dtype == np.float64
+        assert data_new["D"].tolist() == [0.5, 0.125]
+        optimiser.set_params(structured=True)
+        optimiser.fit(data[["B", "D"]].values)
+        data_new = optimiser.transform(np.array([[1.0, 0.5], [2.0, 0.125]]))
+        assert data_new["f1"].dtype == np.float64
+        assert data_new["f1"].tolist() == [0.5, 0.125]
+
+        # float features are widened to float type
+        optimiser = MemoryOptimiser(mode="auto", out_of_range="widen")
+        optimiser.fit(data["B"])
+        assert optimiser.transform(batch["B"]).dtype == np.float32
+
+        optimiser = MemoryOptimiser(mode="auto", out_of_range="raise")
+        optimiser.fit(data)
+        with pytest.raises(ValueError) as exc:
+            optimiser.transform(batch)
+        assert (
+            str(exc.value) == "Values of feature `A` are out of range of type "
+            "`int8`."
+        )
+        with pytest.raises(ValueError) as exc:
+            optimiser.transform(batch[["E"]])
+        assert (
+            str(exc.value) == "Feature `E` has categories unseen during fit."
+        )
+        optimiser = MemoryOptimiser(mode="decimal", out_of_range="raise")
+        optimiser.fit(data[["D"]])
+        with pytest.raises(ValueError) as exc:
+            optimiser.transform(pd.DataFrame({"D": [0.5, 0.125]}))
+        assert (
+            str(exc.value) == "Values of feature `D` have more than 2 decimal "
+            "places."
+        )
+
+        # data isn't checked by default
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.fit(data["A"])
+        assert optimiser.transform(batch["A"]).tolist() == [-1, 44]
+
+        optimiser.set_params(out_of_range="clip")
+        with pytest.raises(AttributeError):
+            optimiser.transform(batch["A"])
+
+    def test_memory_report(self):
+        data = pd.DataFrame(
+            {
+                "A": np.arange(100, dtype=np.int64),
+                "B": np.arange(100, dtype=np.float64) / 2,
+                "C": ["a", "b"] * 50,
+            }
+        )
+
+        optimiser = MemoryOptimiser(mode="convert", report=True)
+        optimiser.fit(data)
+        assert optimiser.analysis_time_ > 0
+        optimiser.transform(data)
+        report = optimiser.memory_report_
+        assert report.index.tolist() == ["A", "B", "C"]
+        assert report["dtype_before"].tolist() == [
+            np.int64,
+            np.float64,
+            data["C"].dtype,
+        ]
+        assert report["dtype_after"].tolist()[:2] == [np.int8, np.float16]
+        assert report["bytes_before"].tolist() == (
+            data.memory_usage(index=False, deep=True).tolist()
+        )
+        assert report["bytes_after"].tolist()[:2] == [100, 200]
+        assert (report["bytes_saved"] > 0).all()
+        assert report.attrs["analysis_time"] == optimiser.analysis_time_
+        assert report.attrs["transform_time"] == optimiser.transform_time_
+        assert optimiser.transform_time_ > 0
+
+        # memory of chunks is summed up
+        chunks = optimiser.transform(iter([data, data.iloc[:50]]))
+        for _ in chunks:
+            pass
+        assert optimiser.memory_report_["bytes_after"].tolist()[:2] == [
+            150,
+            300,
+        ]
+
+        optimiser = MemoryOptimiser(mode="auto", report=True)
+        optimiser.fit(data["A"].to_numpy())
+        optimiser.transform(data["A"].to_numpy())
+        assert optimiser.memory_report_["bytes_before"].tolist() == [800]
+        assert optimiser.memory_report_["bytes_after"].tolist() == [100]
+
+        # memory isn't measured by default
+        optimiser = MemoryOptimiser(mode="auto")
+        optimiser.fit(data).transform(data)
+        assert not hasattr(optimiser, "memory_report_")
+        assert optimiser.transform_time_ > 0
+
+    def test_analyze_sparse(self):
+        zeros = np.zeros(100)
+        zeros[::25] = [1, 2, 3, 300]
+        nans = np.full(100, np.nan)
+        nans[::50] = [1.0, 300.0]
+        data = pd.DataFrame(
+            {
+                "A": zeros.astype(np.int64),
+                "B": zeros / 4,
+                "C": nans,
+                "D": np.arange(100, dtype=np.int64),
+                "E": pd.arrays.SparseArray(zeros),
+            }
+        )
+
+        optimiser = MemoryOptimiser(mode="convert")
+        optimiser.fit(data)
+        assert optimiser.data_types_["A"] == np.int16
+        assert optimiser.data_types_["E"] == pd.SparseDtype(np.int16, 0)
+
+        optimiser = MemoryOptimiser(
+            mode="convert", sparse_ratio=0.9, report=True
+        )
+        optimiser.fit(data)
+        assert optimiser.data_types_ == {
+            "A": pd.SparseDtype(np.int16, 0),
+            "B": pd.SparseDtype(np.float16, 0),
+            "C": pd.SparseDtype(np.float32, np.nan),
+            "D": np.int8,
+            "E": pd.SparseDtype(np.int16, 0),
+        }
+        data_new = optimiser.transform(data)
+        pd.testing.assert_frame_equal(
+            data_new.astype(np.float64),
+            data.astype(np.float64),
+            check_dtype=False,
+        )
+        assert (
+            optimiser.memory_report_["bytes_after"]["A"]
+            < optimiser.memory_report_["bytes_before"]["A"] / 10
+        )
+        assert optimiser.get_dtypes()["C"] == np.float32
+
+        schema = json.loads(json.dumps(optimiser.to_schema()))
+        pd.testing.assert_frame_equal(
+            MemoryOptimiser.from_schema(schema).transform(data), data_new
+        )
+
+        # sparse types are widened by new values
+        optimiser.set_params(out_of_range="widen")
+        data_new = optimiser.transform(pd.DataFrame({"A": [0, 0, 70000]}))
+        assert data_new["A"].dtype == pd.SparseDtype(np.int32, 0)
+
+    def test_analyze_scipy_sparse(self):
+        from scipy import sparse
+
+        data = sparse.random(
+            100, 50, density=0.1, format="csr", random_state=0
+        )
+        data.data = np.rint(data.data * 100)
+        data.indices = data.indices.astype(np.int64)
+        data.indptr = data.indptr.astype(np.int64)
+
+        optimiser = MemoryOptimiser(mode="convert")
+        data_new = optimiser.fit(data).transform(data)
+        assert optimiser.data_types_ == np.int8
+        assert data_new.format == "csr"
+        assert data_new.dtype == np.int8
+        assert data_new.indices.dtype == np.int32
+        assert data_new.indptr.dtype == np.int32
+        assert (data_new != data).nnz == 0
+        assert data.dtype == np.float64
+
+        # scipy doesn't support float16
+        data = sparse.coo_matrix(data / 100)
+        optimiser = MemoryOptimiser(mode="auto", sample_size=10)
+        data_new = optimiser.fit(data).transform(data)
+        assert data_new.format == "coo"
+        assert data_new.dtype == np.float32
+        assert data_new.row.dtype == np.int32
+
+    def test_n_jobs(self):
+        data = random_dataframe(
+            1000, 40, low=-100, high=100, dtype=np.int16, astype=np.float64
+        )
+        data.iloc[::7, 5] = np.nan
+        data.iloc[:, 6] /= 8
+        data["object"] = ["a", "b"] * 500
+        data["nullable"] = pd.array([1, None] * 500, dtype="Int64")
+
+        for mode in ("auto", "convert", "decimal"):
+            expected = MemoryOptimiser(mode=mode)
+            expected_data = expected.fit(data).transform(data)
+
+            optimiser = MemoryOptimiser(mode=mode, n_jobs=4)
+            data_new = optimiser.fit(data).transform(data)
+            assert optimiser.data_types_ == expected.data_types_
+            assert optimiser.data_stats_.keys() == expected.data_stats_.keys()
+            pd.testing.assert_frame_equal(data_new, expected_data)
+            assert data_new.iloc[:, 0] is not data.iloc[:, 0]
+
+        # input frame isn't changed without low_memory
+        dtypes = data.dtypes.copy()
+        for n_jobs in (None, 4):
+            optimiser = MemoryOptimiser(
+                mode="convert", n_jobs=n_jobs, copy=False
+            )
+            optimiser.fit(data).transform(data)
+            pd.testing.assert_series_equal(data.dtypes, dtypes)
+
+        expected = MemoryOptimiser(mode="convert").fit(data)
+        optimiser = MemoryOptimiser(mode="convert", n_jobs=-1, low_memory=True)
+        pd.testing.assert_frame_equal(
+            optimiser.fit(data).transform(data), expected.transform(data)
+        )
+
+        # the first error in order of columns is raised
+        batch = data.iloc[:2, :40] * 1e6
+        messages = []
+        for n_jobs in (None, 2):
+            optimiser = MemoryOptimiser(
+                mode="auto", n_jobs=n_jobs, out_of_range="raise"
+            )
+            optimiser.fit(data)
+            with pytest.raises(ValueError) as exc:
+                optimiser.transform(batch)
+            messages.append(str(exc.value))
+        assert messages[0] == messages[1]
+
+    def test_analyze_numpy_ndarray_columns(self):
+        data = np.column_stack(
+            [
+                np.arange(100, dtype=np.float64),
+                np.arange(100, dtype=np.float64) * 1000,
+                np.arange(100, dtype=np.float64) / 4,
+                np.arange(100, dtype=np.float64) / 100,
+            ]
+        )
+
+        # array is optimised as a single feature by default
+        optimiser = MemoryOptimiser(mode="decimal")
+        assert optimiser.fit(data).data_types_ == FixedPoint(np.int32, 2)
+
+        optimiser = MemoryOptimiser(mode="decimal", structured=True)
+        data_new = optimiser.fit(data).transform(data)
+        assert optimiser.data_types_ == [
+            np.int8,
+            np.int32,
+            FixedPoint(np.int16, 2),
+            FixedPoint(np.int8, 2),
+        ]
+        assert data_new.dtype.names == ("f0", "f1", "f2", "f3")
+        assert data_new["f1"].dtype == np.int32
+        assert data_new["f1"].tolist() == data[:, 1].tolist()
+        restored = optimiser.inverse_transform(data_new)
+        for position, name in enumerate(restored.dtype.names):
+            assert restored[name].tolist() == data[:, position].tolist()
+
+        # features of the same type give structured array too
+        optimiser = MemoryOptimiser(mode="convert", structured=True)
+        data_new = optimiser.fit(data[:, :1]).transform(data[:, :1])
+        assert data_new.dtype.names == ("f0",)
+        assert data_new["f0"].dtype == np.int8
+        assert data_new.shape == (100,)
+
+        # axis other than 0 optimises array as a single feature
+        optimiser = MemoryOptimiser(mode="convert", axis=1, structured=True)
+        assert optimiser.fit(data).data_types_ == np.float32
+
+        optimiser = MemoryOptimiser(mode="convert", structured=True).fit(data)
+        with pytest.raises(AttributeError) as exc:
+            optimiser.transform(data[:, :2])
+        assert (
+            str(exc.value) == "Invalid `data` shape. It should be 2-D numpy "
+            "ndarray with 4 features."
+        )
+
+        schema = json.loads(json.dumps(optimiser.to_schema()))
+        assert schema["dtypes"][2] == "float16"
+        assert MemoryOptimiser.from_schema(schema).data_types_ == (
+            optimiser.data_types_
+        )
+
+    def test_memmap_numpy_ndarray(self, tmp_path):
+        path = str(tmp_path / "data.npy")
+        data = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float64, shape=(3000, 2)
+        )
+        data[:, 0] = np.arange(3000) % 100
+        data[:, 1] = -np.arange(3000)
+        data.flush()
+        del data
+
+        optimiser = MemoryOptimiser(
+            mode="convert", structured=True, memmap_dir=str(tmp_path)
+        )
+        data_new = optimiser.fit(path).transform(path)
+        assert optimiser.data_types_ == [np.int8, np.int16]
+        assert isinstance(data_new, np.memmap)
+        assert data_new.filename.startswith(str(tmp_path))
+
+        restored = np.load(data_new.filename)
+        assert restored.dtype.names == ("f0", "f1")
+        assert restored["f0"].tolist() == (np.arange(3000) % 100).tolist()
+        assert restored["f1"].tolist() == (-np.arange(3000)).tolist()
+
+        # new values are checked by row chunks
+        data = np.load(path, mmap_mode="r+")
+        data[-1, 0] = 1000
+        data.flush()
+        optimiser.set_params(out_of_range="widen")
+        data_new = optimiser.transform(data)
+        assert optimiser.data_types_ == [np.int8, np.int16]
+        assert data_new["f0"].dtype == np.int16
+        assert data_new["f0"][-1] == 1000
+
+        # array optimised as a single feature is converted out-of-core too
+        optimiser = MemoryOptimiser(mode="convert", memmap_dir=str(tmp_path))
+        data_new = optimiser.fit(data).transform(data)
+        assert optimiser.data_types_ == np.int16
+        assert isinstance(data_new, np.memmap)
+        assert np.load(data_new.filename).tolist() == data.tolist()
+
+    def test_parse_strings(self):
+        data = pd.DataFrame(
+            {
+                "A": ["1", "2", None, "40"] * 25,
+                "B": ["0.5", "1.25", "-3", "1e2"] * 25,
+                "C": ["True", "false", "TRUE", None] * 25,
+                "D": ["2020-01-01", "2020-02-01", "2021-03-04", None] * 25,
+                "E": ["a", "1", "b", "2"] * 25,
+            }
+        )
+
+        optimiser = MemoryOptimiser(mode="convert")
+        optimiser.fit(data)
+        assert isinstance(optimiser.data_types_["A"], CategoricalDtype)
+
+        dtypes = data.dtypes.copy()
+        optimiser = MemoryOptimiser(mode="convert", parse_strings=True)
+        data_new = optimiser.fit(data).transform(data)
+        assert optimiser.data_types_["A"] == "Int8"
+        assert optimiser.data_types_["B"] == np.float16
+        assert optimiser.data_types_["C"] == "boolean"
+        # unit of parsed datetimes depends on version of pandas
+        assert np.dtype(optimiser.data_types_["D"]).kind == "M"
+        assert isinstance(optimiser.data_types_["E"], CategoricalDtype)
+        assert data_new["A"].tolist()[:4] == [1, 2, pd.NA, 40]
+        assert data_new["B"].tolist()[:4] == [0.5, 1.25, -3, 100]
+        assert data_new["C"].tolist()[:4] == [True, False, True, pd.NA]
+        assert data_new["D"].iloc[2] == pd.Timestamp("2021-03-04")
+        pd.testing.assert_series_equal(data.dtypes, dtypes)
+
+        # strings of another kind can't be parsed in transform
+        with pytest.raises(ValueError) as exc:
+            optimiser.transform(data.assign(A="x"))
+        assert (
+            str(exc.value) == "Values of feature `A` can't be parsed as "
+            "numeric."
+        )
+
+        # parsing is applied to pandas Series too and before range check
+        optimiser = MemoryOptimiser(
+            mode="convert",
+            parse_strings=True,
+            category_ratio=None,
+            out_of_range="widen",
+        )
+        optimiser.fit(data["B"])
+        assert optimiser.transform(pd.Series(["1e6"])).dtype == np.float32
+        assert optimiser.fit(data["E"]).data_types_ == data["E"].dtype
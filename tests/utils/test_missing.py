@@ -24,7 +24,7 @@ class TestMissingFunction:
 
         data_ndarray = np.array(
             [
-                [1, 2, 3, 4, np.NAN],
+                [1, 2, 3, 4, np.nan],
                 [5, 6, 7, 8, 9],
             ]
         )
@@ -56,7 +56,7 @@ class TestMissingFunction:
         assert result_series.shape == (20,)
         assert result_series.size == 20
 
-        data_series = Series([1, 2, 3, 4, 5, np.NAN, "", "None"])
+        data_series = Series([1, 2, 3, 4, 5, np.nan, "", "None"])
         assert any(missing(data_series))
 
         # Test on presence optional None value as missing
@@ -91,8 +91,8 @@ class TestMissingFunction:
 
         data_dataframe = DataFrame(
             {
-                "one": [1, 2, 3, 4, 5, np.NAN, "", "None"],
-                "two": [1, 2, np.NAN, 4, 5, 6, "", "None"],
+                "one": [1, 2, 3, 4, 5, np.nan, "", "None"],
+                "two": [1, 2, np.nan, 4, 5, 6, "", "None"],
             }
         )
         assert any(missing(data_dataframe))
@@ -170,7 +170,7 @@ class TestMissingCountFunction:
 
         data_ndarray = np.array(
             [
-                [1, 2, 3, 4, np.NAN],
+                [1, 2, 3, 4, np.nan],
                 [5, 6, 7, 8, 9],
             ]
         )
@@ -199,7 +199,7 @@ class TestMissingCountFunction:
         data_series = random_series(20, p_missing=0.5)
         assert missing_count(data_series) >= 1
 
-        data_series = Series([1, 2, 3, 4, 5, np.NAN, "", "None"])
+        data_series = Series([1, 2, 3, 4, 5, np.nan, "", "None"])
         assert any(missing(data_series))
 
         # Test on presence optional None value as missing
@@ -230,8 +230,8 @@ class TestMissingCountFunction:
 
         data_dataframe = DataFrame(
             {
-                "one": [1, 2, 3, 4, 5, np.NAN, "", "None"],
-                "two": [1, 2, np.NAN, 4, 5, 6, "", "None"],
+                "one": [1, 2, 3, 4, 5, np.nan, "", "None"],
+                "two": [1, 2, np.nan, 4, 5, 6, "", "None"],
             }
         )
         assert any(missing(data_dataframe))
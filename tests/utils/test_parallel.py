@@ -0,0 +1,91 @@
+import os
+import pickle
+import threading
+
+import numpy as np
+import pytest
+
+from dsmlt.utils import SharedArray, n_workers, parallel_map, process_map
+
+
+def square(x):
+    if x == 7:
+        raise ValueError(x)
+    return x * x
+
+
+def fill(item):
+    out, value = item
+    out.array[:] = value
+    return os.getpid()
+
+
+def test_n_workers():
+    assert n_workers(None, 10) == 1
+    assert n_workers(4, 10) == 4
+    assert n_workers(4, 2) == 2
+    assert n_workers(4, 0) == 1
+    assert 1 <= n_workers(-1, 1000) <= 1000
+
+
+def test_parallel_map():
+    assert parallel_map(lambda x: x * 2, range(5)) == [0, 2, 4, 6, 8]
+    assert parallel_map(lambda x: x * 2, range(100), n_jobs=4) == [
+        x * 2 for x in range(100)
+    ]
+
+    threads = set()
+
+    def record(x):
+        threads.add(threading.get_ident())
+        return x
+
+    parallel_map(record, range(10))
+    assert threads == {threading.get_ident()}
+
+    def fail(x):
+        if x in (3, 7):
+            raise ValueError(x)
+        return x
+
+    with pytest.raises(ValueError) as exc:
+        parallel_map(fail, range(10), n_jobs=4)
+    assert str(exc.value) == "3"
+
+
+def test_process_map():
+    assert process_map(square, range(5)) == [0, 1, 4, 9, 16]
+    assert process_map(square, range(5), n_jobs=2) == [0, 1, 4, 9, 16]
+
+    with pytest.raises(ValueError) as exc:
+        process_map(square, range(10), n_jobs=2)
+    assert str(exc.value) == "7"
+
+
+def test_shared_array():
+    outputs = [SharedArray(1000, np.int16) for _ in range(4)]
+    try:
+        pids = process_map(
+            fill, [(out, i) for i, out in enumerate(outputs)], n_jobs=2
+        )
+        # results are written by workers into memory of parent
+        assert os.getpid() not in pids
+        for i, out in enumerate(outputs):
+            assert out.array.dtype == np.int16
+            assert (out.array == i).all()
+    finally:
+        for out in outputs:
+            out.close()
+
+    with SharedArray((2, 3), np.float32) as out:
+        out.array[:] = 1.5
+        attached = pickle.loads(pickle.dumps(out))
+        assert not attached.owner
+        assert attached.array.shape == (2, 3)
+        assert (attached.array == 1.5).all()
+        attached.close()
+    assert out.array is None
+    out.close()
+
+    with SharedArray(0, np.int8) as out:
+        assert out.array.shape == (0,)
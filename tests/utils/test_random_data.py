@@ -56,7 +56,7 @@ def test_random_narray():
             np.int_,
             np.intc,
             np.intp,
-            np.int0,
+            np.intp,
             np.int8,
             np.int16,
             np.int32,
@@ -113,7 +113,7 @@ def test_random_narray():
     types = zip(
         [
             float,
-            np.float_,
+            np.float64,
             np.float16,
             np.float32,
             np.float64,